@@ -1,16 +1,59 @@
-from fastapi import FastAPI, Request, Form, HTTPException
-import uvicorn
+import asyncio
+import math
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import FastAPI, Request, Form, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
-from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
-from calculations.comparison import MortgageComparison, ComparisonParams, ComparisonResult
+from jinja2 import FileSystemBytecodeCache
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams, MortgagePayments
+from calculations.comparison import MortgageComparison, ComparisonParams, ComparisonResult, ENGINE_DECIMAL, ENGINES
+# NumPy-based modules (break_even, monte_carlo, sensitivity) are imported inside
+# their endpoints so that starting the app does not pay for NumPy
+from calculations import batch, cache, export, serialization
 from decimal import Decimal, InvalidOperation, getcontext
+import jobs
+import live
+import metrics
+import offload
+import profiling
+import singleflight
 
 # Set precision for all calculations
 getcontext().prec = 28
 
-app = FastAPI()
+# Compiled templates are cached on disk and shared by every process; set to an
+# empty string to disable
+TEMPLATE_CACHE_DIR = os.environ.get('REALESTIMATE_TEMPLATE_CACHE',
+                                    os.path.join(tempfile.gettempdir(), 'realestimate-templates'))
+TEMPLATES = ("index.html", "results.html")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile templates and start any configured job workers at startup, release shared resources at shutdown."""
+    for name in TEMPLATES:
+        templates.get_template(name)
+    jobs.pool.start()
+    yield
+    jobs.pool.stop()
+    offload.executor.shutdown()
+    batch.shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+if profiling.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
 templates = Jinja2Templates(directory="templates")
+if TEMPLATE_CACHE_DIR:
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
 
 def format_number(value):
     """Format a number with commas and 2 decimal places for display."""
@@ -46,6 +89,102 @@ async def index(request: Request):
     """Render the main calculator form page."""
     return templates.TemplateResponse("index.html", {"request": request})
 
+def parse_form_scenario(property_price: str, down_payment_percentage: float, interest_rate_first_period: float,
+                        interest_rate_subsequent: float, mortgage_term_years: int, fixed_interest_duration_years: int,
+                        monthly_rent: str, investment_return_rate: float, tier_duration_years: List[int],
+                        tier_rate: List[float]) -> Tuple[MortgageParams, Decimal, Decimal]:
+    """Build the mortgage parameters, monthly rent and investment return rate from form fields.
+
+    All percentage inputs from the form are converted from percentage to decimal
+    form (e.g., 5.25% becomes 0.0525). Repeated ``tier_duration_years`` and
+    ``tier_rate`` fields add fixed-rate tiers after the first fixed period.
+
+    Raises:
+        HTTPException: If an amount is not a valid number.
+        ValueError: If the rate tiers are incomplete.
+    """
+    # Convert input parameters to Decimal for precise calculations
+    if len(tier_duration_years) != len(tier_rate):
+        raise ValueError("Every rate tier needs a duration and a rate")
+    if tier_duration_years:
+        rate_tiers = [(fixed_interest_duration_years, interest_rate_first_period)]
+        rate_tiers += zip(tier_duration_years, tier_rate)
+        mortgage_params = MortgageParams.from_tiers(
+            property_price=parse_formatted_number(property_price),
+            down_payment_percentage=Decimal(str(down_payment_percentage)) / Decimal('100'),
+            rate_tiers=[(years, Decimal(str(rate)) / Decimal('100')) for years, rate in rate_tiers],
+            floating_rate=Decimal(str(interest_rate_subsequent)) / Decimal('100'),
+            mortgage_term_years=mortgage_term_years
+        )
+    else:
+        mortgage_params = MortgageParams(
+            property_price=parse_formatted_number(property_price),
+            down_payment_percentage=Decimal(str(down_payment_percentage)) / Decimal('100'),
+            interest_rate_first_period=Decimal(str(interest_rate_first_period)) / Decimal('100'),
+            interest_rate_subsequent=Decimal(str(interest_rate_subsequent)) / Decimal('100'),
+            mortgage_term_years=mortgage_term_years,
+            fixed_interest_duration_years=fixed_interest_duration_years
+        )
+    monthly_rent_value = parse_formatted_number(monthly_rent)
+    investment_return_rate_value = Decimal(str(investment_return_rate)) / Decimal('100')
+    return mortgage_params, monthly_rent_value, investment_return_rate_value
+
+def results_totals(mortgage_payments: MortgagePayments, comparison_result: ComparisonResult) -> Dict[str, Any]:
+    """Totals shown on the results page."""
+    return {
+        'monthly_payment_first_period': mortgage_payments.monthly_payment_first_period,
+        'monthly_payment_subsequent': mortgage_payments.monthly_payment_subsequent,
+        'total_mortgage_cost': comparison_result.total_mortgage_cost,
+        'total_rent_cost': comparison_result.total_rent_cost,
+        'total_investment_growth': comparison_result.total_investment_growth,
+        'net_benefit_buying': comparison_result.net_benefit_buying,
+        'max_payment_difference': comparison_result.max_payment_difference,
+        'is_buying_cheaper': comparison_result.is_buying_cheaper,
+        'total_interest_paid': comparison_result.total_interest_paid,
+        'total_principal_paid': comparison_result.total_principal_paid
+    }
+
+def calculate_results_page(mortgage_params: MortgageParams, monthly_rent: Decimal,
+                           investment_return_rate: Decimal) -> Tuple[str, List[Tuple[str, float]]]:
+    """Calculate a comparison and render the results page.
+
+    Runs on the offload executor (possibly in a worker process), so it returns
+    the rendered HTML together with its stage durations in seconds.
+    """
+    stages = []
+    started = time.perf_counter()
+    mortgage_payments = cache.cached_mortgage_payments(mortgage_params)
+    stages.append(('payments', time.perf_counter() - started))
+
+    started = time.perf_counter()
+    comparison_params = ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=mortgage_payments,
+        investment_return_rate=investment_return_rate
+    )
+    # The results page only renders totals and yearly summaries, so skip the monthly records
+    comparison_result = cache.cached_comparison(comparison_params, summary_only=True)
+    stages.append(('comparison', time.perf_counter() - started))
+
+    started = time.perf_counter()
+    # Prepare results for template rendering
+    results = {
+        **results_totals(mortgage_payments, comparison_result),
+        # JSON serializable yearly summary for the charts
+        'yearly_summary': serialization.serialize_yearly_summary(
+            comparison_result.yearly_summary, serialization.DECIMAL_FLOAT)
+    }
+    content = templates.get_template("results.html").render({
+        "results": results,
+        "mortgage_params": mortgage_params,
+        "mortgage_payments": mortgage_payments,
+        "monthly_rent": monthly_rent,
+        "investment_return_rate": investment_return_rate
+    })
+    stages.append(('render', time.perf_counter() - started))
+    return content, stages
+
 @app.post("/calculate_mortgage_payments", response_class=HTMLResponse)
 async def mortgage_payments(
     request: Request,
@@ -56,73 +195,38 @@ async def mortgage_payments(
     mortgage_term_years: int = Form(...),
     fixed_interest_duration_years: int = Form(...),
     monthly_rent: str = Form(...),
-    investment_return_rate: float = Form(...)
+    investment_return_rate: float = Form(...),
+    tier_duration_years: List[int] = Form([]),
+    tier_rate: List[float] = Form([])
 ):
-    """Calculate and compare mortgage vs. renting scenarios based on form input.
-    
-    All percentage inputs from the form are converted from percentage to decimal
-    form (e.g., 5.25% becomes 0.0525).
-    """
+    """Calculate and compare mortgage vs. renting scenarios based on form input (see parse_form_scenario)."""
+    timer = metrics.request_timer(request)
     try:
-        # Convert input parameters to Decimal for precise calculations
-        mortgage_params = MortgageParams(
-            property_price=parse_formatted_number(property_price),
-            down_payment_percentage=Decimal(str(down_payment_percentage)) / Decimal('100'),
-            interest_rate_first_period=Decimal(str(interest_rate_first_period)) / Decimal('100'),
-            interest_rate_subsequent=Decimal(str(interest_rate_subsequent)) / Decimal('100'),
-            mortgage_term_years=mortgage_term_years,
-            fixed_interest_duration_years=fixed_interest_duration_years
-        )
-
-        # Calculate mortgage payments and comparison results
-        mortgage_payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params)
-        comparison_params = ComparisonParams(
-            monthly_rent=parse_formatted_number(monthly_rent),
-            mortgage_params=mortgage_params,
-            mortgage_payments=mortgage_payments,
-            investment_return_rate=Decimal(str(investment_return_rate)) / Decimal('100')
-        )
+        with timer.stage('parse'):
+            mortgage_params, monthly_rent_value, investment_return_rate_value = parse_form_scenario(
+                property_price, down_payment_percentage, interest_rate_first_period, interest_rate_subsequent,
+                mortgage_term_years, fixed_interest_duration_years, monthly_rent, investment_return_rate,
+                tier_duration_years, tier_rate)
 
-        comparison_result = MortgageComparison.month_by_month_comparison(comparison_params)
-
-        # Prepare results for template rendering
-        results = {
-            'monthly_payment_first_period': mortgage_payments.monthly_payment_first_period,
-            'monthly_payment_subsequent': mortgage_payments.monthly_payment_subsequent,
-            'total_mortgage_cost': comparison_result.total_mortgage_cost,
-            'total_rent_cost': comparison_result.total_rent_cost,
-            'total_investment_growth': comparison_result.total_investment_growth,
-            'net_benefit_buying': comparison_result.net_benefit_buying,
-            'monthly_comparison': comparison_result.monthly_comparison,
-            'yearly_summary': comparison_result.yearly_summary,
-            'max_payment_difference': comparison_result.max_payment_difference,
-            'is_buying_cheaper': comparison_result.is_buying_cheaper,
-            'total_interest_paid': comparison_result.total_interest_paid,
-            'total_principal_paid': comparison_result.total_principal_paid
-        }
-        
-        # Convert yearly summary data to make it JSON serializable
-        serializable_yearly_summary = []
-        for year_data in results['yearly_summary']:
-            serializable_yearly_summary.append({
-                'year': year_data.year,
-                'average_mortgage_payment': float(year_data.average_mortgage_payment),
-                'average_rent': float(year_data.average_rent),
-                'yearly_investment_growth': float(year_data.yearly_investment_growth),
-                'total_principal_paid': float(year_data.total_principal_paid),
-                'total_interest_paid': float(year_data.total_interest_paid)
-            })
-        
-        # Replace the yearly_summary with the serializable version
-        results_copy = results.copy()
-        results_copy['yearly_summary'] = serializable_yearly_summary
-        
-        return templates.TemplateResponse("results.html", {
-            "request": request, 
-            "results": results_copy,
-            "mortgage_params": mortgage_params,
-            "mortgage_payments": mortgage_payments
-        })
+        started = time.perf_counter()
+        # Identical concurrent submissions share one calculation and rendering
+        content, stages = await singleflight.run(
+            ('results_page', cache.scenario_key(mortgage_params, monthly_rent_value, investment_return_rate_value,
+                                                summary_only=True)),
+            lambda: offload.run(calculate_results_page, mortgage_params, monthly_rent_value, investment_return_rate_value))
+        # Whatever the worker did not spend on its own stages was spent waiting for it
+        for name, seconds in stages:
+            timer.record(name, seconds)
+        timer.record('queue', time.perf_counter() - started - sum(seconds for _, seconds in stages))
+        return HTMLResponse(content)
+    except offload.ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except singleflight.SingleFlightTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except HTTPException:
+        # Invalid number formats are already client errors
+        raise
     except ValueError as e:
         # Return error message if validation fails
         raise HTTPException(status_code=400, detail=str(e))
@@ -132,5 +236,322 @@ async def mortgage_payments(
         error_details = traceback.format_exc()
         print(f"Error processing mortgage calculation: {str(e)}\n{error_details}")
         raise HTTPException(status_code=500, detail="An error occurred during calculation")
+
+def parse_live_params(params: Dict[str, Any]) -> Tuple[MortgageParams, Decimal, Decimal]:
+    """Parse the form fields of a live update, converted to the types the form handler receives.
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    try:
+        percentages = [float(params[name]) for name in ('down_payment_percentage', 'interest_rate_first_period',
+                                                        'interest_rate_subsequent', 'investment_return_rate')]
+        tier_rate = [float(rate) for rate in params.get('tier_rate', [])]
+        if not all(math.isfinite(value) for value in percentages + tier_rate):
+            raise ValueError("Rates must be finite numbers")
+        down_payment, first_rate, subsequent_rate, return_rate = percentages
+        return parse_form_scenario(
+            str(params['property_price']), down_payment, first_rate, subsequent_rate,
+            int(params['mortgage_term_years']), int(params['fixed_interest_duration_years']),
+            str(params['monthly_rent']), return_rate,
+            [int(years) for years in params.get('tier_duration_years', [])], tier_rate)
+    except KeyError as e:
+        raise ValueError(f"Missing field {e}")
+    except TypeError:
+        raise ValueError("Invalid field value")
+    except HTTPException as e:
+        raise ValueError(e.detail)
+
+def calculate_live_results(mortgage_params: MortgageParams, monthly_rent: Decimal,
+                           investment_return_rate: Decimal) -> live.LiveResult:
+    """Calculate the totals and yearly summary columns sent to live results pages."""
+    mortgage_payments = cache.cached_mortgage_payments(mortgage_params)
+    comparison_result = cache.cached_comparison(ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=mortgage_payments,
+        investment_return_rate=investment_return_rate
+    ), summary_only=True)
+    totals = {name: float(value) if isinstance(value, Decimal) else value
+              for name, value in results_totals(mortgage_payments, comparison_result).items()}
+    totals['property_price'] = float(mortgage_params.property_price)
+    yearly = serialization.serialize_yearly_summary(comparison_result.yearly_summary, serialization.DECIMAL_FLOAT)
+    return {'totals': totals, 'yearly': live.columns(yearly)}
+
+
+@app.websocket("/ws/live")
+async def live_updates(websocket: WebSocket):
+    """Recalculate the results page while the user edits its inputs (see live.py)."""
+    await websocket.accept()
+
+    async def calculate(params: Dict[str, Any]) -> live.LiveResult:
+        mortgage_params, monthly_rent, investment_return_rate = parse_live_params(params)
+        try:
+            return await offload.run(calculate_live_results, mortgage_params, monthly_rent, investment_return_rate)
+        except offload.ExecutorSaturated:
+            raise ValueError("Server is busy, please retry shortly")
+
+    session = live.LiveSession(calculate, websocket.send_json)
+    runner = asyncio.ensure_future(session.run())
+    try:
+        while True:
+            await session.receive(await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        runner.cancel()
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Expose request metrics in the Prometheus text format (requires REALESTIMATE_METRICS=1)."""
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/profiles/{profile_id}/{output}")
+async def profile_output(profile_id: str, output: str, sort: str = profiling.DEFAULT_SORT):
+    """Download a saved request profile (requires REALESTIMATE_PROFILING=1)."""
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    try:
+        media_type, content = await offload.run(profiling.saved_output, profile_id, output, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(content, media_type=media_type)
+
+class BatchRequest(BaseModel):
+    """Scenarios to evaluate; see calculations.batch for the record format."""
+    scenarios: List[Dict[str, Any]]
+    engine: str = ENGINE_DECIMAL
+    backend: Optional[str] = None
+
+@app.post("/api/batch")
+async def batch_evaluate(payload: BatchRequest):
+    """Evaluate many buy-vs-rent scenarios in one call.
+
+    Scenarios use MortgageParams units (rates as decimal fractions). Invalid
+    scenarios are reported with an ``error`` entry instead of failing the batch.
+    """
+    try:
+        results = await run_in_threadpool(
+            batch.evaluate_batch, payload.scenarios, payload.engine, backend=payload.backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "count": len(results),
+        "error_count": sum(1 for item in results if 'error' in item),
+        "results": results
+    }
+
+class GridAxis(BaseModel):
+    dimension: str
+    start: float
+    stop: float
+    steps: int = 50
+
+class SensitivityRequest(BaseModel):
+    """Base scenario (calculations.batch format) and the two axes to vary."""
+    scenario: Dict[str, Any]
+    x: GridAxis
+    y: GridAxis
+
+@app.post("/api/sensitivity")
+async def sensitivity_surface(payload: SensitivityRequest):
+    """Evaluate net_benefit_buying over a grid of two varied inputs.
+
+    Rows of ``net_benefit_buying`` follow the y values and columns the x values;
+    cells with invalid inputs are null.
+    """
+    from calculations import sensitivity
+    try:
+        return await offload.run(sensitivity.run_request, payload.model_dump())
+    except offload.ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class MonteCarloRequest(BaseModel):
+    """Base scenario (calculations.batch format) and simulation settings."""
+    scenario: Dict[str, Any]
+    paths: int = 1000
+    seed: Optional[int] = None
+    rate_mean: Optional[float] = None
+    rate_reversion_speed: float = 0.5
+    rate_volatility: float = 0.01
+    return_volatility: float = 0.15
+    percentiles: Optional[List[float]] = None  # Defaults to monte_carlo.DEFAULT_PERCENTILES
+
+@app.post("/api/monte_carlo")
+async def monte_carlo(payload: MonteCarloRequest):
+    """Simulate stochastic floating rates and investment returns for a scenario."""
+    from calculations.monte_carlo import MonteCarloSimulation, params_from_request, result_to_dict
+    try:
+        simulation_params = params_from_request(payload.model_dump())
+        result = await run_in_threadpool(MonteCarloSimulation.run, simulation_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result_to_dict(result)
+
+class BreakEvenRequest(BaseModel):
+    """Listings (calculations.batch format) and the variable to solve for."""
+    variable: str
+    scenarios: List[Dict[str, Any]]
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    tolerance: Optional[float] = None  # Defaults to break_even.DEFAULT_TOLERANCE
+
+@app.post("/api/break_even")
+async def break_even_thresholds(payload: BreakEvenRequest):
+    """Find where net_benefit_buying crosses zero for one free variable per listing."""
+    from calculations import break_even
+    tolerance = payload.tolerance if payload.tolerance is not None else break_even.DEFAULT_TOLERANCE
+    try:
+        return await run_in_threadpool(
+            break_even.solve_listings, payload.scenarios, payload.variable,
+            payload.lower, payload.upper, tolerance)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class PrepaymentRequest(BaseModel):
+    """Scenario (calculations.batch format), prepayment plans to evaluate and an optional budget to search."""
+    scenario: Dict[str, Any]
+    plans: Optional[List[Dict[str, Any]]] = None
+    budget: Optional[float] = None
+    shares: Optional[List[float]] = None  # Defaults to prepayment.DEFAULT_SHARES
+    spread_years: Optional[List[int]] = None  # Defaults to prepayment.DEFAULT_SPREAD_YEARS
+    year_step: int = 1
+    modes: Optional[List[str]] = None
+    top: int = 10
+
+@app.post("/api/prepayment")
+async def prepayment_strategies(payload: PrepaymentRequest):
+    """Evaluate prepayment plans for a scenario and search for the best plan within a budget."""
+    from calculations import prepayment
+    try:
+        return await offload.run(prepayment.run_request, payload.model_dump())
+    except offload.ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class CompareRequest(BaseModel):
+    """A single scenario (calculations.batch format) plus output options."""
+    scenario: Dict[str, Any]
+    engine: str = ENGINE_DECIMAL
+    decimal_mode: str = serialization.DECIMAL_STRING
+    include_monthly: bool = True
+    backend: Optional[str] = None
+
+def compare_scenario(mortgage_params: MortgageParams, monthly_rent: Decimal, investment_return_rate: Decimal,
+                     engine: str, decimal_mode: str, include_monthly: bool, backend: Optional[str] = None) -> bytes:
+    """Calculate one comparison and encode it as JSON (runs on the offload executor)."""
+    mortgage_payments = cache.cached_mortgage_payments(mortgage_params, backend)
+    comparison_result = cache.cached_comparison(ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=mortgage_payments,
+        investment_return_rate=investment_return_rate
+    ), engine=engine, summary_only=not include_monthly, backend=backend)
+    return serialization.dumps(serialization.serialize_comparison(
+        comparison_result, mortgage_payments, decimal_mode, include_monthly))
+
+@app.post("/api/compare")
+async def compare(payload: CompareRequest):
+    """Return the full comparison result for one scenario as JSON.
+
+    Decimal amounts are strings with exact digits by default, or JSON numbers
+    with ``decimal_mode='float'``. The monthly schedule is column-oriented.
+    ``backend`` picks the numeric backend (decimal, float or fixed).
+    """
+    try:
+        if payload.engine not in ENGINES:
+            raise ValueError(f"Unknown calculation engine '{payload.engine}', expected one of {', '.join(ENGINES)}")
+        mortgage_params, monthly_rent, investment_return_rate = batch.parse_scenario(payload.scenario)
+        key = ('compare', cache.scenario_key(mortgage_params, monthly_rent, investment_return_rate, payload.engine,
+                                             not payload.include_monthly, payload.backend), payload.decimal_mode)
+        content = await singleflight.run(key, lambda: offload.run(
+            compare_scenario, mortgage_params, monthly_rent, investment_return_rate,
+            payload.engine, payload.decimal_mode, payload.include_monthly, payload.backend))
+    except offload.ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except singleflight.SingleFlightTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=content, media_type="application/json")
+
+class ExportRequest(BaseModel):
+    """Scenarios (calculations.batch format) whose schedules should be exported."""
+    scenarios: List[Dict[str, Any]]
+
+@app.post("/api/export")
+async def export_schedules(payload: ExportRequest, format: str = "csv", decimals: int = export.DEFAULT_DECIMALS):
+    """Stream month-by-month schedules as CSV or NDJSON while they are computed."""
+    if format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format '{format}', expected one of {', '.join(export.EXPORT_FORMATS)}")
+    if not 0 <= decimals <= 10:
+        raise HTTPException(status_code=400, detail="Decimals must be between 0 and 10")
+    if len(payload.scenarios) > batch.MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds maximum of {batch.MAX_BATCH_SIZE} scenarios")
+
+    if format == "csv":
+        return StreamingResponse(export.iter_csv(payload.scenarios, decimals), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="schedules.csv"'})
+    return StreamingResponse(export.iter_ndjson(payload.scenarios, decimals), media_type="application/x-ndjson")
+
+class JobRequest(BaseModel):
+    """A long analysis to run in the background; ``params`` is the body of the matching endpoint."""
+    kind: str
+    params: Dict[str, Any]
+
+# Request body of every job kind, shared with the synchronous endpoints
+JOB_REQUEST_MODELS = {
+    jobs.JOB_BATCH: BatchRequest,
+    jobs.JOB_MONTE_CARLO: MonteCarloRequest,
+    jobs.JOB_SENSITIVITY: SensitivityRequest,
+}
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(payload: JobRequest):
+    """Queue a batch, Monte Carlo or sensitivity job and return its id and status."""
+    model = JOB_REQUEST_MODELS.get(payload.kind)
+    if model is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{payload.kind}', expected one of {', '.join(JOB_REQUEST_MODELS)}")
+    try:
+        params = model(**payload.params).model_dump()
+        return await run_in_threadpool(jobs.store.submit, payload.kind, params)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, include_results: bool = True):
+    """Report a job's status and progress, with its result or the partial results so far."""
+    try:
+        job = await run_in_threadpool(jobs.store.get, job_id, include_results)
+    except jobs.JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return Response(content=serialization.dumps(job), media_type="application/json")
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued job, or stop a running one after its current unit of work."""
+    try:
+        return await run_in_threadpool(jobs.store.cancel, job_id)
+    except jobs.JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Report hit/miss/eviction counters for the calculation caches and request coalescing."""
+    return {**cache.cache_stats(), 'singleflight': singleflight.group.stats()}
+
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Build cost and lookup speedup of the annuity growth factor table.
+
+Builds a table (or maps an existing one with ``--path``), then times with and
+without it:
+
+- ``monthly_payment`` and ``remaining_balance`` of the Decimal backend, for
+  rates on the 0.01% grid;
+- ``calculate_mortgage_payments`` for a split-rate mortgage;
+- ``batch.evaluate_scenario`` (payments and summary comparison), the per-row
+  work of a decimal bulk run.
+
+``mapped`` decodes every entry from the file (a process's first lookups);
+``decoded`` reuses the entries the process has already decoded. Reported
+values are the best of ``--rounds`` rounds of ``--calls`` calls.
+
+Usage:
+    python -m benchmarks.annuity_table [--path FILE] [--rounds 5] [--calls 2000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from decimal import Decimal
+from typing import Callable, List, Tuple
+
+from calculations import annuity_table, batch
+from calculations.backends import DecimalBackend
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+
+RATES = [Decimal('0.0275'), Decimal('0.045'), Decimal('0.0699'), Decimal('0.11')]
+TERMS = [180, 240, 360, 480]
+
+
+def best_per_call(func: Callable[[], None], rounds: int, calls: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings.append((time.perf_counter() - started) / calls)
+    return min(timings)
+
+
+def cases() -> List[Tuple[str, Callable[[], None]]]:
+    loan = Decimal('1280000000')
+    payments = [(rate, term, DecimalBackend.monthly_payment(loan, rate, term)) for rate in RATES for term in TERMS]
+    params = MortgageParams(
+        property_price=Decimal('1600000000'),
+        down_payment_percentage=Decimal('0.20'),
+        interest_rate_first_period=Decimal('0.025'),
+        interest_rate_subsequent=Decimal('0.11'),
+        mortgage_term_years=30,
+        fixed_interest_duration_years=5
+    )
+    scenario = (params, Decimal('3500000'), Decimal('0.07'))
+
+    def monthly_payment() -> None:
+        for rate, term, _ in payments:
+            DecimalBackend.monthly_payment(loan, rate, term)
+
+    def remaining_balance() -> None:
+        for rate, term, payment in payments:
+            DecimalBackend.remaining_balance(loan, rate, term // 3, payment)
+
+    return [
+        (f"monthly_payment x{len(payments)}", monthly_payment),
+        (f"remaining_balance x{len(payments)}", remaining_balance),
+        ("calculate_mortgage_payments", lambda: MortgageCalculator.calculate_mortgage_payments(params)),
+        ("batch.evaluate_scenario", lambda: batch.evaluate_scenario(scenario)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--path', help="Existing table to map instead of building one")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path
+        if path is None:
+            path = os.path.join(directory, 'annuity.bin')
+            started = time.perf_counter()
+            info = annuity_table.build(path)
+            print(f"build: {info.entries:,} entries in {time.perf_counter() - started:.1f}s, "
+                  f"{info.size_bytes / 2 ** 20:.1f} MiB")
+        started = time.perf_counter()
+        if annuity_table.load(path) is None:
+            parser.exit(1, f"Error: cannot map {path}\n")
+        print(f"map: {(time.perf_counter() - started) * 1e6:.0f}us")
+
+        print(f"best of {args.rounds} rounds of {args.calls} calls")
+        print(f"  {'case':<30} {'computed':>10} {'mapped':>10} {'decoded':>10} {'speedup':>8}")
+        for name, func in cases():
+            annuity_table.load('')
+            computed = best_per_call(func, args.rounds, args.calls)
+            table = annuity_table.load(path)
+
+            def mapped_func() -> None:
+                table.clear_decoded()
+                func()
+
+            mapped = best_per_call(mapped_func, args.rounds, args.calls)
+            decoded = best_per_call(func, args.rounds, args.calls)
+            print(f"  {name:<30} {computed * 1e6:8.1f}us {mapped * 1e6:8.1f}us {decoded * 1e6:8.1f}us "
+                  f"{computed / decoded:7.2f}x")
+        annuity_table.load('')
+
+
+if __name__ == '__main__':
+    main()
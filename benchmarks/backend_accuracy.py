@@ -0,0 +1,123 @@
+"""
+Accuracy and speed of the numeric backends against the Decimal reference.
+
+Draws ``--scenarios`` random scenarios (seeded; prices, rates and terms within
+``MortgageCalculator.validate_input`` bounds, zero rates included), runs each
+through ``calculate_mortgage_payments`` and a summary-only
+``month_by_month_comparison`` on every backend, and reports the divergence of
+the ``float`` and ``fixed`` backends from ``decimal`` per output: the maximum
+and p99 absolute difference in rupiah and the maximum relative difference.
+Also reports the mean time per scenario of every backend.
+
+Usage:
+    python -m benchmarks.backend_accuracy [--scenarios 2000] [--seed 0] [--output accuracy.json]
+"""
+
+import argparse
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.loadtest import percentile
+from calculations.backends import BACKENDS, BACKEND_DECIMAL
+from calculations.comparison import MortgageComparison, ComparisonParams
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+
+OUTPUTS = ('monthly_payment_first_period', 'monthly_payment_subsequent', 'total_interest_paid',
+           'total_mortgage_cost', 'total_investment_growth', 'net_benefit_buying')
+TERMS_YEARS = (1, 5, 10, 15, 20, 25, 30, 35, 40)
+
+
+def random_scenario(rng: random.Random) -> Tuple[MortgageParams, Decimal, Decimal]:
+    term_years = rng.choice(TERMS_YEARS)
+    first_rate = Decimal(0) if rng.random() < 0.05 else Decimal(rng.randrange(100, 1500)) / 10000
+    mortgage_params = MortgageParams(
+        property_price=Decimal(rng.randrange(100, 20000) * 1000000),
+        down_payment_percentage=Decimal(rng.randrange(0, 90)) / 100,
+        interest_rate_first_period=first_rate,
+        interest_rate_subsequent=Decimal(rng.randrange(0, 2000)) / 10000,
+        mortgage_term_years=term_years,
+        fixed_interest_duration_years=rng.randint(1, term_years)
+    )
+    monthly_rent = Decimal(rng.randrange(10, 500) * 100000)
+    investment_return_rate = Decimal(rng.randrange(0, 1500)) / 10000
+    return mortgage_params, monthly_rent, investment_return_rate
+
+
+def evaluate(scenario: Tuple[MortgageParams, Decimal, Decimal], backend: str) -> Dict[str, Decimal]:
+    mortgage_params, monthly_rent, investment_return_rate = scenario
+    payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params, backend)
+    result = MortgageComparison.month_by_month_comparison(ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=payments,
+        investment_return_rate=investment_return_rate
+    ), summary_only=True, backend=backend)
+    values = {**payments._asdict(), **result._asdict()}
+    return {name: values[name] for name in OUTPUTS}
+
+
+def run(scenarios: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    inputs = [random_scenario(rng) for _ in range(scenarios)]
+
+    outputs: Dict[str, List[Dict[str, Decimal]]] = {}
+    timings: Dict[str, float] = {}
+    for backend in BACKENDS:
+        started = time.perf_counter()
+        outputs[backend] = [evaluate(scenario, backend) for scenario in inputs]
+        timings[backend] = (time.perf_counter() - started) / scenarios
+
+    divergence: Dict[str, Dict[str, Dict[str, float]]] = {}
+    reference = outputs[BACKEND_DECIMAL]
+    for backend, results in outputs.items():
+        if backend == BACKEND_DECIMAL:
+            continue
+        divergence[backend] = {}
+        for name in OUTPUTS:
+            absolute = [float(abs(result[name] - exact[name])) for result, exact in zip(results, reference)]
+            relative = [difference / float(abs(exact[name])) for difference, exact in zip(absolute, reference)
+                        if exact[name]]
+            divergence[backend][name] = {
+                'max_abs': max(absolute),
+                'p99_abs': percentile(absolute, 99),
+                'max_rel': max(relative) if relative else 0.0
+            }
+
+    return {
+        'scenarios': scenarios,
+        'seed': seed,
+        'ms_per_scenario': {backend: round(seconds * 1000, 4) for backend, seconds in timings.items()},
+        'divergence': divergence
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='PATH', help="Write the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.scenarios, args.seed)
+    print(f"{args.scenarios} fuzzed scenarios (seed {args.seed}), divergence from the decimal backend")
+    for backend, per_output in report['divergence'].items():
+        print(f"\n  {backend}")
+        print(f"    {'output':<30} {'max abs (IDR)':>14} {'p99 abs (IDR)':>14} {'max rel':>10}")
+        for name, stats in per_output.items():
+            print(f"    {name:<30} {stats['max_abs']:14.6g} {stats['p99_abs']:14.6g} {stats['max_rel']:10.2e}")
+    print("\n  time per scenario (payments + summary comparison)")
+    for backend, ms in report['ms_per_scenario'].items():
+        print(f"    {backend:<8} {ms:8.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Latency under concurrent load for each calculation executor.
+
+Starts a local uvicorn server once per ``REALESTIMATE_EXECUTOR`` setting
+(``inline``, ``thread``, ``process``), keeps ``--concurrency`` clients posting
+40-year comparisons to ``/calculate_mortgage_payments`` for ``--duration``
+seconds, and meanwhile probes ``GET /`` every 20 ms. Reports p50/p99 latency of
+both request kinds and the number of 503 responses. With the ``inline``
+executor every probe waits behind the calculations in progress.
+
+Usage:
+    python -m benchmarks.event_loop_latency [--concurrency 16] [--duration 10] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.loadtest import percentile, wait_until_ready
+
+EXECUTORS = ('inline', 'thread', 'process')
+PROBE_INTERVAL = 0.02
+
+
+async def load(base_url: str, concurrency: int, duration: float) -> Dict[str, List[float]]:
+    results: Dict[str, List[float]] = {'calculate': [], 'probe': [], 'rejected': [], 'errors': []}
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        await wait_until_ready(client)
+        deadline = time.monotonic() + duration
+
+        async def calculate(worker: int) -> None:
+            request = 0
+            while time.monotonic() < deadline:
+                request += 1
+                # Vary the rent so every request misses the result cache
+                data = {
+                    'property_price': '1,600,000,000',
+                    'down_payment_percentage': 20,
+                    'interest_rate_first_period': 2.5,
+                    'interest_rate_subsequent': 11,
+                    'mortgage_term_years': 40,
+                    'fixed_interest_duration_years': 5,
+                    'monthly_rent': str(3000000 + worker * 100000 + request),
+                    'investment_return_rate': 7
+                }
+                started = time.perf_counter()
+                response = await client.post('/calculate_mortgage_payments', data=data)
+                elapsed = time.perf_counter() - started
+                if response.status_code == 503:
+                    results['rejected'].append(elapsed)
+                    await asyncio.sleep(0.05)
+                elif response.status_code != 200:
+                    results['errors'].append(elapsed)
+                else:
+                    results['calculate'].append(elapsed)
+
+        async def probe() -> None:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                await client.get('/')
+                results['probe'].append(time.perf_counter() - started)
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        await asyncio.gather(probe(), *(calculate(worker) for worker in range(concurrency)))
+    return results
+
+
+def run_server(executor: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, 'REALESTIMATE_EXECUTOR': executor, 'REALESTIMATE_CACHE_SIZE': '0'}
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--port', str(port), '--log-level', 'warning'],
+        env=env
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--executors', nargs='+', choices=EXECUTORS, default=list(EXECUTORS))
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} concurrent 40-year calculations for {args.duration:g}s, GET / probed every 20 ms")
+    print(f"  {'executor':<8} {'calc/s':>7} {'calc p50':>9} {'calc p99':>9} {'GET / p50':>10} {'GET / p99':>10} {'503s':>6}")
+    for executor in args.executors:
+        server = run_server(executor, args.port)
+        try:
+            results = asyncio.run(load(f"http://127.0.0.1:{args.port}", args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        calc, probe = results['calculate'], results['probe']
+        print(f"  {executor:<8} {len(calc) / args.duration:7.1f} "
+              f"{statistics.median(calc) * 1000:7.1f}ms {percentile(calc, 99) * 1000:7.1f}ms "
+              f"{statistics.median(probe) * 1000:8.1f}ms {percentile(probe, 99) * 1000:8.1f}ms "
+              f"{len(results['rejected']):6d}")
+        if results['errors']:
+            print(f"    {len(results['errors'])} unexpected error responses")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Speedup of incremental recomputation when only rent or return rate change.
+
+For each engine and term, times ``cache.cached_comparison`` (summary only, as
+the web form uses it) in two situations:
+
+- ``cold``: every cache layer is empty, so all three stages run.
+- ``rent change``: the amortization of the same mortgage is cached and each
+  call uses a new rent and return rate, so only the overlay and aggregate
+  stages run.
+
+Reported values are the best of ``--rounds`` rounds of ``--calls`` calls.
+
+Usage:
+    python -m benchmarks.incremental [--terms 20 30 40] [--rounds 5] [--calls 50]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from typing import Callable
+
+from calculations import cache
+from calculations.comparison import ComparisonParams, ENGINES
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+
+
+def build_params(term_years: int, monthly_rent: Decimal, investment_return_rate: Decimal) -> ComparisonParams:
+    mortgage_params = MortgageParams(
+        property_price=Decimal('1600000000'),
+        down_payment_percentage=Decimal('0.20'),
+        interest_rate_first_period=Decimal('0.025'),
+        interest_rate_subsequent=Decimal('0.11'),
+        mortgage_term_years=term_years,
+        fixed_interest_duration_years=5
+    )
+    return ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+        investment_return_rate=investment_return_rate
+    )
+
+
+def best_per_call(run_round: Callable[[int], None], rounds: int, calls: int) -> float:
+    timings = []
+    for round_index in range(rounds):
+        started = time.perf_counter()
+        run_round(round_index)
+        timings.append((time.perf_counter() - started) / calls)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--terms', type=int, nargs='+', default=[20, 30, 40])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--calls', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"cached_comparison(summary_only=True), best of {args.rounds} rounds of {args.calls} calls")
+    print(f"  {'engine':<7} {'term':>4} {'cold':>10} {'rent change':>12} {'speedup':>8}")
+    for engine in ENGINES:
+        for term_years in args.terms:
+            base = build_params(term_years, Decimal('3500000'), Decimal('0.07'))
+
+            def cold(round_index: int) -> None:
+                for _ in range(args.calls):
+                    cache.clear_caches()
+                    cache.cached_comparison(base, engine=engine, summary_only=True)
+
+            def rent_change(round_index: int) -> None:
+                for call in range(args.calls):
+                    # A new rent and return rate on every call: the overlay and result always miss
+                    params = ComparisonParams(
+                        monthly_rent=Decimal(3000000 + round_index * args.calls + call),
+                        mortgage_params=base.mortgage_params,
+                        mortgage_payments=base.mortgage_payments,
+                        investment_return_rate=Decimal('0.07') + Decimal(call) / 10000
+                    )
+                    cache.cached_comparison(params, engine=engine, summary_only=True)
+
+            cold_seconds = best_per_call(cold, args.rounds, args.calls)
+            cache.clear_caches()
+            cache.cached_comparison(base, engine=engine, summary_only=True)
+            incremental_seconds = best_per_call(rent_change, args.rounds, args.calls)
+            print(f"  {engine:<7} {term_years:>4} {cold_seconds * 1000:8.3f}ms {incremental_seconds * 1000:10.3f}ms "
+                  f"{cold_seconds / incremental_seconds:7.2f}x")
+    cache.clear_caches()
+
+
+if __name__ == '__main__':
+    main()
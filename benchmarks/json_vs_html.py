@@ -0,0 +1,90 @@
+"""
+Latency and payload size of the JSON results API versus the HTML results page.
+
+Posts the same scenario to the form handler (``/calculate_mortgage_payments``)
+and to ``/api/compare`` in every output mode, through the in-process test
+client. Caches are cleared before each request, so every request recomputes
+its result and only the output path differs.
+
+Usage:
+    python -m benchmarks.json_vs_html [--repeat 50] [--term 30]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, Tuple
+
+from fastapi.testclient import TestClient
+
+from app import app
+from calculations import cache
+
+
+def form_data(term_years: int) -> Dict[str, Any]:
+    return {
+        'property_price': '1,600,000,000',
+        'down_payment_percentage': 20,
+        'interest_rate_first_period': 2.5,
+        'interest_rate_subsequent': 11,
+        'mortgage_term_years': term_years,
+        'fixed_interest_duration_years': 5,
+        'monthly_rent': '3,500,000',
+        'investment_return_rate': 7
+    }
+
+
+def scenario(term_years: int) -> Dict[str, Any]:
+    return {
+        'property_price': 1600000000,
+        'down_payment_percentage': 0.20,
+        'interest_rate_first_period': 0.025,
+        'interest_rate_subsequent': 0.11,
+        'mortgage_term_years': term_years,
+        'fixed_interest_duration_years': 5,
+        'monthly_rent': 3500000,
+        'investment_return_rate': 0.07
+    }
+
+
+def measure(client: TestClient, repeat: int, **request: Any) -> Tuple[float, int]:
+    """Median latency in milliseconds and the response size in bytes."""
+    timings = []
+    for _ in range(repeat):
+        cache.clear_caches()
+        started = time.perf_counter()
+        response = client.post(**request)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return statistics.median(timings), len(response.content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--term', type=int, default=30)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    cases = [('HTML results page', {'url': '/calculate_mortgage_payments', 'data': form_data(args.term)})]
+    for engine in ('decimal', 'numpy'):
+        for include_monthly in (False, True):
+            for decimal_mode in ('string', 'float'):
+                label = f"/api/compare {engine:<7} {'full' if include_monthly else 'summary':<7} {decimal_mode}"
+                cases.append((label, {'url': '/api/compare', 'json': {
+                    'scenario': scenario(args.term),
+                    'engine': engine,
+                    'include_monthly': include_monthly,
+                    'decimal_mode': decimal_mode
+                }}))
+
+    print(f"{args.term}-year term, median of {args.repeat} requests")
+    for label, request in cases:
+        # Warm up lazy imports and template compilation
+        client.post(**request)
+        latency, size = measure(client, args.repeat, **request)
+        print(f"  {label:<36} {latency:8.2f} ms {size / 1024:9.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
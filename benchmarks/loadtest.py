@@ -0,0 +1,223 @@
+"""
+Concurrent load generator for the web form endpoint.
+
+Replays randomized but realistic ``/calculate_mortgage_payments`` form
+submissions (prices, rates and terms within ``MortgageCalculator.validate_input``
+bounds) against a running server (``--url``) or, by default, against a local
+``app:app`` started for the run. Requests are issued either closed-loop (``--concurrency``
+clients sending back to back) or open-loop at a fixed ``--rate`` with at most
+``--concurrency`` requests in flight.
+
+Reports throughput, p50/p95/p99 latency and error rates by status code. With
+``--output`` the results are written as JSON with stable key order and
+rounded values, so runs from different commits can be diffed; ``--compare``
+prints the change against such a file.
+
+Usage:
+    python -m benchmarks.loadtest --concurrency 8 --duration 20
+    python -m benchmarks.loadtest --url http://localhost:8000 --rate 50 --output load.json
+    python -m benchmarks.loadtest --compare load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DEFAULT_PORT = 8765
+TERMS_YEARS = (5, 10, 15, 20, 25, 30)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (NaN when empty)."""
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def random_form(rng: random.Random) -> Dict[str, Any]:
+    """A form submission as the browser sends it (percentages, formatted amounts)."""
+    term_years = rng.choice(TERMS_YEARS)
+    property_price = rng.randrange(300, 10000) * 1000000
+    return {
+        'property_price': f"{property_price:,}",
+        'down_payment_percentage': round(rng.uniform(10, 40), 1),
+        'interest_rate_first_period': round(rng.uniform(2, 9), 2),
+        'interest_rate_subsequent': round(rng.uniform(8, 14), 2),
+        'mortgage_term_years': term_years,
+        'fixed_interest_duration_years': rng.randint(1, min(5, term_years)),
+        'monthly_rent': f"{rng.randrange(20, 300) * 100000:,}",
+        'investment_return_rate': round(rng.uniform(3, 10), 2)
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get('/')
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not become ready in time")
+
+
+async def run_load(url: str, concurrency: int, duration: float, rate: Optional[float], seed: int) -> Dict[str, Any]:
+    """Drive the server for ``duration`` seconds and collect per-request latencies and statuses."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        await wait_until_ready(client)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def send() -> None:
+            data = random_form(rng)
+            started = time.perf_counter()
+            try:
+                response = await client.post('/calculate_mortgage_payments', data=data)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+        started = time.perf_counter()
+        deadline = started + duration
+        if rate:
+            # Open loop: start requests on schedule, dropping none, bounded by the slots
+            tasks = []
+            sent = 0
+            while True:
+                scheduled = started + sent / rate
+                if scheduled >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await slots.acquire()
+                task = asyncio.create_task(send())
+                task.add_done_callback(lambda _: slots.release())
+                tasks.append(task)
+                sent += 1
+            await asyncio.gather(*tasks)
+        else:
+            async def worker() -> None:
+                while time.perf_counter() < deadline:
+                    await send()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(statuses.values())
+    errors = total - statuses.get('200', 0)
+    return {
+        'requests': total,
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {f"p{q}": round(percentile(latencies, q) * 1000, 2) for q in PERCENTILES},
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'status_counts': dict(sorted(statuses.items()))
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_server(port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--port', str(port), '--log-level', 'warning'],
+        env=dict(os.environ)
+    )
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    results = report['results']
+    latency = results['latency_ms']
+    print(f"  requests      {results['requests']} in {results['elapsed_seconds']:g}s")
+    print(f"  throughput    {results['throughput_rps']:g} req/s")
+    print(f"  latency       p50 {latency['p50']:g} ms | p95 {latency['p95']:g} ms | p99 {latency['p99']:g} ms")
+    print(f"  error rate    {results['error_rate']:.2%}  {results['status_counts']}")
+
+
+def print_comparison(report: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    print(f"\nChange against {previous['metadata'].get('revision') or 'previous run'}")
+    pairs = [('throughput_rps', report['results']['throughput_rps'], previous['results']['throughput_rps'])]
+    pairs += [(f"latency {name}", value, previous['results']['latency_ms'].get(name))
+              for name, value in report['results']['latency_ms'].items()]
+    for name, current, before in pairs:
+        change = f"{current / before - 1:+.1%}" if before else 'n/a'
+        print(f"  {name:<16} {before!s:>10} -> {current!s:>10}  {change}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', help="Base URL of a running server")
+    target.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port of the local server started when --url is omitted")
+    parser.add_argument('--concurrency', type=int, default=8, help="Maximum requests in flight")
+    parser.add_argument('--rate', type=float, help="Requests per second (open loop); omit for closed loop")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds of load")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the randomized payloads")
+    parser.add_argument('--output', metavar='PATH', help="Write the report as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="Compare with a previous JSON report")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("rate must be greater than 0")
+
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    server = None if args.url else start_server(args.port)
+    try:
+        results = asyncio.run(run_load(url, args.concurrency, args.duration, args.rate, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        'metadata': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'url': url if args.url else 'local app:app'
+        },
+        'config': {
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'duration': args.duration,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    print(f"Load test: {'%g req/s' % args.rate if args.rate else 'closed loop'}, "
+          f"concurrency {args.concurrency}, {args.duration:g}s")
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Batch vs one-at-a-time evaluation of prepayment plans.
+
+Enumerates the candidate plans of a budget search for a split-rate mortgage
+(``PrepaymentOptimizer.candidates``), then times:
+
+- ``batch``: every candidate evaluated in one ``PrepaymentSchedule.evaluate``
+  call, as the search does;
+- ``single``: ``--sample`` candidates evaluated one call each, extrapolated to
+  all candidates;
+- ``search``: ``PrepaymentOptimizer.run``, including enumeration, ranking and
+  the yearly rollups of the best plan.
+
+Usage:
+    python -m benchmarks.prepayment [--term 30] [--budget 300000000] [--sample 100] [--rounds 3]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from typing import Any, Callable
+
+import numpy as np
+
+from calculations.mortgage_calculations import MortgageParams
+from calculations.prepayment import OptimizationParams, PlanArrays, PrepaymentOptimizer, PrepaymentSchedule
+
+
+def timed(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--term', type=int, default=30, help="Mortgage term in years")
+    parser.add_argument('--budget', type=Decimal, default=Decimal('300000000'))
+    parser.add_argument('--sample', type=int, default=100, help="Plans evaluated one at a time")
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    mortgage_params = MortgageParams(
+        property_price=Decimal('1600000000'),
+        down_payment_percentage=Decimal('0.20'),
+        interest_rate_first_period=Decimal('0.025'),
+        interest_rate_subsequent=Decimal('0.11'),
+        mortgage_term_years=args.term,
+        fixed_interest_duration_years=min(5, args.term - 1)
+    )
+    scenario = (mortgage_params, Decimal('3500000'), Decimal('0.07'))
+    params = OptimizationParams(*scenario, budget=args.budget)
+    plans = PrepaymentOptimizer.candidates(params)
+    count = len(plans.lump_sum)
+
+    batch = min(timed(lambda: PrepaymentSchedule.evaluate(*scenario, plans)) for _ in range(args.rounds))
+    sample = np.linspace(0, count - 1, min(args.sample, count)).astype(np.int64)
+    singles = [PlanArrays(*(column[index:index + 1] for column in plans)) for index in sample]
+
+    def evaluate_singles() -> None:
+        for plan in singles:
+            PrepaymentSchedule.evaluate(*scenario, plan)
+
+    single = min(timed(evaluate_singles) for _ in range(args.rounds)) / len(singles) * count
+    search = min(timed(lambda: PrepaymentOptimizer.run(params)) for _ in range(args.rounds))
+
+    print(f"{count:,} candidate plans, {args.term}-year term, best of {args.rounds} rounds")
+    print(f"  batch   {batch:8.2f}s  ({batch / count * 1e6:.1f}us per plan)")
+    print(f"  single  {single:8.2f}s  (extrapolated from {len(singles)} plans)  {single / batch:.0f}x slower")
+    print(f"  search  {search:8.2f}s")
+
+
+if __name__ == '__main__':
+    main()
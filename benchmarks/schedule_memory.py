@@ -0,0 +1,71 @@
+"""
+Memory comparison of month-by-month schedule representations.
+
+Measures, with tracemalloc, the memory retained by a 30-year schedule stored as
+a list of MonthlyComparison NamedTuples of Decimals (Decimal engine) versus the
+columnar MonthlySchedule (numpy engine), for a single scenario and for a batch.
+
+Usage:
+    python -m benchmarks.schedule_memory [--scenarios 100] [--term 30]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from decimal import Decimal
+
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+from calculations.comparison import MortgageComparison, ComparisonParams, ENGINE_DECIMAL, ENGINE_NUMPY
+
+
+def build_params(term_years: int) -> ComparisonParams:
+    mortgage_params = MortgageParams(
+        property_price=Decimal('1600000000'),
+        down_payment_percentage=Decimal('0.20'),
+        interest_rate_first_period=Decimal('0.025'),
+        interest_rate_subsequent=Decimal('0.11'),
+        mortgage_term_years=term_years,
+        fixed_interest_duration_years=5
+    )
+    return ComparisonParams(
+        monthly_rent=Decimal('3500000'),
+        mortgage_params=mortgage_params,
+        mortgage_payments=MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+        investment_return_rate=Decimal('0.07')
+    )
+
+
+def retained_bytes(params: ComparisonParams, engine: str, scenarios: int) -> int:
+    """Bytes still allocated while holding ``scenarios`` monthly schedules."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    schedules = [MortgageComparison.month_by_month_comparison(params, engine=engine).monthly_comparison
+                 for _ in range(scenarios)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del schedules
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', type=int, default=100)
+    parser.add_argument('--term', type=int, default=30)
+    args = parser.parse_args()
+
+    params = build_params(args.term)
+    # Warm up so lazy imports and caches are not counted as schedule memory
+    for engine in (ENGINE_DECIMAL, ENGINE_NUMPY):
+        MortgageComparison.month_by_month_comparison(params, engine=engine)
+    print(f"Schedule memory, {args.term}-year term ({args.term * 12} months)")
+    for count in (1, args.scenarios):
+        records = retained_bytes(params, ENGINE_DECIMAL, count)
+        columnar = retained_bytes(params, ENGINE_NUMPY, count)
+        print(f"  {count:>5} schedule(s): NamedTuple/Decimal {records / 1024:10.1f} KiB | "
+              f"columnar {columnar / 1024:8.1f} KiB | {records / columnar:5.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
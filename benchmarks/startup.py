@@ -0,0 +1,90 @@
+"""
+Cold-start benchmark: import time and first-request latency in fresh processes.
+
+Each measurement runs in a new interpreter, so module imports, template
+compilation and other one-off work are paid every time, as they are on every
+container scale-out. Reported values are the best of ``--repeat`` runs:
+
+- ``calculator``: import ``calculations.mortgage_calculations`` and compute
+  one set of mortgage payments (the scalar path).
+- ``import app``: import the web application.
+- ``app startup``: run the application startup (lifespan) handler.
+- ``first request``: the latency of the first ``POST /calculate_mortgage_payments``
+  alone, and the total from the start of the ``app`` import until its response.
+- ``cli``: wall time of ``python main.py --cli``.
+
+Usage:
+    python -m benchmarks.startup [--repeat 5]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+CALCULATOR_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from decimal import Decimal
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+MortgageCalculator.calculate_mortgage_payments(MortgageParams(
+    Decimal('1600000000'), Decimal('0.2'), Decimal('0.025'), Decimal('0.11'), 30, 5))
+print(json.dumps({'calculator': time.perf_counter() - started}))
+"""
+
+APP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client_created = time.perf_counter()
+with TestClient(app.app) as client:
+    client_ready = time.perf_counter()
+    response = client.post('/calculate_mortgage_payments', data={
+        'property_price': '1,600,000,000', 'down_payment_percentage': 20,
+        'interest_rate_first_period': 2.5, 'interest_rate_subsequent': 11,
+        'mortgage_term_years': 30, 'fixed_interest_duration_years': 5,
+        'monthly_rent': '3,500,000', 'investment_return_rate': 7})
+    response.raise_for_status()
+    finished = time.perf_counter()
+print(json.dumps({
+    'import app': imported - started,
+    'app startup': client_ready - client_created,
+    'first request latency': finished - client_ready,
+    'first request total': (imported - started) + (finished - client_created)
+}))
+"""
+
+
+def run_script(script: str) -> Dict[str, float]:
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_cli() -> Dict[str, float]:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', '--cli'], capture_output=True, check=True)
+    return {'cli': time.perf_counter() - started}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    samples: Dict[str, List[float]] = {}
+    for _ in range(args.repeat):
+        for measurement in (run_script(CALCULATOR_SCRIPT), run_script(APP_SCRIPT), run_cli()):
+            for name, seconds in measurement.items():
+                samples.setdefault(name, []).append(seconds)
+
+    print(f"Cold start, best of {args.repeat} fresh processes")
+    for name, values in samples.items():
+        print(f"  {name:<24} {min(values) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
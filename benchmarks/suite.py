@@ -0,0 +1,200 @@
+"""
+Benchmark suite for the calculation core and the HTTP path.
+
+Times ``MortgageCalculator.calculate_mortgage_payments``,
+``MortgageComparison.month_by_month_comparison`` and an end-to-end
+``POST /calculate_mortgage_payments`` through the in-process test client, over
+a range of mortgage terms, each with a fixed rate for the full term
+(``fixed``) and with a fixed period of ``min(5, term - 1)`` years followed by
+the subsequent rate (``split``). Caches are cleared before every HTTP request.
+
+Results can be saved as a JSON baseline and later compared against it; the
+process exits with status 1 when any case is slower than the baseline by more
+than ``--max-regression`` (a fraction of the baseline), so it can gate deploys.
+Comparisons use the fastest round, which is far less sensitive to scheduler
+noise than the median. Baselines are machine specific: compare only runs from
+the same host.
+
+Usage:
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json [--max-regression 0.25]
+    python -m benchmarks.suite --terms 1 10 40 --filter comparison
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from calculations import cache
+from calculations.comparison import MortgageComparison, ComparisonParams
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+
+DEFAULT_TERMS = (1, 5, 10, 15, 20, 25, 30, 35, 40)
+CONFIGS = ('fixed', 'split')
+CASES = ('payments', 'comparison', 'http')
+DEFAULT_MAX_REGRESSION = 0.25
+DEFAULT_ROUNDS = 7
+MIN_ROUND_SECONDS = 0.02
+
+
+def build_params(term_years: int, config: str) -> MortgageParams:
+    fixed_years = term_years if config == 'fixed' else min(5, term_years - 1)
+    return MortgageParams(
+        property_price=Decimal('1600000000'),
+        down_payment_percentage=Decimal('0.20'),
+        interest_rate_first_period=Decimal('0.025'),
+        interest_rate_subsequent=Decimal('0.11'),
+        mortgage_term_years=term_years,
+        fixed_interest_duration_years=fixed_years
+    )
+
+
+def build_case(case: str, term_years: int, config: str, client: Any = None) -> Callable[[], Any]:
+    """Return a zero-argument callable running one benchmark case."""
+    mortgage_params = build_params(term_years, config)
+    if case == 'payments':
+        return lambda: MortgageCalculator.calculate_mortgage_payments(mortgage_params)
+    if case == 'comparison':
+        comparison_params = ComparisonParams(
+            monthly_rent=Decimal('3500000'),
+            mortgage_params=mortgage_params,
+            mortgage_payments=MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+            investment_return_rate=Decimal('0.07')
+        )
+        return lambda: MortgageComparison.month_by_month_comparison(comparison_params)
+
+    data = {
+        'property_price': '1,600,000,000',
+        'down_payment_percentage': 20,
+        'interest_rate_first_period': 2.5,
+        'interest_rate_subsequent': 11,
+        'mortgage_term_years': term_years,
+        'fixed_interest_duration_years': mortgage_params.fixed_interest_duration_years,
+        'monthly_rent': '3,500,000',
+        'investment_return_rate': 7
+    }
+
+    def post() -> None:
+        cache.clear_caches()
+        response = client.post('/calculate_mortgage_payments', data=data)
+        response.raise_for_status()
+    return post
+
+
+def time_case(func: Callable[[], Any], rounds: int) -> Dict[str, Any]:
+    """Time ``func`` over ``rounds`` rounds; each round runs it enough times to last MIN_ROUND_SECONDS."""
+    func()  # warm up
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_ROUND_SECONDS:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'rounds': rounds,
+        'number': number
+    }
+
+
+def run_suite(terms: List[int], rounds: int, name_filter: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Run every selected case and return per-call timings (seconds) keyed by case name."""
+    client = None
+    results = {}
+    for case in CASES:
+        for config in CONFIGS:
+            for term_years in terms:
+                name = f"{case}/{config}/{term_years}y"
+                if name_filter and name_filter not in name:
+                    continue
+                if case == 'http' and client is None:
+                    # Imported only when needed so core-only runs skip the app import
+                    from fastapi.testclient import TestClient
+                    from app import app
+                    client = TestClient(app)
+                results[name] = time_case(build_case(case, term_years, config, client), rounds)
+                print(f"  {name:<24} {results[name]['median'] * 1000:10.3f} / {results[name]['min'] * 1000:.3f} ms", flush=True)
+    return results
+
+
+def metadata() -> Dict[str, Any]:
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            max_regression: float) -> List[Tuple[str, float]]:
+    """Print the comparison with the baseline and return the regressed cases with their change."""
+    regressions = []
+    print(f"\nComparison with baseline (max regression {max_regression:.0%})")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"  {name:<24} {'':>10}    new case")
+            continue
+        change = current['min'] / baseline[name]['min'] - 1.0
+        status = 'REGRESSION' if change > max_regression else 'ok'
+        print(f"  {name:<24} {change:+10.1%}    {status}")
+        if change > max_regression:
+            regressions.append((name, change))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--terms', type=int, nargs='+', default=list(DEFAULT_TERMS),
+                        help="Mortgage terms in years (1-40)")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--filter', dest='name_filter', help="Only run cases whose name contains this text")
+    parser.add_argument('--save', metavar='PATH', help="Write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a JSON baseline")
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Allowed slowdown as a fraction of the baseline (default 0.25)")
+    args = parser.parse_args()
+    if any(not 1 <= term <= 40 for term in args.terms):
+        parser.error("terms must be between 1 and 40 years")
+    if args.rounds < 1:
+        parser.error("rounds must be at least 1")
+
+    print(f"Time per call over {args.rounds} rounds (median / fastest)")
+    results = run_suite(args.terms, args.rounds, args.name_filter)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'metadata': metadata(), 'results': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.max_regression:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Precomputed growth factors for the Decimal annuity formulas.
+
+Both closed-form formulas of ``DecimalBackend`` (the monthly payment and the
+remaining balance) raise ``1 + r / 12`` to a whole number of months, which is
+about half of their cost. Batch runs mostly use annual rates on a 0.01% grid,
+so this module stores ``(1 + r / 12) ** n`` for every grid rate up to
+``--max-rate`` and every ``n`` up to ``--max-months``, in a binary file that is
+memory-mapped read-only. Every worker process shares the same page-cache pages,
+and a lookup reads one 13-byte record.
+
+Building a Decimal from the record costs about as much as the power itself in
+CPython, so each process also keeps the entries it has decoded: the
+``DECODED_LIMIT`` most recently used ones. Batch runs use few distinct rate and
+term combinations and mostly hit those.
+
+Entries hold the Decimal exactly as the formula computes it at the working
+precision, so results are identical with and without the table. Lookups fall
+back to computing the power when:
+
+- the rate is not on the grid, is above the table, or the months exceed it
+  (interpolating would change the results);
+- the decimal context differs from the one the table was built with, or the
+  file was built with another libmpdec version;
+- the power was exact when built, so its exponent depends on how the input
+  rate was written (e.g. ``0.03`` vs ``0.0300``). Only a few short terms are
+  affected.
+
+``REALESTIMATE_ANNUITY_TABLE`` sets the file. The table is only used when it
+is set: there is no default location, because a file in a shared directory
+such as the system temp directory could be replaced by any local user. Without
+the file every power is computed as before. Build it once per machine or image,
+in a directory only the application can write to:
+
+    python -m calculations.annuity_table build [--path FILE] [--max-rate 0.30] [--max-months 600]
+    python -m calculations.annuity_table info [--path FILE]
+"""
+
+import argparse
+import decimal
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_EVEN, getcontext, localcontext
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MONTHS_PER_YEAR = 12
+RATE_STEPS = 10000  # Grid steps per unit of annual rate: 0.01%
+DEFAULT_MAX_RATE = Decimal('0.30')
+DEFAULT_MAX_MONTHS = 600
+DEFAULT_PRECISION = 28
+
+MAGIC = b'REANNUIT'
+# Magic, libmpdec version, precision, rate steps per unit, rates, months per rate
+HEADER = struct.Struct('<8s16sIIII')
+COEFFICIENT_BYTES = 12  # 28-digit coefficients are below 2**94
+RECORD_SIZE = COEFFICIENT_BYTES + 1  # Coefficient, then the exponent as a signed byte
+EXACT_ENTRY = -128  # Exponent marking an entry that must be computed
+DECODED_LIMIT = 16384  # Decoded entries kept per process
+
+TABLE_PATH = os.environ.get('REALESTIMATE_ANNUITY_TABLE', '')
+
+
+class TableInfo(NamedTuple):
+    path: str
+    precision: int
+    max_rate: Decimal
+    max_months: int
+    entries: int
+    size_bytes: int
+
+
+class AnnuityTable:
+    """Read-only view of a growth factor table file."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, mpdec_version, self.precision, rate_steps, self.rate_count, self.month_count = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or rate_steps != RATE_STEPS:
+            self.close()
+            raise ValueError(f"{path} is not an annuity table")
+        if len(self._map) != HEADER.size + self.rate_count * self.month_count * RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self.path = path
+        # Powers are only reproducible with the same decimal implementation
+        self.compatible = mpdec_version.rstrip(b'\0').decode('ascii') == decimal.__libmpdec_version__
+        self._rate_index: Dict[Decimal, int] = {}
+        # (rate, months) -> Decimal, or None for entries that must be computed; in LRU order
+        self._decoded: 'OrderedDict[Tuple[Decimal, int], Optional[Decimal]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def info(self) -> TableInfo:
+        return TableInfo(self.path, self.precision, Decimal(self.rate_count - 1) / RATE_STEPS,
+                         self.month_count - 1, self.rate_count * self.month_count, len(self._map))
+
+    def _index(self, annual_rate: Decimal) -> int:
+        index = self._rate_index.get(annual_rate)
+        if index is None:
+            scaled = annual_rate * RATE_STEPS
+            if scaled != scaled.to_integral_value() or not 0 <= scaled < self.rate_count:
+                return -1
+            # Only grid rates are remembered, so the dict stays bounded
+            index = self._rate_index[annual_rate] = int(scaled)
+        return index
+
+    def growth(self, annual_rate: Decimal, months: int) -> Optional[Decimal]:
+        """Return ``(1 + annual_rate / 12) ** months`` from the table, or None if it does not apply."""
+        context = getcontext()
+        if not self.compatible or context.prec != self.precision or context.rounding != ROUND_HALF_EVEN:
+            return None
+        key = (annual_rate, months)
+        with self._lock:
+            try:
+                value = self._decoded[key]
+            except KeyError:
+                pass
+            else:
+                self._decoded.move_to_end(key)
+                return value
+        value = self._read(annual_rate, months)
+        with self._lock:
+            self._decoded[key] = value
+            while len(self._decoded) > DECODED_LIMIT:
+                self._decoded.popitem(last=False)
+        return value
+
+    def _read(self, annual_rate: Decimal, months: int) -> Optional[Decimal]:
+        if not 0 <= months < self.month_count:
+            return None
+        index = self._index(annual_rate)
+        if index < 0:
+            return None
+        offset = HEADER.size + (index * self.month_count + months) * RECORD_SIZE
+        exponent = self._map[offset + COEFFICIENT_BYTES]
+        if exponent > 127:
+            exponent -= 256
+        if exponent == EXACT_ENTRY:
+            return None
+        coefficient = int.from_bytes(self._map[offset:offset + COEFFICIENT_BYTES], 'little')
+        return Decimal(coefficient).scaleb(exponent)
+
+    def clear_decoded(self) -> None:
+        """Drop the decoded entries; later lookups read the map again."""
+        with self._lock:
+            self._decoded.clear()
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def build(path: str, max_rate: Decimal = DEFAULT_MAX_RATE, max_months: int = DEFAULT_MAX_MONTHS,
+          precision: int = DEFAULT_PRECISION) -> TableInfo:
+    """Compute every entry and write the table to ``path``.
+
+    The file is written next to ``path`` and renamed into place, so processes
+    that have the old table mapped keep a consistent view.
+
+    Raises:
+        ValueError: If the rate is not on the grid or the limits are out of range.
+    """
+    scaled = max_rate * RATE_STEPS
+    if max_rate < 0 or scaled != scaled.to_integral_value():
+        raise ValueError(f"Maximum rate must be a non-negative multiple of {Decimal(1) / RATE_STEPS}")
+    if max_months < 0:
+        raise ValueError("Maximum months cannot be negative")
+    if precision > DEFAULT_PRECISION:
+        raise ValueError(f"Precision cannot exceed {DEFAULT_PRECISION} digits")
+    rate_count = int(scaled) + 1
+    month_count = max_months + 1
+
+    records = bytearray(rate_count * month_count * RECORD_SIZE)
+    offset = 0
+    with localcontext() as context:
+        context.prec = precision
+        context.rounding = ROUND_HALF_EVEN
+        for index in range(rate_count):
+            # The same operations as DecimalBackend, so entries match bit for bit
+            growth_base = 1 + Decimal(index).scaleb(-4) / MONTHS_PER_YEAR
+            for months in range(month_count):
+                context.clear_flags()
+                value = growth_base ** months
+                sign, digits, exponent = value.as_tuple()
+                if not context.flags[decimal.Inexact]:
+                    exponent = EXACT_ENTRY
+                else:
+                    records[offset:offset + COEFFICIENT_BYTES] = int(value.scaleb(-exponent)).to_bytes(
+                        COEFFICIENT_BYTES, 'little')
+                records[offset + COEFFICIENT_BYTES] = exponent & 0xFF
+                offset += RECORD_SIZE
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.annuity-')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, decimal.__libmpdec_version__.encode('ascii'), precision, RATE_STEPS,
+                                rate_count, month_count))
+            f.write(records)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return TableInfo(path, precision, max_rate, max_months, rate_count * month_count,
+                     HEADER.size + len(records))
+
+
+_table: Optional[AnnuityTable] = None
+_loaded = False
+
+
+def load(path: Optional[str] = None) -> Optional[AnnuityTable]:
+    """Map the table at ``path`` (default ``TABLE_PATH``) for ``growth_factor``; returns None without one.
+
+    An empty path disables the table.
+    """
+    global _table, _loaded
+    if _table is not None:
+        _table.close()
+    path = TABLE_PATH if path is None else path
+    try:
+        _table = AnnuityTable(path) if path else None
+    except (OSError, ValueError):
+        _table = None
+    _loaded = True
+    return _table
+
+
+def growth_factor(annual_rate: Decimal, monthly_rate: Decimal, months: int) -> Decimal:
+    """Return ``(1 + monthly_rate) ** months``, from the table when it has the entry.
+
+    ``monthly_rate`` must be ``annual_rate / 12`` in the current context.
+    """
+    table = _table if _loaded else load()
+    if table is not None:
+        value = table.growth(annual_rate, months)
+        if value is not None:
+            return value
+    return (1 + monthly_rate) ** months
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect the annuity growth factor table")
+    parser.add_argument('command', choices=('build', 'info'))
+    parser.add_argument('--path', default=TABLE_PATH, help="Table file (default: $REALESTIMATE_ANNUITY_TABLE)")
+    parser.add_argument('--max-rate', type=Decimal, default=DEFAULT_MAX_RATE,
+                        help=f"Highest annual rate, as a fraction (default: {DEFAULT_MAX_RATE})")
+    parser.add_argument('--max-months', type=int, default=DEFAULT_MAX_MONTHS,
+                        help=f"Longest term in months (default: {DEFAULT_MAX_MONTHS})")
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("Pass --path or set REALESTIMATE_ANNUITY_TABLE")
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        try:
+            info = build(args.path, args.max_rate, args.max_months)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Built {info.entries:,} entries in {time.perf_counter() - started:.1f}s")
+    else:
+        try:
+            table = AnnuityTable(args.path)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"Error: {e}\n")
+        info = table.info
+        if not table.compatible:
+            print("Built with another libmpdec version: lookups are disabled")
+        table.close()
+    print(f"{info.path}: rates 0 to {info.max_rate:.2%} by 0.01%, 0 to {info.max_months} months, "
+          f"precision {info.precision}, {info.size_bytes / 2 ** 20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
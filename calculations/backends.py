@@ -0,0 +1,212 @@
+"""
+Numeric backends for the scalar mortgage calculations.
+
+``MortgageCalculator`` and the month-by-month loop of ``MortgageComparison``
+do all arithmetic through a backend, which fixes how amounts and rates are
+represented:
+
+- ``decimal`` (default): 28-digit ``Decimal`` arithmetic, exact to the digits
+  carried. Results are identical to the historical implementation.
+- ``float``: IEEE float64 arithmetic, several times faster. Amounts in the
+  per-month records are floats.
+- ``fixed``: integer amounts in sen (1/100 rupiah) with rates as integers
+  scaled by ``RATE_SCALE``. Every product is rounded half-even to the sen, as
+  a bank ledger would; payments are rounded to the sen as well. Values stay
+  far inside the int64 range for realistic inputs.
+
+Public results (``MortgagePayments``, totals and yearly summaries of
+``ComparisonResult``) are always converted back to ``Decimal``. The backend is
+selected per call (``backend='float'``) or per deployment with the
+``REALESTIMATE_NUMERIC_BACKEND`` environment variable.
+
+The Decimal annuity powers come from the precomputed table of
+``calculations.annuity_table`` when it has been built.
+"""
+
+import operator
+import os
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Any, Dict, Optional
+
+from .annuity_table import growth_factor
+
+MONTHS_PER_YEAR = 12
+ZERO_RATE_THRESHOLD = Decimal('0.0000001')  # Annual rates at or below this are treated as zero
+
+BACKEND_DECIMAL = 'decimal'
+BACKEND_FLOAT = 'float'
+BACKEND_FIXED = 'fixed'
+
+SEN_PER_RUPIAH = 100
+RATE_SCALE = 10 ** 15
+
+
+class DecimalBackend:
+    """Exact Decimal arithmetic (the reference backend)."""
+
+    name = BACKEND_DECIMAL
+    zero = Decimal('0')
+    native_output = True  # Native amounts are already the per-month output values
+    mul = staticmethod(operator.mul)
+
+    @staticmethod
+    def from_decimal(value: Decimal) -> Decimal:
+        return value
+
+    @staticmethod
+    def to_decimal(value: Decimal) -> Decimal:
+        return value
+
+    @staticmethod
+    def to_output(value: Decimal) -> Decimal:
+        """Convert a native amount for per-month records."""
+        return value
+
+    @staticmethod
+    def rate(value: Decimal) -> Decimal:
+        """Convert a rate or growth factor to the native representation."""
+        return value
+
+    @staticmethod
+    def div(value: Decimal, count: int) -> Decimal:
+        return value / count
+
+    @staticmethod
+    def monthly_payment(loan_amount: Decimal, annual_interest_rate: Decimal, term_months: int) -> Decimal:
+        """Closed-form annuity payment."""
+        if annual_interest_rate <= ZERO_RATE_THRESHOLD:
+            return loan_amount / Decimal(term_months)
+        monthly_interest_rate = annual_interest_rate / MONTHS_PER_YEAR
+        growth = growth_factor(annual_interest_rate, monthly_interest_rate, term_months)
+        return loan_amount * monthly_interest_rate * growth / (growth - 1)
+
+    @staticmethod
+    def remaining_balance(loan_amount: Decimal, annual_interest_rate: Decimal,
+                          duration_months: int, monthly_payment: Decimal) -> Decimal:
+        """Closed-form balance after ``duration_months`` payments, clamped at zero."""
+        if annual_interest_rate <= ZERO_RATE_THRESHOLD:
+            return loan_amount - (monthly_payment * Decimal(duration_months))
+        monthly_interest_rate = annual_interest_rate / MONTHS_PER_YEAR
+        growth = growth_factor(annual_interest_rate, monthly_interest_rate, duration_months)
+        balance = loan_amount * growth - monthly_payment * (growth - 1) / monthly_interest_rate
+        return max(Decimal('0'), balance)
+
+
+class FloatBackend:
+    """IEEE float64 arithmetic."""
+
+    name = BACKEND_FLOAT
+    zero = 0.0
+    native_output = True
+    mul = staticmethod(operator.mul)
+
+    @staticmethod
+    def from_decimal(value: Decimal) -> float:
+        return float(value)
+
+    @staticmethod
+    def to_decimal(value: float) -> Decimal:
+        # The shortest repr round-trips to the same float without binary expansion digits
+        return Decimal(repr(value))
+
+    @staticmethod
+    def to_output(value: float) -> float:
+        return value
+
+    @staticmethod
+    def rate(value: Decimal) -> float:
+        return float(value)
+
+    @staticmethod
+    def div(value: float, count: int) -> float:
+        return value / count
+
+    @staticmethod
+    def monthly_payment(loan_amount: float, annual_interest_rate: Decimal, term_months: int) -> float:
+        if annual_interest_rate <= ZERO_RATE_THRESHOLD:
+            return loan_amount / term_months
+        monthly_interest_rate = float(annual_interest_rate) / MONTHS_PER_YEAR
+        growth = (1.0 + monthly_interest_rate) ** term_months
+        return loan_amount * monthly_interest_rate * growth / (growth - 1.0)
+
+    @staticmethod
+    def remaining_balance(loan_amount: float, annual_interest_rate: Decimal,
+                          duration_months: int, monthly_payment: float) -> float:
+        if annual_interest_rate <= ZERO_RATE_THRESHOLD:
+            return loan_amount - monthly_payment * duration_months
+        monthly_interest_rate = float(annual_interest_rate) / MONTHS_PER_YEAR
+        growth = (1.0 + monthly_interest_rate) ** duration_months
+        return max(0.0, loan_amount * growth - monthly_payment * (growth - 1.0) / monthly_interest_rate)
+
+
+def _divide_half_even(numerator: int, denominator: int) -> int:
+    """Integer division rounded half to even (``denominator`` > 0)."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+class FixedPointBackend:
+    """Integer sen amounts with scaled-integer rates, rounded half-even to the sen."""
+
+    name = BACKEND_FIXED
+    zero = 0
+    native_output = False
+
+    @staticmethod
+    def from_decimal(value: Decimal) -> int:
+        return int((value * SEN_PER_RUPIAH).to_integral_value(ROUND_HALF_EVEN))
+
+    @staticmethod
+    def to_decimal(value: int) -> Decimal:
+        return Decimal(value).scaleb(-2)
+
+    to_output = to_decimal
+
+    @staticmethod
+    def rate(value: Decimal) -> int:
+        return int((value * RATE_SCALE).to_integral_value(ROUND_HALF_EVEN))
+
+    @staticmethod
+    def mul(value: int, rate: int) -> int:
+        return _divide_half_even(value * rate, RATE_SCALE)
+
+    @staticmethod
+    def div(value: int, count: int) -> int:
+        return _divide_half_even(value, count)
+
+    @classmethod
+    def monthly_payment(cls, loan_amount: int, annual_interest_rate: Decimal, term_months: int) -> int:
+        """Exact annuity payment, rounded to the sen."""
+        return cls.from_decimal(DecimalBackend.monthly_payment(
+            cls.to_decimal(loan_amount), annual_interest_rate, term_months))
+
+    @classmethod
+    def remaining_balance(cls, loan_amount: int, annual_interest_rate: Decimal,
+                          duration_months: int, monthly_payment: int) -> int:
+        return cls.from_decimal(DecimalBackend.remaining_balance(
+            cls.to_decimal(loan_amount), annual_interest_rate, duration_months, cls.to_decimal(monthly_payment)))
+
+
+BACKENDS: Dict[str, Any] = {
+    BACKEND_DECIMAL: DecimalBackend,
+    BACKEND_FLOAT: FloatBackend,
+    BACKEND_FIXED: FixedPointBackend,
+}
+
+DEFAULT_BACKEND = os.environ.get('REALESTIMATE_NUMERIC_BACKEND', BACKEND_DECIMAL)
+
+
+def get_backend(name: Optional[str] = None) -> Any:
+    """Return the backend called ``name``, or the deployment default when None.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    name = name or DEFAULT_BACKEND
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown numeric backend '{name}', expected one of {', '.join(BACKENDS)}")
+    return backend
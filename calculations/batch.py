@@ -0,0 +1,244 @@
+"""
+Batch evaluation of buy-vs-rent scenarios.
+
+Scenarios are plain dictionaries holding the ``MortgageParams`` fields plus
+``monthly_rent`` and ``investment_return_rate`` (all rates as decimal fractions,
+e.g. 0.05 for 5%), optionally with ``rate_tiers`` for tiered fixed rates.
+Each one is parsed and validated individually so that a bad record only fails
+itself; valid records are split into chunks and evaluated across a shared
+``ProcessPoolExecutor``.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backends import get_backend
+from .mortgage_calculations import MortgageCalculator, MortgageParams, RateTier
+from .comparison import MortgageComparison, ComparisonParams, ENGINE_DECIMAL, ENGINES
+
+BATCH_CHUNK_SIZE = 250
+MAX_BATCH_SIZE = 10000
+
+DECIMAL_FIELDS = ('property_price', 'down_payment_percentage', 'interest_rate_first_period',
+                  'interest_rate_subsequent', 'monthly_rent', 'investment_return_rate')
+INTEGER_FIELDS = ('mortgage_term_years', 'fixed_interest_duration_years')
+# Fields replaced by the optional 'rate_tiers' list
+TIER_DERIVED_FIELDS = ('interest_rate_first_period', 'fixed_interest_duration_years')
+
+# Parsed scenario: (mortgage params, monthly rent, investment return rate)
+Scenario = Tuple[MortgageParams, Decimal, Decimal]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        max_workers = int(os.environ.get('REALESTIMATE_BATCH_WORKERS', 0)) or None
+        # Spawn rather than fork: the server is multi-threaded, and a forked
+        # child could inherit locks held by other threads
+        _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared process pool if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _parse_decimal(field: str, raw: Any) -> Decimal:
+    try:
+        value = Decimal(str(raw).replace(',', ''))
+        if not value.is_finite():
+            raise ValueError
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Invalid value for '{field}': {raw!r}")
+    return value
+
+
+def _parse_integer(field: str, raw: Any) -> int:
+    # Integral decimals such as 20.0 (common in spreadsheet exports) are accepted
+    try:
+        if isinstance(raw, bool):
+            raise ValueError
+        value = Decimal(str(raw).strip())
+        if not value.is_finite() or value != value.to_integral_value():
+            raise ValueError
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Invalid value for '{field}': {raw!r}")
+    return int(value)
+
+
+def _parse_rate_tiers(raw: Any) -> List[RateTier]:
+    """Parse ``rate_tiers`` given as ``{"duration_years": 3, "rate": 0.025}`` objects or ``[3, 0.025]`` pairs."""
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("'rate_tiers' must be a non-empty list")
+    tiers = []
+    for tier in raw:
+        if isinstance(tier, dict):
+            if tier.get('duration_years') is None or tier.get('rate') is None:
+                raise ValueError("Each rate tier needs 'duration_years' and 'rate'")
+            duration_years, rate = tier['duration_years'], tier['rate']
+        elif isinstance(tier, (list, tuple)) and len(tier) == 2:
+            duration_years, rate = tier
+        else:
+            raise ValueError(f"Invalid rate tier: {tier!r}")
+        tiers.append(RateTier(_parse_integer('rate_tiers.duration_years', duration_years),
+                              _parse_decimal('rate_tiers.rate', rate)))
+    return tiers
+
+
+def parse_scenario(record: Dict[str, Any], allow_tiers: bool = True) -> Scenario:
+    """Parse and validate a scenario record.
+
+    A record may describe a tiered product with ``rate_tiers`` (consecutive
+    fixed-rate periods, followed by ``interest_rate_subsequent``); the
+    first-period fields are then derived from the tiers and must be omitted.
+    Callers that only support a single fixed period pass ``allow_tiers=False``.
+
+    Raises:
+        ValueError: If a field is missing, malformed or fails validation.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Scenario must be an object")
+    tiered = record.get('rate_tiers') is not None
+    if tiered and not allow_tiers:
+        raise ValueError("'rate_tiers' is not supported here")
+    fields = [field for field in DECIMAL_FIELDS + INTEGER_FIELDS
+              if not (tiered and field in TIER_DERIVED_FIELDS)]
+    values = {}
+    for field in fields:
+        if field not in record or record[field] is None:
+            raise ValueError(f"Missing field '{field}'")
+        parse = _parse_integer if field in INTEGER_FIELDS else _parse_decimal
+        values[field] = parse(field, record[field])
+
+    if tiered:
+        for field in TIER_DERIVED_FIELDS:
+            if record.get(field) is not None:
+                raise ValueError(f"'{field}' is derived from 'rate_tiers' and must be omitted")
+        mortgage_params = MortgageParams.from_tiers(
+            property_price=values['property_price'],
+            down_payment_percentage=values['down_payment_percentage'],
+            rate_tiers=_parse_rate_tiers(record['rate_tiers']),
+            floating_rate=values['interest_rate_subsequent'],
+            mortgage_term_years=values['mortgage_term_years']
+        )
+    else:
+        mortgage_params = MortgageParams(
+            property_price=values['property_price'],
+            down_payment_percentage=values['down_payment_percentage'],
+            interest_rate_first_period=values['interest_rate_first_period'],
+            interest_rate_subsequent=values['interest_rate_subsequent'],
+            mortgage_term_years=values['mortgage_term_years'],
+            fixed_interest_duration_years=values['fixed_interest_duration_years']
+        )
+    MortgageCalculator.validate_input(mortgage_params)
+    if values['monthly_rent'] < 0:
+        raise ValueError("Monthly rent cannot be negative")
+    return mortgage_params, values['monthly_rent'], values['investment_return_rate']
+
+
+def evaluate_scenario(scenario: Scenario, engine: str = ENGINE_DECIMAL, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluate a parsed scenario and return its compact result."""
+    mortgage_params, monthly_rent, investment_return_rate = scenario
+    mortgage_payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params, backend)
+    result = MortgageComparison.month_by_month_comparison(ComparisonParams(
+        monthly_rent=monthly_rent,
+        mortgage_params=mortgage_params,
+        mortgage_payments=mortgage_payments,
+        investment_return_rate=investment_return_rate
+    ), engine=engine, summary_only=True, backend=backend)
+    return {
+        'monthly_payment_first_period': float(mortgage_payments.monthly_payment_first_period),
+        'monthly_payment_subsequent': float(mortgage_payments.monthly_payment_subsequent),
+        'loan_amount': float(mortgage_payments.loan_amount),
+        'total_mortgage_cost': float(result.total_mortgage_cost),
+        'total_interest_paid': float(result.total_interest_paid),
+        'total_investment_growth': float(result.total_investment_growth),
+        'net_benefit_buying': float(result.net_benefit_buying),
+        'is_buying_cheaper': result.is_buying_cheaper
+    }
+
+
+def evaluate_chunk(chunk: List[Tuple[int, Scenario]], engine: str = ENGINE_DECIMAL,
+                   backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Evaluate a chunk of indexed scenarios; runs inside a pool worker."""
+    results = []
+    for index, scenario in chunk:
+        try:
+            results.append({'index': index, 'result': evaluate_scenario(scenario, engine, backend)})
+        except (ValueError, ArithmeticError) as e:
+            results.append({'index': index, 'error': str(e)})
+    return results
+
+
+def validate_batch(records: List[Dict[str, Any]], engine: str = ENGINE_DECIMAL, backend: Optional[str] = None) -> str:
+    """Check the batch as a whole and return the resolved backend name.
+
+    The backend is resolved here so workers agree with the parent's default
+    and bad names fail early.
+
+    Raises:
+        ValueError: If the batch is too large or the engine or backend is unknown.
+    """
+    if len(records) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE} scenarios")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown calculation engine '{engine}', expected one of {', '.join(ENGINES)}")
+    return get_backend(backend).name
+
+
+def evaluate_records(records: List[Dict[str, Any]], start: int, stop: int, engine: str = ENGINE_DECIMAL,
+                     backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Parse and evaluate ``records[start:stop]`` in-process, reporting errors per item."""
+    results = []
+    valid = []
+    for index in range(start, stop):
+        try:
+            valid.append((index, parse_scenario(records[index])))
+        except ValueError as e:
+            results.append({'index': index, 'error': str(e)})
+    results.extend(evaluate_chunk(valid, engine, backend))
+    results.sort(key=lambda item: item['index'])
+    return results
+
+
+def evaluate_batch(records: List[Dict[str, Any]], engine: str = ENGINE_DECIMAL,
+                   chunk_size: int = BATCH_CHUNK_SIZE, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Evaluate a list of scenario records, reporting errors per item.
+
+    Returns one entry per record, in input order, holding either ``result`` or
+    ``error``. Batches that fit into a single chunk are evaluated in-process.
+
+    Raises:
+        ValueError: If the batch as a whole is invalid (too large, unknown engine or backend).
+    """
+    backend = validate_batch(records, engine, backend)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    valid = []
+    for index, record in enumerate(records):
+        try:
+            valid.append((index, parse_scenario(record)))
+        except ValueError as e:
+            results[index] = {'index': index, 'error': str(e)}
+
+    chunks = [valid[start:start + chunk_size] for start in range(0, len(valid), chunk_size)]
+    if len(chunks) <= 1:
+        evaluated = [evaluate_chunk(chunk, engine, backend) for chunk in chunks]
+    else:
+        executor = get_executor()
+        evaluated = executor.map(evaluate_chunk, chunks, [engine] * len(chunks), [backend] * len(chunks))
+
+    for chunk_results in evaluated:
+        for item in chunk_results:
+            results[item['index']] = item
+    return results
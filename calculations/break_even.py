@@ -0,0 +1,191 @@
+"""
+Break-even solver for the buy-vs-rent verdict.
+
+Finds the value of one free input at which ``net_benefit_buying`` crosses zero
+while every other input stays fixed. Each listing is solved with a safeguarded
+Newton iteration: Newton steps (finite-difference derivative) inside a sign
+bracket, falling back to bisection whenever a step would leave the bracket.
+All listings are iterated together as arrays on top of the closed-form
+evaluator in ``calculations.vectorized``.
+"""
+
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .batch import MAX_BATCH_SIZE, parse_scenario
+from .mortgage_calculations import MAX_PROPERTY_PRICE
+from .vectorized import evaluate_summary
+
+# Free variables with their default search bracket. A bound of None means the
+# listing's property price, which comfortably bounds any monthly rent.
+BREAK_EVEN_VARIABLES = {
+    'monthly_rent': (0.0, None),
+    'property_price': (1.0, float(MAX_PROPERTY_PRICE)),
+    'interest_rate_subsequent': (0.0, 1.0),
+    'investment_return_rate': (-0.5, 1.0),
+}
+DEFAULT_TOLERANCE = 1.0  # IDR of net benefit
+MAX_ITERATIONS = 100
+
+
+class BreakEvenResult(NamedTuple):
+    # One entry per listing; threshold is NaN where the range holds no sign change
+    threshold: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+    # True when values above the threshold favour buying
+    buying_better_above: np.ndarray
+    elapsed_seconds: float
+
+
+class BreakEvenSolver:
+    @staticmethod
+    def _net_benefit(inputs: Dict[str, np.ndarray], variable: str, values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Evaluate net_benefit_buying for the selected rows with the free variable set to ``values``."""
+        selected = {name: column[rows] for name, column in inputs.items()}
+        selected[variable] = values
+        return evaluate_summary(**selected).net_benefit_buying
+
+    @classmethod
+    def solve(cls, inputs: Dict[str, np.ndarray], variable: str, lower: np.ndarray, upper: np.ndarray,
+              tolerance: float = DEFAULT_TOLERANCE, max_iterations: int = MAX_ITERATIONS) -> BreakEvenResult:
+        """Solve net_benefit_buying == 0 for ``variable`` on every listing.
+
+        ``inputs`` maps the evaluate_summary argument names to 1-D arrays of equal
+        length; the entry for ``variable`` is ignored. ``lower`` and ``upper``
+        bracket the search per listing.
+        """
+        if variable not in BREAK_EVEN_VARIABLES:
+            raise ValueError(f"Unknown variable '{variable}', expected one of {', '.join(BREAK_EVEN_VARIABLES)}")
+        started = time.perf_counter()
+
+        count = len(lower)
+        lower = np.asarray(lower, dtype=np.float64).copy()
+        upper = np.asarray(upper, dtype=np.float64).copy()
+        all_rows = np.arange(count)
+        f_lower = cls._net_benefit(inputs, variable, lower, all_rows)
+        f_upper = cls._net_benefit(inputs, variable, upper, all_rows)
+
+        threshold = np.full(count, np.nan)
+        iterations = np.zeros(count, dtype=np.int64)
+        converged = np.zeros(count, dtype=bool)
+        buying_better_above = f_upper > f_lower
+
+        # Roots sitting on a bound are solved immediately
+        at_lower = np.abs(f_lower) <= tolerance
+        at_upper = ~at_lower & (np.abs(f_upper) <= tolerance)
+        threshold[at_lower] = lower[at_lower]
+        threshold[at_upper] = upper[at_upper]
+        converged |= at_lower | at_upper
+
+        active = ~converged & (np.sign(f_lower) * np.sign(f_upper) < 0)
+        rows = all_rows[active]
+        lo, hi, f_lo, f_hi = lower[rows], upper[rows], f_lower[rows], f_upper[rows]
+        # Start from the secant point of the bracket, which is exact for linear variables
+        x = lo - f_lo * (hi - lo) / (f_hi - f_lo)
+
+        for iteration in range(1, max_iterations + 1):
+            if rows.size == 0:
+                break
+            step = 1e-7 * np.maximum(np.abs(x), 1e-3)
+            f_x = cls._net_benefit(inputs, variable, x, rows)
+            f_step = cls._net_benefit(inputs, variable, x + step, rows)
+            iterations[rows] = iteration
+
+            done = (np.abs(f_x) <= tolerance) | ((hi - lo) <= 1e-12 * (1.0 + np.abs(x)))
+            threshold[rows[done]] = x[done]
+            converged[rows[done]] = True
+
+            # Shrink the bracket around the sign change
+            same_as_lower = np.sign(f_x) == np.sign(f_lo)
+            lo = np.where(same_as_lower, x, lo)
+            f_lo = np.where(same_as_lower, f_x, f_lo)
+            hi = np.where(same_as_lower, hi, x)
+            f_hi = np.where(same_as_lower, f_hi, f_x)
+
+            # Newton step, or bisection when it leaves the bracket
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = x - f_x * step / (f_step - f_x)
+            inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+            x = np.where(inside, newton, 0.5 * (lo + hi))
+
+            keep = ~done
+            rows, x, lo, hi, f_lo, f_hi = rows[keep], x[keep], lo[keep], hi[keep], f_lo[keep], f_hi[keep]
+
+        # Listings that ran out of iterations report their best estimate, unconverged
+        threshold[rows] = x
+
+        return BreakEvenResult(
+            threshold=threshold,
+            iterations=iterations,
+            converged=converged,
+            buying_better_above=buying_better_above,
+            elapsed_seconds=time.perf_counter() - started
+        )
+
+
+def solve_listings(records: List[Dict[str, Any]], variable: str, lower: Optional[float] = None,
+                   upper: Optional[float] = None, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """Solve the break-even ``variable`` for scenario records (calculations.batch format).
+
+    The free variable may be omitted from the records. Returns per-listing
+    entries with either the solution or an ``error``, plus the solver timing.
+
+    Raises:
+        ValueError: If the variable, the bounds or the batch size are invalid.
+    """
+    if variable not in BREAK_EVEN_VARIABLES:
+        raise ValueError(f"Unknown variable '{variable}', expected one of {', '.join(BREAK_EVEN_VARIABLES)}")
+    if len(records) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE} scenarios")
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError("Lower bound must be below the upper bound")
+    default_lower, default_upper = BREAK_EVEN_VARIABLES[variable]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    indices, columns, lower_bounds, upper_bounds = [], {}, [], []
+    for index, record in enumerate(records):
+        try:
+            if isinstance(record, dict) and record.get(variable) is None:
+                # Placeholder that passes validation; the solver overrides it
+                record = {**record, variable: lower if lower is not None else max(default_lower, 1.0)}
+            mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record, allow_tiers=False)
+        except ValueError as e:
+            results[index] = {'index': index, 'error': str(e)}
+            continue
+        values = {
+            'property_price': float(mortgage_params.property_price),
+            'down_payment_percentage': float(mortgage_params.down_payment_percentage),
+            'interest_rate_first_period': float(mortgage_params.interest_rate_first_period),
+            'interest_rate_subsequent': float(mortgage_params.interest_rate_subsequent),
+            'mortgage_term_years': mortgage_params.mortgage_term_years,
+            'fixed_interest_duration_years': mortgage_params.fixed_interest_duration_years,
+            'monthly_rent': float(monthly_rent),
+            'investment_return_rate': float(investment_return_rate),
+        }
+        for name, value in values.items():
+            columns.setdefault(name, []).append(value)
+        indices.append(index)
+        lower_bounds.append(lower if lower is not None else default_lower)
+        upper_bounds.append(upper if upper is not None else (default_upper or values['property_price']))
+
+    elapsed = 0.0
+    if indices:
+        inputs = {name: np.asarray(column, dtype=np.float64) for name, column in columns.items()}
+        solution = BreakEvenSolver.solve(inputs, variable, np.asarray(lower_bounds), np.asarray(upper_bounds), tolerance)
+        elapsed = solution.elapsed_seconds
+        for position, index in enumerate(indices):
+            threshold = solution.threshold[position]
+            results[index] = {
+                'index': index,
+                'threshold': None if np.isnan(threshold) else float(threshold),
+                'iterations': int(solution.iterations[position]),
+                'converged': bool(solution.converged[position]),
+                'buying_better_above': bool(solution.buying_better_above[position])
+            }
+            if np.isnan(threshold):
+                results[index]['error'] = "No break-even point within the search range"
+
+    return {'variable': variable, 'elapsed_seconds': elapsed, 'results': results}
@@ -0,0 +1,274 @@
+"""
+Streaming evaluation of large listing files.
+
+Listings are read from a CSV whose columns use the ``calculations.batch``
+field names (rates as decimal fractions); extra columns are ignored, except
+for an optional id column that is copied to the output. Rows are grouped into
+chunks of ``chunk_size`` and evaluated across a ``ProcessPoolExecutor``. At
+most two chunks per process are in flight, so memory stays constant
+however long the file is. Each chunk is encoded as CSV or NDJSON inside its
+worker and written in input order as soon as it is done.
+
+Engines:
+
+- ``decimal``: every row through ``batch.evaluate_scenario`` with the chosen
+  numeric backend, as ``/api/batch`` does.
+- ``numpy``: rows are parsed and validated one by one, then the whole chunk is
+  evaluated at once with the closed-form ``vectorized.evaluate_summary``
+  (same tolerance as the numpy engine). Much faster for large files.
+
+Invalid rows produce an output row with an ``error`` message instead of
+stopping the run.
+"""
+
+import csv
+import io
+import json
+import os
+import stat
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, IO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .batch import DECIMAL_FIELDS, INTEGER_FIELDS, evaluate_scenario, parse_scenario
+from .comparison import ENGINE_DECIMAL, ENGINE_NUMPY, ENGINES
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+OUTPUT_FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+DEFAULT_CHUNK_SIZE = 2000
+INFLIGHT_CHUNKS_PER_PROCESS = 2
+PROGRESS_INTERVAL = 1.0  # Seconds between progress lines
+
+REQUIRED_COLUMNS = DECIMAL_FIELDS + INTEGER_FIELDS
+RESULT_FIELDS = ('monthly_payment_first_period', 'monthly_payment_subsequent', 'loan_amount',
+                 'total_mortgage_cost', 'total_interest_paid', 'total_investment_growth',
+                 'net_benefit_buying', 'is_buying_cheaper')
+
+# Data rows of one chunk: (1-based row number of the first row, raw CSV rows)
+Chunk = Tuple[int, List[List[str]]]
+
+
+class BulkSummary(NamedTuple):
+    rows: int
+    errors: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def output_columns(id_column: Optional[str] = None) -> List[str]:
+    """Columns of every output row, in order."""
+    return ([id_column] if id_column else []) + ['row', *RESULT_FIELDS, 'error']
+
+
+def _evaluate_decimal(records: List[Dict[str, str]], engine: str, backend: Optional[str]) -> List[Any]:
+    results: List[Any] = []
+    for record in records:
+        try:
+            results.append(evaluate_scenario(parse_scenario(record, allow_tiers=False), engine, backend))
+        except (ValueError, ArithmeticError) as e:
+            results.append(str(e))
+    return results
+
+
+def _evaluate_numpy(records: List[Dict[str, str]]) -> List[Any]:
+    import numpy as np
+    from .vectorized import evaluate_summary
+
+    results: List[Any] = [None] * len(records)
+    valid = []
+    columns: Dict[str, List[float]] = {field: [] for field in REQUIRED_COLUMNS}
+    for position, record in enumerate(records):
+        try:
+            mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record, allow_tiers=False)
+        except ValueError as e:
+            results[position] = str(e)
+            continue
+        valid.append(position)
+        values = {'monthly_rent': monthly_rent, 'investment_return_rate': investment_return_rate}
+        for field in REQUIRED_COLUMNS:
+            columns[field].append(float(values[field] if field in values else getattr(mortgage_params, field)))
+    if not valid:
+        return results
+
+    arrays = {field: np.array(values) for field, values in columns.items()}
+    summary = evaluate_summary(**arrays)
+    loan_amount = arrays['property_price'] * (1.0 - arrays['down_payment_percentage'])
+    outputs = {name: getattr(summary, name).tolist() for name in summary._fields}
+    outputs['loan_amount'] = loan_amount.tolist()
+    for offset, position in enumerate(valid):
+        net_benefit = outputs['net_benefit_buying'][offset]
+        if net_benefit != net_benefit:  # NaN: rejected by the vectorized validity mask
+            results[position] = "Calculation failed for these inputs"
+            continue
+        result = {name: outputs[name][offset] for name in RESULT_FIELDS if name != 'is_buying_cheaper'}
+        result['is_buying_cheaper'] = net_benefit > 0
+        results[position] = result
+    return results
+
+
+def evaluate_chunk(header: Sequence[str], chunk: Chunk, engine: str = ENGINE_DECIMAL,
+                   backend: Optional[str] = None, output_format: str = FORMAT_CSV,
+                   id_column: Optional[str] = None) -> Tuple[str, int, int]:
+    """Evaluate and encode one chunk; runs inside a pool worker.
+
+    Returns the encoded output rows, the number of rows and the number of errors.
+    """
+    first_row, rows = chunk
+    records = [dict(zip(header, row)) for row in rows]
+    if engine == ENGINE_NUMPY:
+        results = _evaluate_numpy(records)
+    else:
+        results = _evaluate_decimal(records, engine, backend)
+
+    columns = output_columns(id_column)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n') if output_format == FORMAT_CSV else None
+    errors = 0
+    for offset, (record, result) in enumerate(zip(records, results)):
+        item: Dict[str, Any] = {id_column: record.get(id_column)} if id_column else {}
+        item['row'] = first_row + offset
+        if isinstance(result, str):
+            errors += 1
+            item['error'] = result
+        else:
+            item.update(result)
+        if writer is not None:
+            writer.writerow([item.get(column, '') for column in columns])
+        else:
+            buffer.write(json.dumps(item, separators=(',', ':')))
+            buffer.write('\n')
+    return buffer.getvalue(), len(rows), errors
+
+
+def iter_chunks(reader: Iterator[List[str]], chunk_size: int) -> Iterator[Chunk]:
+    """Group data rows into numbered chunks, skipping blank lines."""
+    rows: List[List[str]] = []
+    first_row = 1
+    row_number = 0
+    for row in reader:
+        if not row:
+            continue
+        row_number += 1
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield first_row, rows
+            rows = []
+            first_row = row_number + 1
+    if rows:
+        yield first_row, rows
+
+
+def _input_position(source: IO[str]) -> Tuple[Optional[Callable[[], int]], int]:
+    """Return a byte position callback and the size of a regular input file, or (None, 0)."""
+    try:
+        status = os.fstat(source.fileno())
+        buffer = source.buffer  # type: ignore[attr-defined]
+    except (AttributeError, OSError):
+        return None, 0
+    if not stat.S_ISREG(status.st_mode) or not status.st_size:
+        return None, 0
+    return buffer.tell, status.st_size
+
+
+class ProgressReporter:
+    """Prints rows done, errors and throughput at most once per interval.
+
+    With ``position`` and ``size`` (bytes read and total bytes of the input)
+    lines start with the fraction of the input read.
+    """
+
+    def __init__(self, stream: IO[str], position: Optional[Callable[[], int]] = None, size: int = 0,
+                 interval: float = PROGRESS_INTERVAL):
+        self.stream = stream
+        self.position = position
+        self.size = size
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def update(self, rows: int, errors: int) -> None:
+        now = time.perf_counter()
+        if now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.started
+        line = f"{rows:,} rows, {errors:,} errors, {rows / elapsed if elapsed else 0:,.0f} rows/s, {elapsed:.1f}s"
+        if self.position is not None:
+            line = f"{min(self.position() / self.size, 1.0):6.1%}  {line}"
+        self.stream.write(line + '\n')
+        self.stream.flush()
+
+
+def evaluate_file(source: IO[str], destination: IO[str], engine: str = ENGINE_DECIMAL,
+                  backend: Optional[str] = None, output_format: str = FORMAT_CSV,
+                  processes: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  id_column: Optional[str] = None, progress: Optional[IO[str]] = sys.stderr) -> BulkSummary:
+    """Evaluate every listing of a CSV stream and write the results as they complete.
+
+    ``processes`` defaults to the CPU count; with one process the chunks are
+    evaluated in the calling process. Progress lines go to ``progress``
+    unless it is None; the returned summary holds the totals.
+
+    Raises:
+        ValueError: If an option is invalid or the header lacks a required column.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown calculation engine '{engine}', expected one of {', '.join(ENGINES)}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {', '.join(OUTPUT_FORMATS)}")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be greater than 0")
+    if engine == ENGINE_DECIMAL:
+        from .backends import get_backend
+        # Resolved here so workers agree with the parent's default and bad names fail early
+        backend = get_backend(backend).name
+    processes = processes or os.cpu_count() or 1
+
+    reader = csv.reader(source)
+    header = [column.strip() for column in next(reader, [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+    if id_column and id_column not in header:
+        raise ValueError(f"Input has no column '{id_column}'")
+
+    if output_format == FORMAT_CSV:
+        csv.writer(destination, lineterminator='\n').writerow(output_columns(id_column))
+    reporter = ProgressReporter(progress, *_input_position(source)) if progress is not None else None
+    rows = errors = 0
+    options = (engine, backend, output_format, id_column)
+
+    def write(encoded: Tuple[str, int, int]) -> None:
+        nonlocal rows, errors
+        text, chunk_rows, chunk_errors = encoded
+        destination.write(text)
+        rows += chunk_rows
+        errors += chunk_errors
+        if reporter is not None:
+            reporter.update(rows, errors)
+
+    chunks = iter_chunks(reader, chunk_size)
+    started = time.perf_counter()
+    if processes == 1:
+        for chunk in chunks:
+            write(evaluate_chunk(header, chunk, *options))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            # Submit ahead by a bounded window and write in input order
+            window = processes * INFLIGHT_CHUNKS_PER_PROCESS
+            pending: deque = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(evaluate_chunk, header, chunk, *options))
+                if len(pending) >= window:
+                    write(pending.popleft().result())
+            for future in pending:
+                write(future.result())
+
+    destination.flush()
+    return BulkSummary(rows, errors, time.perf_counter() - started)
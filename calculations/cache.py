@@ -0,0 +1,219 @@
+"""
+Bounded result caches for mortgage calculations.
+
+Independent LRU layers with optional TTL are kept for
+``MortgageCalculator.calculate_mortgage_payments`` and for each stage of
+``MortgageComparison.month_by_month_comparison``: the amortization (mortgage
+inputs only), the rent/investment overlay (plus rent and return rate) and the
+aggregated result. A submission that only changes the rent or the return rate
+reuses the cached amortization and recomputes just the overlay and aggregates.
+
+Keys are built from the normalized calculation inputs, so equivalent
+submissions (``0.2`` vs ``0.20``, or a different subsequent rate when the rate
+is fixed for the whole term) share an entry; the numeric backend is part of
+every key. Cached results are shared between callers and must not be mutated.
+
+Sizes and TTL are configured with ``REALESTIMATE_CACHE_SIZE`` (entries per
+layer, 0 disables caching) and ``REALESTIMATE_CACHE_TTL`` (seconds, 0 or unset
+for no expiry).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .backends import get_backend
+from .mortgage_calculations import MortgageCalculator, MortgageParams, MortgagePayments
+from .comparison import MortgageComparison, ComparisonParams, ComparisonResult, ENGINE_DECIMAL
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` for ``key``, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at and expires_at <= time.monotonic():
+                    del self._entries[key]
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting least recently used entries."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or compute and store it."""
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters and configuration."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def _cache_from_env() -> LRUCache:
+    return LRUCache(maxsize=int(os.environ.get('REALESTIMATE_CACHE_SIZE', DEFAULT_CACHE_SIZE)),
+                    ttl=float(os.environ.get('REALESTIMATE_CACHE_TTL', 0)))
+
+
+payments_cache = _cache_from_env()
+amortization_cache = _cache_from_env()
+overlay_cache = _cache_from_env()
+comparison_cache = _cache_from_env()
+
+
+def _normalize(value: Decimal) -> Decimal:
+    """Normalize a Decimal so equal values produce identical keys."""
+    return value.normalize() if value else Decimal('0')
+
+
+def mortgage_params_key(params: MortgageParams) -> Tuple:
+    """Build a cache key from mortgage parameters.
+
+    The subsequent rate is left out when the fixed period covers the whole term,
+    since it does not affect any result in that case.
+    """
+    fixed_for_full_term = params.fixed_interest_duration_years == params.mortgage_term_years
+    return (
+        _normalize(params.property_price),
+        _normalize(params.down_payment_percentage),
+        _normalize(params.interest_rate_first_period),
+        None if fixed_for_full_term else _normalize(params.interest_rate_subsequent),
+        params.mortgage_term_years,
+        params.fixed_interest_duration_years,
+        tuple((tier.duration_years, _normalize(tier.rate)) for tier in params.rate_tiers) if params.rate_tiers else None
+    )
+
+
+def amortization_key(params: ComparisonParams, engine: str = ENGINE_DECIMAL, backend: Optional[str] = None,
+                     columns: bool = True) -> Tuple:
+    """Build a cache key for the amortization stage (mortgage inputs only)."""
+    return mortgage_params_key(params.mortgage_params), engine, get_backend(backend).name, columns
+
+
+def overlay_key(params: ComparisonParams, engine: str = ENGINE_DECIMAL, backend: Optional[str] = None,
+                columns: bool = True) -> Tuple:
+    """Build a cache key for the rent/investment overlay stage."""
+    return (
+        amortization_key(params, engine, backend, columns),
+        _normalize(params.monthly_rent),
+        _normalize(params.investment_return_rate)
+    )
+
+
+def comparison_key(params: ComparisonParams, engine: str = ENGINE_DECIMAL, summary_only: bool = False,
+                   backend: Optional[str] = None) -> Tuple:
+    """Build a cache key from comparison parameters and engine options."""
+    return overlay_key(params, engine, backend, not summary_only), summary_only
+
+
+def scenario_key(mortgage_params: MortgageParams, monthly_rent: Decimal, investment_return_rate: Decimal,
+                 engine: str = ENGINE_DECIMAL, summary_only: bool = False, backend: Optional[str] = None) -> Tuple:
+    """Build the comparison key from raw inputs, before the mortgage payments are known."""
+    params = ComparisonParams(monthly_rent=monthly_rent, mortgage_params=mortgage_params,
+                              mortgage_payments=None, investment_return_rate=investment_return_rate)
+    return comparison_key(params, engine, summary_only, backend)
+
+
+def cached_mortgage_payments(params: MortgageParams, backend: Optional[str] = None) -> MortgagePayments:
+    """Cached MortgageCalculator.calculate_mortgage_payments."""
+    # Validate first so invalid input never resolves to a cached result
+    MortgageCalculator.validate_input(params)
+    # Keyed by the resolved name so the default and its explicit name share entries
+    backend = get_backend(backend).name
+    return payments_cache.get_or_compute(
+        (mortgage_params_key(params), backend),
+        lambda: MortgageCalculator.calculate_mortgage_payments(params, backend))
+
+
+def cached_comparison(params: ComparisonParams, engine: str = ENGINE_DECIMAL,
+                      summary_only: bool = False, backend: Optional[str] = None) -> ComparisonResult:
+    """Cached MortgageComparison.month_by_month_comparison, computed from cached stages.
+
+    Summary-only comparisons build and cache compact stages, which hold the
+    rate periods and yearly sums but no per-month columns, under their own
+    keys.
+    """
+    columns = not summary_only
+
+    def compute() -> ComparisonResult:
+        stages = MortgageComparison.stages(engine)
+        amortization = amortization_cache.get_or_compute(
+            amortization_key(params, engine, backend, columns),
+            lambda: stages.amortization(params, backend, columns=columns))
+        overlay = overlay_cache.get_or_compute(
+            overlay_key(params, engine, backend, columns), lambda: stages.investment_overlay(params, amortization))
+        return stages.aggregate(params, amortization, overlay, summary_only)
+
+    return comparison_cache.get_or_compute(comparison_key(params, engine, summary_only, backend), compute)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the counters of every cache layer."""
+    return {
+        'payments': payments_cache.stats(),
+        'amortization': amortization_cache.stats(),
+        'overlay': overlay_cache.stats(),
+        'comparison': comparison_cache.stats()
+    }
+
+
+def clear_caches() -> None:
+    """Empty every cache layer."""
+    payments_cache.clear()
+    amortization_cache.clear()
+    overlay_cache.clear()
+    comparison_cache.clear()
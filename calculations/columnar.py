@@ -0,0 +1,137 @@
+"""
+Columnar (struct-of-arrays) storage for month-by-month schedules.
+
+``MonthlySchedule`` keeps every amount column of ``MonthlyComparison`` as one
+contiguous float64 row of a single 2-D block, instead of one NamedTuple of
+Decimals per month. It behaves like a read-only sequence of lazy row views that
+support the same attribute access as ``MonthlyComparison`` (``mc.month``,
+``mc.interest_for_the_month``, ...), and exposes its columns to NumPy without
+copying for charting and export. Amounts read through row views are floats.
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+from .comparison import MonthlyComparison
+
+MONTHS_PER_YEAR = 12
+
+# Columns derived from the row position rather than stored
+INDEX_COLUMNS = ('month', 'year', 'month_of_year')
+# Stored float64 columns, in block row order
+AMOUNT_COLUMNS = tuple(field for field in MonthlyComparison._fields if field not in INDEX_COLUMNS)
+_AMOUNT_ROWS = {name: row for row, name in enumerate(AMOUNT_COLUMNS)}
+
+
+class ScheduleRow:
+    """Lazy view of one month of a MonthlySchedule with MonthlyComparison attributes."""
+
+    __slots__ = ('_schedule', '_index')
+    _fields = MonthlyComparison._fields
+
+    def __init__(self, schedule: 'MonthlySchedule', index: int):
+        self._schedule = schedule
+        self._index = index
+
+    @property
+    def month(self) -> int:
+        return self._index + 1
+
+    @property
+    def year(self) -> int:
+        return self._index // MONTHS_PER_YEAR + 1
+
+    @property
+    def month_of_year(self) -> int:
+        return self._index % MONTHS_PER_YEAR + 1
+
+    def __getattr__(self, name: str) -> float:
+        row = _AMOUNT_ROWS.get(name)
+        if row is None:
+            raise AttributeError(f"'ScheduleRow' object has no attribute '{name}'")
+        return float(self._schedule.data[row, self._index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return (getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ScheduleRow, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{field}={value!r}" for field, value in zip(self._fields, self))
+        return f"ScheduleRow({values})"
+
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+    def to_record(self) -> MonthlyComparison:
+        """Materialize the row as a MonthlyComparison (with float amounts)."""
+        return MonthlyComparison._make(self)
+
+
+class MonthlySchedule(Sequence):
+    """Read-only month-by-month schedule stored as one float64 array per column."""
+
+    def __init__(self, data: np.ndarray):
+        if data.ndim != 2 or data.shape[0] != len(AMOUNT_COLUMNS):
+            raise ValueError(f"Schedule data must have shape ({len(AMOUNT_COLUMNS)}, months)")
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+        self.data.setflags(write=False)
+
+    @classmethod
+    def from_columns(cls, **columns: np.ndarray) -> 'MonthlySchedule':
+        """Build a schedule from one array (or scalar) per amount column."""
+        missing = set(AMOUNT_COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing schedule columns: {', '.join(sorted(missing))}")
+        months = max(np.size(value) for value in columns.values())
+        data = np.empty((len(AMOUNT_COLUMNS), months))
+        for row, name in enumerate(AMOUNT_COLUMNS):
+            data[row] = columns[name]
+        return cls(data)
+
+    @classmethod
+    def from_records(cls, records: Sequence[MonthlyComparison]) -> 'MonthlySchedule':
+        """Convert MonthlyComparison records (e.g. from the Decimal engine) to columns."""
+        data = np.array([[float(getattr(record, name)) for record in records] for name in AMOUNT_COLUMNS],
+                        dtype=np.float64).reshape(len(AMOUNT_COLUMNS), len(records))
+        return cls(data)
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ScheduleRow, List[ScheduleRow]]:
+        if isinstance(index, slice):
+            return [ScheduleRow(self, position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("schedule index out of range")
+        return ScheduleRow(self, index)
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        return (ScheduleRow(self, index) for index in range(len(self)))
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one column as a NumPy array; amount columns are read-only views."""
+        if name == 'month':
+            return np.arange(1, len(self) + 1)
+        if name == 'year':
+            return np.arange(len(self)) // MONTHS_PER_YEAR + 1
+        if name == 'month_of_year':
+            return np.arange(len(self)) % MONTHS_PER_YEAR + 1
+        if name not in _AMOUNT_ROWS:
+            raise KeyError(name)
+        return self.data[_AMOUNT_ROWS[name]]
+
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        """Return every amount column as a zero-copy view keyed by field name."""
+        return {name: self.data[row] for row, name in enumerate(AMOUNT_COLUMNS)}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column storage."""
+        return self.data.nbytes
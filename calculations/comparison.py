@@ -1,8 +1,14 @@
-from typing import List, NamedTuple, Dict
+from typing import Any, Iterator, List, NamedTuple, Dict, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from decimal import Decimal
+from .backends import BACKEND_FIXED, get_backend
 from .mortgage_calculations import MortgageCalculator, MortgageParams, MortgagePayments
 
+# Available calculation engines for MortgageComparison.month_by_month_comparison
+ENGINE_DECIMAL = 'decimal'  # Exact month-by-month Decimal loop (default)
+ENGINE_NUMPY = 'numpy'      # Vectorized float64 engine, see calculations.vectorized
+ENGINES = (ENGINE_DECIMAL, ENGINE_NUMPY)
+
 @dataclass
 class ComparisonParams:
     monthly_rent: Decimal
@@ -32,7 +38,8 @@ class YearSummary(NamedTuple):
     total_interest_paid: Decimal
 
 class ComparisonResult(NamedTuple):
-    monthly_comparison: List[MonthlyComparison]
+    # List of records from the Decimal engine, columnar MonthlySchedule from the numpy engine
+    monthly_comparison: Sequence[MonthlyComparison]
     yearly_summary: List[YearSummary]
     total_mortgage_cost: Decimal
     total_rent_cost: Decimal
@@ -47,139 +54,321 @@ class ComparisonResult(NamedTuple):
     total_interest_paid: Decimal
     total_principal_paid: Decimal
 
+class Amortization(NamedTuple):
+    """Mortgage side of a comparison, which depends only on the mortgage parameters.
+
+    Amounts are native values of ``backend``. Per-month columns have one entry
+    per month, or none at all unless ``columns``; yearly columns one entry per
+    (possibly partial) year.
+    """
+    backend: str
+    fixed_interest_duration_months: int
+    columns: bool
+    periods: List[Tuple[int, Any]]  # (months, payment) of every rate period
+    payment: List[Any]
+    interest: List[Any]
+    principal: List[Any]
+    months_in_year: List[int]
+    yearly_payment: List[Any]  # Sums, averaged in the aggregate stage
+    yearly_principal: List[Any]
+    yearly_interest: List[Any]
+    total_mortgage_cost: Any
+    total_interest_paid: Any
+    total_principal_paid: Any
+    mortgage_cost_fixed_period: Any
+    mortgage_cost_variable: Any
+
+class InvestmentOverlay(NamedTuple):
+    """Rent and investment side of a comparison, layered on an Amortization.
+
+    The per-month columns are empty when the amortization has none.
+    """
+    monthly_rent: Any
+    investment: List[Any]
+    cumulative_investment: List[Any]
+    final_cumulative_investment: Any
+    yearly_rent: List[Any]  # Sums, averaged in the aggregate stage
+    yearly_investment_growth: List[Any]
+    total_rent_cost: Any
+    rent_cost_fixed_period: Any
+    rent_cost_variable: Any
+    total_investment_amount: Any
+    max_payment_difference: Any
+
 class MortgageComparison:
     @classmethod
-    def month_by_month_comparison(cls, params: ComparisonParams) -> ComparisonResult:
-        monthly_comparison = []
-        yearly_summary = []
-        total_mortgage_cost = Decimal('0')
-        total_rent_cost = Decimal('0')
-        
-        # Use pre-calculated values from mortgage_payments when available
+    def month_by_month_comparison(cls, params: ComparisonParams, engine: str = ENGINE_DECIMAL,
+                                  summary_only: bool = False, backend: Optional[str] = None) -> ComparisonResult:
+        """Compare buying vs. renting month by month.
+
+        ``engine`` selects the implementation: ``'decimal'`` runs the exact Decimal
+        loop below, ``'numpy'`` the vectorized engine, whose results agree within
+        ``calculations.vectorized.VECTORIZED_RELATIVE_TOLERANCE``.
+
+        The comparison runs in three stages, which callers may also run (and
+        cache) separately: ``amortization`` depends only on the mortgage,
+        ``investment_overlay`` adds rent and investment returns, and
+        ``aggregate`` builds the result. With ``summary_only`` no per-month
+        records are kept and ``monthly_comparison`` is returned empty: the
+        stages then hold only rate periods and yearly sums, and the mortgage
+        totals come from the closed-form ``mortgage_payments.segments``.
+        Summary totals therefore agree with the full comparison up to Decimal
+        rounding.
+
+        ``backend`` selects the numeric backend of the Decimal engine (see
+        ``calculations.backends``); the numpy engine always uses float64.
+        Totals and yearly summaries are returned as Decimals either way.
+        """
+        stages = cls.stages(engine)
+        amortization = stages.amortization(params, backend, columns=not summary_only)
+        overlay = stages.investment_overlay(params, amortization)
+        return stages.aggregate(params, amortization, overlay, summary_only)
+
+    @classmethod
+    def stages(cls, engine: str = ENGINE_DECIMAL) -> Any:
+        """Return the class implementing the comparison stages of ``engine``."""
+        if engine == ENGINE_NUMPY:
+            # Imported lazily: the vectorized engine depends on this module
+            from .vectorized import VectorizedComparison
+            return VectorizedComparison
+        if engine != ENGINE_DECIMAL:
+            raise ValueError(f"Unknown calculation engine '{engine}', expected one of {', '.join(ENGINES)}")
+        return cls
+
+    @classmethod
+    def amortization(cls, params: ComparisonParams, backend: Optional[str] = None,
+                     columns: bool = True) -> Amortization:
+        """Stage 1: payment, interest and principal per month, with their totals.
+
+        Without ``columns`` only the rate periods and the yearly sums are kept,
+        which is all a summary needs.
+        """
+        numeric = get_backend(backend)
+        zero = numeric.zero
         fixed_interest_duration_months = params.mortgage_payments.fixed_interest_duration_months
         mortgage_term_months = params.mortgage_payments.mortgage_term_months
-        
-        # Calculate monthly investment rate (with high precision)
-        monthly_investment_rate = params.investment_return_rate / Decimal('12')
-        
-        # Initialize tracking variables for amortization calculations
-        remaining_balance = params.mortgage_payments.loan_amount
-        
-        # Initialize counters for direct incremental tracking (avoiding later sums)
-        cumulative_investment = Decimal('0')
-        total_investment_amount = Decimal('0')
-        total_principal_paid = Decimal('0')
-        total_interest_paid = Decimal('0')
-        
-        # Variables for tracking yearly data
-        current_year = 1
-        year_mortgage_payment_sum = Decimal('0')
-        year_rent_sum = Decimal('0')
-        year_investment_growth = Decimal('0')
-        year_principal_paid = Decimal('0')
-        year_interest_paid = Decimal('0')
-        prev_cumulative_investment = Decimal('0')
+        mul = numeric.mul
+
+        payments, interests, principals = [], [], []
+        months_in_year, yearly_payment, yearly_principal, yearly_interest = [], [], [], []
+        total_mortgage_cost = zero
+        total_interest_paid = zero
+        total_principal_paid = zero
+        mortgage_cost_fixed_period = zero
+        mortgage_cost_variable = zero
+        year_payment = year_principal = year_interest = zero
         months_in_current_year = 0
 
-        # Calculate both scenarios month-by-month
-        for month in range(1, mortgage_term_months + 1):
-            # Calculate year and month_of_year
-            year = ((month - 1) // 12) + 1  # 1-based year (1, 2, 3, etc.)
-            month_of_year = ((month - 1) % 12) + 1  # 1-based month within year (1-12)
-            
-            # Check if we need to create a yearly summary
-            if year > current_year:
-                # Create yearly summary for the completed year
-                yearly_summary.append(YearSummary(
-                    year=current_year,
-                    average_mortgage_payment=year_mortgage_payment_sum / months_in_current_year,
-                    average_rent=year_rent_sum / months_in_current_year,
-                    yearly_investment_growth=year_investment_growth,
-                    total_principal_paid=year_principal_paid,
-                    total_interest_paid=year_interest_paid
-                ))
-                
-                # Reset tracking variables for new year
-                current_year = year
-                year_mortgage_payment_sum = Decimal('0')
-                year_rent_sum = Decimal('0')
-                year_investment_growth = Decimal('0')
-                year_principal_paid = Decimal('0')
-                year_interest_paid = Decimal('0')
-                prev_cumulative_investment = cumulative_investment
-                months_in_current_year = 0
-            
-            # Get monthly values based on the period
-            monthly_payment, monthly_interest = cls._get_monthly_values(
-                month, params, fixed_interest_duration_months)
-            
-            # Calculate monthly payment components
-            interest = remaining_balance * monthly_interest
-            principal = monthly_payment - interest
-            remaining_balance -= principal
-            
-            # Track totals
-            total_mortgage_cost += monthly_payment
-            total_interest_paid += interest
-            total_principal_paid += principal
-            
-            # Calculate investment opportunity (difference between mortgage payment and rent)
-            investment_opportunity = monthly_payment - params.monthly_rent
-            
-            # Track total amount invested (before growth)
-            total_investment_amount += investment_opportunity
-            
-            # Apply investment growth (based on previous cumulative amount + new investment)
-            if month == 1:
-                # First month, just set the initial investment
-                cumulative_investment = investment_opportunity
-            else:
-                # Add new investment to current balance and then apply growth
-                cumulative_investment = (cumulative_investment + investment_opportunity) * (Decimal('1') + monthly_investment_rate)
-            
-            # Track rent costs
-            total_rent_cost += params.monthly_rent
-            
-            # Update yearly tracking
-            year_mortgage_payment_sum += monthly_payment
-            year_rent_sum += params.monthly_rent
-            year_principal_paid += principal
-            year_interest_paid += interest
-            months_in_current_year += 1
-            
-            # Create monthly comparison record
-            monthly_comparison.append(MonthlyComparison(
-                month=month,
-                year=year,
-                month_of_year=month_of_year,
-                monthly_mortgage_payment=monthly_payment,
-                monthly_rent=params.monthly_rent,
-                investment_opportunity=investment_opportunity,
-                cumulative_investment=cumulative_investment,
-                principal_for_the_month=principal,
-                interest_for_the_month=interest,
-                total_rent_and_savings=params.monthly_rent + principal,
-                difference=monthly_payment - (params.monthly_rent + principal)
-            ))
-            
-            # Calculate yearly investment growth for tracking - update whenever the last month of a year is processed
-            if month_of_year == 12 or month == mortgage_term_months:
-                year_investment_growth = cumulative_investment - prev_cumulative_investment - investment_opportunity
-        
-        # Add the final year summary if not already added
-        if months_in_current_year > 0:
-            yearly_summary.append(YearSummary(
-                year=current_year,
-                average_mortgage_payment=year_mortgage_payment_sum / months_in_current_year,
-                average_rent=year_rent_sum / months_in_current_year,
-                yearly_investment_growth=year_investment_growth,
-                total_principal_paid=year_principal_paid,
-                total_interest_paid=year_interest_paid
-            ))
-        
+        remaining_balance = numeric.from_decimal(params.mortgage_payments.loan_amount)
+        native_periods = cls._native_periods(params, numeric)
+        month = 0
+        for period_months, monthly_payment, monthly_interest in native_periods:
+            for month in range(month + 1, month + period_months + 1):
+                interest = mul(remaining_balance, monthly_interest)
+                principal = monthly_payment - interest
+                remaining_balance -= principal
+                if columns:
+                    payments.append(monthly_payment)
+                    interests.append(interest)
+                    principals.append(principal)
+
+                total_mortgage_cost += monthly_payment
+                total_interest_paid += interest
+                total_principal_paid += principal
+                if month <= fixed_interest_duration_months:
+                    mortgage_cost_fixed_period += monthly_payment
+                else:
+                    mortgage_cost_variable += monthly_payment
+
+                year_payment += monthly_payment
+                year_principal += principal
+                year_interest += interest
+                months_in_current_year += 1
+                if month % 12 == 0 or month == mortgage_term_months:
+                    months_in_year.append(months_in_current_year)
+                    yearly_payment.append(year_payment)
+                    yearly_principal.append(year_principal)
+                    yearly_interest.append(year_interest)
+                    year_payment = year_principal = year_interest = zero
+                    months_in_current_year = 0
+
+        return Amortization(
+            backend=numeric.name,
+            fixed_interest_duration_months=fixed_interest_duration_months,
+            columns=columns,
+            periods=[(period_months, monthly_payment) for period_months, monthly_payment, _ in native_periods],
+            payment=payments,
+            interest=interests,
+            principal=principals,
+            months_in_year=months_in_year,
+            yearly_payment=yearly_payment,
+            yearly_principal=yearly_principal,
+            yearly_interest=yearly_interest,
+            total_mortgage_cost=total_mortgage_cost,
+            total_interest_paid=total_interest_paid,
+            total_principal_paid=total_principal_paid,
+            mortgage_cost_fixed_period=mortgage_cost_fixed_period,
+            mortgage_cost_variable=mortgage_cost_variable
+        )
+
+    @classmethod
+    def investment_overlay(cls, params: ComparisonParams, amortization: Amortization) -> InvestmentOverlay:
+        """Stage 2: rent costs and the growth of investing payment minus rent."""
+        numeric = get_backend(amortization.backend)
+        zero = numeric.zero
+        mul = numeric.mul
+        monthly_rent = numeric.from_decimal(params.monthly_rent)
+        investment_growth_factor = numeric.rate(Decimal('1') + params.investment_return_rate / Decimal('12'))
+        fixed_interest_duration_months = amortization.fixed_interest_duration_months
+        mortgage_term_months = sum(period_months for period_months, _ in amortization.periods)
+        columns = amortization.columns
+
+        investments, cumulatives, yearly_rent, yearly_investment_growth = [], [], [], []
+        total_rent_cost = zero
+        rent_cost_fixed_period = zero
+        rent_cost_variable = zero
+        total_investment_amount = zero
+        max_payment_difference = zero
+        cumulative_investment = zero
+        year_rent = zero
+        previous_year_cumulative = zero
+
+        month = 0
+        for period_months, monthly_payment in amortization.periods:
+            # Invest the difference between mortgage payment and rent; the first
+            # month's amount does not grow yet
+            investment_opportunity = monthly_payment - monthly_rent
+            for month in range(month + 1, month + period_months + 1):
+                if month == 1:
+                    cumulative_investment = investment_opportunity
+                else:
+                    cumulative_investment = mul(cumulative_investment + investment_opportunity,
+                                                investment_growth_factor)
+                if columns:
+                    investments.append(investment_opportunity)
+                    cumulatives.append(cumulative_investment)
+
+                total_investment_amount += investment_opportunity
+                total_rent_cost += monthly_rent
+                if month <= fixed_interest_duration_months:
+                    rent_cost_fixed_period += monthly_rent
+                else:
+                    rent_cost_variable += monthly_rent
+                # Track the largest absolute cumulative investment
+                if abs(cumulative_investment) > max_payment_difference:
+                    max_payment_difference = abs(cumulative_investment)
+
+                year_rent += monthly_rent
+                if month % 12 == 0 or month == mortgage_term_months:
+                    yearly_rent.append(year_rent)
+                    yearly_investment_growth.append(
+                        cumulative_investment - previous_year_cumulative - investment_opportunity)
+                    year_rent = zero
+                    previous_year_cumulative = cumulative_investment
+
+        return InvestmentOverlay(
+            monthly_rent=monthly_rent,
+            investment=investments,
+            cumulative_investment=cumulatives,
+            final_cumulative_investment=cumulative_investment,
+            yearly_rent=yearly_rent,
+            yearly_investment_growth=yearly_investment_growth,
+            total_rent_cost=total_rent_cost,
+            rent_cost_fixed_period=rent_cost_fixed_period,
+            rent_cost_variable=rent_cost_variable,
+            total_investment_amount=total_investment_amount,
+            max_payment_difference=max_payment_difference
+        )
+
+    @classmethod
+    def aggregate(cls, params: ComparisonParams, amortization: Amortization, overlay: InvestmentOverlay,
+                  summary_only: bool = False) -> ComparisonResult:
+        """Stage 3: totals, yearly summaries and (optionally) the monthly records."""
+        numeric = get_backend(amortization.backend)
+        to_decimal = numeric.to_decimal
+
+        yearly_summary = [
+            cls._year_summary(numeric, year, months, payment_sum, rent_sum, investment_growth, principal, interest)
+            for year, months, payment_sum, rent_sum, investment_growth, principal, interest in zip(
+                range(1, len(amortization.months_in_year) + 1), amortization.months_in_year,
+                amortization.yearly_payment, overlay.yearly_rent, overlay.yearly_investment_growth,
+                amortization.yearly_principal, amortization.yearly_interest)
+        ]
+
+        monthly_comparison = []
+        if not summary_only:
+            if not amortization.columns:
+                raise ValueError("Monthly records need stages built with per-month columns")
+            monthly_comparison = list(cls._monthly_records(amortization, overlay))
+            if not numeric.native_output:
+                monthly_comparison = [cls._output_record(numeric, mc) for mc in monthly_comparison]
+
+        # Summaries take the mortgage totals from the closed-form rate periods
+        mortgage_totals = cls._segment_totals(params, numeric) if summary_only else None
+        if mortgage_totals is None:
+            mortgage_totals = cls._mortgage_totals(
+                numeric, amortization.total_mortgage_cost, amortization.total_interest_paid,
+                amortization.total_principal_paid, amortization.mortgage_cost_fixed_period,
+                amortization.mortgage_cost_variable)
+
         # Calculate investment growth (final amount minus amount invested)
-        total_investment_growth = cumulative_investment - total_investment_amount
-        
+        return cls._result(
+            params, monthly_comparison, yearly_summary,
+            total_investment_growth=to_decimal(overlay.final_cumulative_investment - overlay.total_investment_amount),
+            total_rent_cost=to_decimal(overlay.total_rent_cost),
+            max_payment_difference=to_decimal(overlay.max_payment_difference),
+            total_rent_cost_fixed_period=to_decimal(overlay.rent_cost_fixed_period),
+            total_rent_cost_variable=to_decimal(overlay.rent_cost_variable),
+            **mortgage_totals
+        )
+
+    @staticmethod
+    def _mortgage_totals(numeric: Any, total_mortgage_cost, total_interest_paid, total_principal_paid,
+                         mortgage_cost_fixed_period, mortgage_cost_variable) -> Dict[str, Decimal]:
+        """Convert native mortgage totals to the Decimal keyword arguments of ``_result``."""
+        to_decimal = numeric.to_decimal
+        return {
+            'total_mortgage_cost': to_decimal(total_mortgage_cost),
+            'total_interest_paid': to_decimal(total_interest_paid),
+            'total_principal_paid': to_decimal(total_principal_paid),
+            'total_mortgage_cost_fixed_period': to_decimal(mortgage_cost_fixed_period),
+            'total_mortgage_cost_variable': to_decimal(mortgage_cost_variable)
+        }
+
+    @staticmethod
+    def _segment_totals(params: ComparisonParams, numeric: Any) -> Optional[Dict[str, Decimal]]:
+        """Mortgage totals summed over the closed-form rate periods, in O(periods).
+
+        Returns None when the payments carry no segments, and for the
+        fixed-point backend, whose totals are sums of per-month amounts
+        rounded to the sen.
+        """
+        payments = params.mortgage_payments
+        if not payments.segments or numeric.name == BACKEND_FIXED:
+            return None
+        zero = Decimal('0')
+        totals = dict.fromkeys(('total_mortgage_cost', 'total_interest_paid', 'total_principal_paid',
+                                'total_mortgage_cost_fixed_period', 'total_mortgage_cost_variable'), zero)
+        for segment in payments.segments:
+            cost = segment.monthly_payment * segment.months
+            totals['total_mortgage_cost'] += cost
+            totals['total_interest_paid'] += segment.interest_paid
+            totals['total_principal_paid'] += segment.principal_paid
+            # Rate periods never straddle the end of the fixed-interest duration
+            if segment.start_month <= payments.fixed_interest_duration_months:
+                totals['total_mortgage_cost_fixed_period'] += cost
+            else:
+                totals['total_mortgage_cost_variable'] += cost
+        return totals
+
+    @staticmethod
+    def _result(params: ComparisonParams, monthly_comparison: Sequence[MonthlyComparison],
+                yearly_summary: List[YearSummary], total_investment_growth: Decimal, total_mortgage_cost: Decimal,
+                total_rent_cost: Decimal, total_interest_paid: Decimal, total_principal_paid: Decimal,
+                max_payment_difference: Decimal, total_mortgage_cost_fixed_period: Decimal,
+                total_rent_cost_fixed_period: Decimal, total_mortgage_cost_variable: Decimal,
+                total_rent_cost_variable: Decimal) -> ComparisonResult:
+        """Derive the wealth and savings figures from the Decimal totals and build the result."""
         # Calculate wealth scenarios
         total_wealth_if_renting = total_investment_growth
         total_wealth_if_buying = params.mortgage_params.property_price - total_interest_paid
@@ -187,21 +376,6 @@ class MortgageComparison:
         # Calculate net benefits
         net_benefit_buying = total_wealth_if_buying - total_wealth_if_renting
         
-        # Calculate fixed and variable period costs more efficiently
-        total_mortgage_cost_fixed_period = Decimal('0')
-        total_rent_cost_fixed_period = Decimal('0')
-        total_mortgage_cost_variable = Decimal('0')
-        total_rent_cost_variable = Decimal('0')
-        
-        # More efficient iteration with direct access to month value
-        for mc in monthly_comparison:
-            if mc.month <= fixed_interest_duration_months:
-                total_mortgage_cost_fixed_period += mc.monthly_mortgage_payment
-                total_rent_cost_fixed_period += params.monthly_rent
-            else:
-                total_mortgage_cost_variable += mc.monthly_mortgage_payment
-                total_rent_cost_variable += params.monthly_rent
-        
         # Calculate payment differences with protection against division by zero
         payment_difference_fixed = total_rent_cost_fixed_period - total_mortgage_cost_fixed_period
         payment_difference_variable = total_rent_cost_variable - total_mortgage_cost_variable
@@ -219,9 +393,6 @@ class MortgageComparison:
             if savings_percent_variable < Decimal('0'):
                 savings_percent_variable = Decimal('0')
         
-        # Get max payment difference
-        max_payment_difference = max((abs(mc.cumulative_investment) for mc in monthly_comparison), default=Decimal('0'))
-        
         return ComparisonResult(
             monthly_comparison=monthly_comparison,
             yearly_summary=yearly_summary,
@@ -240,20 +411,134 @@ class MortgageComparison:
         )
 
     @staticmethod
-    def _get_monthly_values(month: int, params: ComparisonParams, fixed_interest_duration_months: int) -> tuple:
-        """Get monthly payment and interest rate values based on the month."""
-        if month <= fixed_interest_duration_months:
-            # First period (fixed rate)
-            monthly_payment = params.mortgage_payments.monthly_payment_first_period
-            monthly_interest = params.mortgage_params.interest_rate_first_period / Decimal('12')
-        else:
-            # Subsequent period (variable rate)
-            if params.mortgage_params.fixed_interest_duration_years != params.mortgage_params.mortgage_term_years:
-                monthly_payment = params.mortgage_payments.monthly_payment_subsequent
-                monthly_interest = params.mortgage_params.interest_rate_subsequent / Decimal('12')
-            else:
-                # Both periods use the same rate
-                monthly_payment = params.mortgage_payments.monthly_payment_first_period
-                monthly_interest = params.mortgage_params.interest_rate_first_period / Decimal('12')
+    def _monthly_records(amortization: Amortization, overlay: InvestmentOverlay) -> Iterator[MonthlyComparison]:
+        """Zip the stage columns into native MonthlyComparison records."""
+        monthly_rent = overlay.monthly_rent
+        for month, (monthly_payment, interest, principal, investment_opportunity, cumulative_investment) in enumerate(
+                zip(amortization.payment, amortization.interest, amortization.principal,
+                    overlay.investment, overlay.cumulative_investment), start=1):
+            yield MonthlyComparison(
+                month=month,
+                year=((month - 1) // 12) + 1,
+                month_of_year=((month - 1) % 12) + 1,
+                monthly_mortgage_payment=monthly_payment,
+                monthly_rent=monthly_rent,
+                investment_opportunity=investment_opportunity,
+                cumulative_investment=cumulative_investment,
+                principal_for_the_month=principal,
+                interest_for_the_month=interest,
+                total_rent_and_savings=monthly_rent + principal,
+                difference=monthly_payment - (monthly_rent + principal)
+            )
+
+    @classmethod
+    def _native_periods(cls, params: ComparisonParams, numeric: Any) -> List[Tuple[int, Any, Any]]:
+        """Payment and monthly rate of every rate period, converted to native values once."""
+        return [
+            (months, numeric.from_decimal(monthly_payment), numeric.rate(annual_rate / Decimal('12')))
+            for months, monthly_payment, annual_rate in cls.payment_periods(params)
+        ]
+
+    @classmethod
+    def iter_schedule(cls, params: ComparisonParams, backend: Optional[str] = None) -> Iterator[MonthlyComparison]:
+        """Yield the month-by-month comparison records one at a time.
+
+        Only the running balance and cumulative investment are kept between
+        months, so consuming the schedule takes constant memory. Amounts are
+        in the output representation of ``backend`` (Decimal by default).
+        """
+        numeric = get_backend(backend)
+        if numeric.native_output:
+            yield from cls._iter_native_schedule(params, numeric)
+            return
+        for mc in cls._iter_native_schedule(params, numeric):
+            yield cls._output_record(numeric, mc)
+
+    @classmethod
+    def _iter_native_schedule(cls, params: ComparisonParams, numeric: Any) -> Iterator[MonthlyComparison]:
+        """Yield the schedule with amounts in the native representation of ``numeric``.
+
+        Rate periods are walked in order, so the payment and rate change only at
+        the resets instead of being looked up every month.
+        """
+        monthly_rent = numeric.from_decimal(params.monthly_rent)
+        mul = numeric.mul
+        
+        # Calculate monthly investment growth factor (with high precision)
+        investment_growth_factor = numeric.rate(Decimal('1') + params.investment_return_rate / Decimal('12'))
 
-        return monthly_payment, monthly_interest
\ No newline at end of file
+        periods = cls._native_periods(params, numeric)
+        
+        # Initialize tracking variables for amortization calculations
+        remaining_balance = numeric.from_decimal(params.mortgage_payments.loan_amount)
+        cumulative_investment = numeric.zero
+
+        month = 0
+        for period_months, monthly_payment, monthly_interest in periods:
+            for month in range(month + 1, month + period_months + 1):
+                # Calculate monthly payment components
+                interest = mul(remaining_balance, monthly_interest)
+                principal = monthly_payment - interest
+                remaining_balance -= principal
+            
+                # Calculate investment opportunity (difference between mortgage payment and rent)
+                investment_opportunity = monthly_payment - monthly_rent
+            
+                # Apply investment growth (based on previous cumulative amount + new investment)
+                if month == 1:
+                    # First month, just set the initial investment
+                    cumulative_investment = investment_opportunity
+                else:
+                    # Add new investment to current balance and then apply growth
+                    cumulative_investment = mul(cumulative_investment + investment_opportunity, investment_growth_factor)
+            
+                yield MonthlyComparison(
+                    month=month,
+                    year=((month - 1) // 12) + 1,  # 1-based year (1, 2, 3, etc.)
+                    month_of_year=((month - 1) % 12) + 1,  # 1-based month within year (1-12)
+                    monthly_mortgage_payment=monthly_payment,
+                    monthly_rent=monthly_rent,
+                    investment_opportunity=investment_opportunity,
+                    cumulative_investment=cumulative_investment,
+                    principal_for_the_month=principal,
+                    interest_for_the_month=interest,
+                    total_rent_and_savings=monthly_rent + principal,
+                    difference=monthly_payment - (monthly_rent + principal)
+                )
+
+    @staticmethod
+    def _output_record(numeric: Any, mc: MonthlyComparison) -> MonthlyComparison:
+        """Convert a native schedule record to the backend's output representation."""
+        to_output = numeric.to_output
+        return MonthlyComparison(mc.month, mc.year, mc.month_of_year, *(to_output(value) for value in mc[3:]))
+
+    @staticmethod
+    def _year_summary(numeric: Any, year: int, months: int, payment_sum, rent_sum, investment_growth,
+                      principal_paid, interest_paid) -> YearSummary:
+        """Build a YearSummary from native yearly sums."""
+        to_decimal = numeric.to_decimal
+        return YearSummary(
+            year=year,
+            average_mortgage_payment=to_decimal(numeric.div(payment_sum, months)),
+            average_rent=to_decimal(numeric.div(rent_sum, months)),
+            yearly_investment_growth=to_decimal(investment_growth),
+            total_principal_paid=to_decimal(principal_paid),
+            total_interest_paid=to_decimal(interest_paid)
+        )
+
+    @staticmethod
+    def payment_periods(params: ComparisonParams) -> List[Tuple[int, Decimal, Decimal]]:
+        """Return the (months, monthly payment, annual rate) rate periods of the schedule."""
+        payments = params.mortgage_payments
+        if payments.segments:
+            return [(segment.months, segment.monthly_payment, segment.annual_rate) for segment in payments.segments]
+        # Payments built without segments: one fixed period, then the subsequent rate
+        mortgage_params = params.mortgage_params
+        fixed_months = payments.fixed_interest_duration_months
+        if mortgage_params.fixed_interest_duration_years == mortgage_params.mortgage_term_years:
+            return [(payments.mortgage_term_months, payments.monthly_payment_first_period,
+                     mortgage_params.interest_rate_first_period)]
+        periods = [(fixed_months, payments.monthly_payment_first_period, mortgage_params.interest_rate_first_period),
+                   (payments.mortgage_term_months - fixed_months, payments.monthly_payment_subsequent,
+                    mortgage_params.interest_rate_subsequent)]
+        return [period for period in periods if period[0] > 0]
@@ -0,0 +1,100 @@
+"""
+Streaming export of month-by-month amortization schedules.
+
+Schedules are produced by ``MortgageComparison.iter_schedule`` and serialized
+as CSV or NDJSON while they are computed, one scenario at a time, so an export
+of thousands of scenarios never holds more than one scenario's rows in memory.
+Scenario records use the ``calculations.batch`` format; invalid records are
+reported inline (an ``error`` column or field) instead of aborting the stream.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .backends import BACKEND_DECIMAL
+from .batch import parse_scenario
+from .comparison import MortgageComparison, ComparisonParams
+from .mortgage_calculations import MortgageCalculator
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_COLUMNS = (
+    'scenario', 'month', 'year', 'month_of_year', 'monthly_mortgage_payment', 'monthly_rent',
+    'principal_for_the_month', 'interest_for_the_month', 'remaining_balance',
+    'investment_opportunity', 'cumulative_investment', 'error'
+)
+DEFAULT_DECIMALS = 2
+ZERO = Decimal('0')
+
+
+def iter_schedule_rows(records: Iterable[Dict[str, Any]], decimals: int = DEFAULT_DECIMALS) -> Iterator[List[Any]]:
+    """Yield export rows (in EXPORT_COLUMNS order) for every scenario record."""
+    quantum = Decimal(1).scaleb(-decimals)
+    for index, record in enumerate(records):
+        try:
+            mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record)
+            # Rows are quantized Decimals, so the schedule always uses the Decimal backend
+            mortgage_payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params, BACKEND_DECIMAL)
+        except ValueError as e:
+            yield [index] + [None] * (len(EXPORT_COLUMNS) - 2) + [str(e)]
+            continue
+
+        remaining_balance = mortgage_payments.loan_amount
+        for mc in MortgageComparison.iter_schedule(ComparisonParams(
+                monthly_rent=monthly_rent,
+                mortgage_params=mortgage_params,
+                mortgage_payments=mortgage_payments,
+                investment_return_rate=investment_return_rate), BACKEND_DECIMAL):
+            remaining_balance -= mc.principal_for_the_month
+            yield [
+                index, mc.month, mc.year, mc.month_of_year,
+                mc.monthly_mortgage_payment.quantize(quantum),
+                mc.monthly_rent.quantize(quantum),
+                mc.principal_for_the_month.quantize(quantum),
+                mc.interest_for_the_month.quantize(quantum),
+                # Clamped: the last month can leave a tiny negative residue, written as -0.00
+                max(remaining_balance, ZERO).quantize(quantum),
+                mc.investment_opportunity.quantize(quantum),
+                mc.cumulative_investment.quantize(quantum),
+                None
+            ]
+
+
+def iter_csv(records: Iterable[Dict[str, Any]], decimals: int = DEFAULT_DECIMALS) -> Iterator[str]:
+    """Yield CSV text: the header first, then one chunk per scenario."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    current_scenario = None
+    for row in iter_schedule_rows(records, decimals):
+        if row[0] != current_scenario:
+            # Flush the previous scenario (or the header) as soon as a new one starts
+            if buffer.tell():
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            current_scenario = row[0]
+        writer.writerow(row)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]], decimals: int = DEFAULT_DECIMALS) -> Iterator[str]:
+    """Yield NDJSON text, one chunk of lines per scenario."""
+    lines: List[str] = []
+    current_scenario = None
+    for row in iter_schedule_rows(records, decimals):
+        if row[0] != current_scenario and lines:
+            yield ''.join(lines)
+            lines = []
+        current_scenario = row[0]
+        if row[-1] is not None:
+            item = {'scenario': row[0], 'error': row[-1]}
+        else:
+            # Quantized amounts are emitted as plain JSON numbers
+            item = dict(zip(EXPORT_COLUMNS[:-1], row[:4] + [float(value) for value in row[4:-1]]))
+        lines.append(json.dumps(item, separators=(',', ':')) + '\n')
+    if lines:
+        yield ''.join(lines)
@@ -0,0 +1,229 @@
+"""
+Monte Carlo simulation of the floating-rate period and investment returns.
+
+After the fixed period the annual mortgage rate follows a mean-reverting
+(Vasicek) process around ``rate_mean`` and the loan is re-amortized every month
+over the remaining term at the current rate. Monthly investment returns are
+normally distributed around ``investment_return_rate / 12``. Paths are
+simulated as ``(paths × months)`` arrays in chunks of ``chunk_size`` so memory
+stays bounded; per-month payment percentile bands are computed from the first
+``band_sample_paths`` paths, all other statistics use every path.
+
+Results are reproducible for the same seed, path count and chunk size. Without
+a seed one is drawn from fresh OS entropy and reported in the result, so any
+run can be repeated. With
+both volatilities set to zero and ``rate_mean`` equal to the subsequent rate
+every path reproduces the deterministic comparison.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .batch import parse_scenario
+from .mortgage_calculations import MortgageCalculator, MortgageParams
+from .vectorized import annuity_payment, balance_after
+
+MONTHS_PER_YEAR = 12
+MAX_PATHS = 100000
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+
+@dataclass
+class MonteCarloParams:
+    mortgage_params: MortgageParams
+    monthly_rent: Decimal
+    investment_return_rate: Decimal
+    paths: int = 1000
+    seed: Optional[int] = None
+    rate_mean: Optional[Decimal] = None  # Long-run floating rate, defaults to interest_rate_subsequent
+    rate_reversion_speed: float = 0.5    # Annual mean-reversion speed
+    rate_volatility: float = 0.01        # Annual volatility of the floating rate (absolute)
+    rate_floor: float = 0.0
+    return_volatility: float = 0.15      # Annual volatility of investment returns
+    percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES
+    chunk_size: int = 1000
+    band_sample_paths: int = 2000
+
+
+class MonteCarloResult(NamedTuple):
+    paths: int
+    seed: int  # The seed used, drawn when none was given
+    percentiles: Tuple[float, ...]
+    # Shape (len(percentiles), mortgage_term_months)
+    monthly_payment_bands: np.ndarray
+    # Shape (len(percentiles),)
+    total_interest_paid: np.ndarray
+    net_benefit_buying: np.ndarray
+    mean_net_benefit_buying: float
+    probability_buying_wins: float
+
+
+class MonteCarloSimulation:
+    @staticmethod
+    def validate_input(params: MonteCarloParams) -> None:
+        """Validate simulation parameters on top of the mortgage parameters."""
+        MortgageCalculator.validate_input(params.mortgage_params)
+        if params.mortgage_params.rate_tiers and len(params.mortgage_params.rate_tiers) > 1:
+            raise ValueError("Simulation supports a single fixed-rate period only")
+        if not 1 <= params.paths <= MAX_PATHS:
+            raise ValueError(f"Number of paths must be between 1 and {MAX_PATHS}")
+        if params.chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        if params.band_sample_paths <= 0:
+            raise ValueError("Band sample size must be greater than 0")
+        if params.rate_reversion_speed < 0:
+            raise ValueError("Rate reversion speed cannot be negative")
+        if params.rate_volatility < 0 or params.return_volatility < 0:
+            raise ValueError("Volatilities cannot be negative")
+        if params.rate_mean is not None and params.rate_mean < 0:
+            raise ValueError("Mean floating rate cannot be negative")
+        if not params.percentiles or any(not 0 <= q <= 100 for q in params.percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+
+    @staticmethod
+    def _simulate_rates(rng: np.random.Generator, params: MonteCarloParams, paths: int, months: int) -> np.ndarray:
+        """Simulate annual floating rates, shape (paths, months), using the exact Vasicek step."""
+        start = float(params.mortgage_params.interest_rate_subsequent)
+        mean = float(params.rate_mean if params.rate_mean is not None else start)
+        dt = 1.0 / MONTHS_PER_YEAR
+        kappa = params.rate_reversion_speed
+        decay = np.exp(-kappa * dt)
+        step_std = params.rate_volatility * (np.sqrt((1.0 - decay ** 2) / (2.0 * kappa)) if kappa > 0 else np.sqrt(dt))
+
+        shocks = rng.standard_normal((paths, months)) * step_std
+        rates = np.empty((paths, months))
+        # The first floating month uses the quoted subsequent rate; the latent
+        # rate evolves unclipped and the floor applies to the charged rate only
+        latent = np.full(paths, start)
+        for month in range(months):
+            rates[:, month] = latent
+            latent = mean + (latent - mean) * decay + shocks[:, month]
+        return np.maximum(rates, params.rate_floor)
+
+    @classmethod
+    def _simulate_chunk(cls, rng: np.random.Generator, params: MonteCarloParams, paths: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Simulate one chunk; returns (monthly payments, total interest, net benefit)."""
+        mortgage_params = params.mortgage_params
+        term_months = mortgage_params.mortgage_term_years * MONTHS_PER_YEAR
+        fixed_months = mortgage_params.fixed_interest_duration_years * MONTHS_PER_YEAR
+        if mortgage_params.fixed_interest_duration_years == mortgage_params.mortgage_term_years:
+            fixed_months = term_months
+        variable_months = term_months - fixed_months
+
+        loan_amount = float(mortgage_params.property_price) * (1.0 - float(mortgage_params.down_payment_percentage))
+        rate_first = float(mortgage_params.interest_rate_first_period)
+        payment_first = float(annuity_payment(loan_amount, rate_first, term_months))
+        balance_fixed_end = float(balance_after(loan_amount, rate_first / MONTHS_PER_YEAR, payment_first, fixed_months))
+
+        payments = np.empty((paths, term_months))
+        payments[:, :fixed_months] = payment_first
+        total_interest = np.full(paths, payment_first * fixed_months - (loan_amount - balance_fixed_end))
+
+        if variable_months:
+            rates = cls._simulate_rates(rng, params, paths, variable_months)
+            balance = np.full(paths, balance_fixed_end)
+            for offset in range(variable_months):
+                annual_rate = rates[:, offset]
+                monthly_rate = annual_rate / MONTHS_PER_YEAR
+                # Re-amortize the outstanding balance over the remaining term at the new rate
+                payment = annuity_payment(np.maximum(balance, 0.0), annual_rate, variable_months - offset)
+                interest = balance * monthly_rate
+                balance = balance + interest - payment
+                total_interest += interest
+                payments[:, fixed_months + offset] = payment
+
+        # Investment of (payment - rent) compounding at a random monthly return.
+        # c_1 = x_1, c_m = (c_{m-1} + x_m) * g_m is evaluated as
+        # c_N = P_N * sum(x_m / P_{m-1}) with P the running product of g (g_1 = 1).
+        monthly_return = float(params.investment_return_rate) / MONTHS_PER_YEAR
+        return_std = params.return_volatility / np.sqrt(MONTHS_PER_YEAR)
+        growth = 1.0 + monthly_return + return_std * rng.standard_normal((paths, term_months))
+        growth[:, 0] = 1.0
+        running_growth = np.cumprod(growth, axis=1)
+        previous_growth = np.concatenate((np.ones((paths, 1)), running_growth[:, :-1]), axis=1)
+        investment = payments - float(params.monthly_rent)
+        cumulative = running_growth[:, -1] * np.sum(investment / previous_growth, axis=1)
+        investment_growth = cumulative - investment.sum(axis=1)
+
+        net_benefit = float(mortgage_params.property_price) - total_interest - investment_growth
+        return payments, total_interest, net_benefit
+
+    @classmethod
+    def run(cls, params: MonteCarloParams, progress: Optional[Callable[[int], None]] = None) -> MonteCarloResult:
+        """Run the simulation and summarize it into percentile bands.
+
+        ``progress`` is called with the number of paths simulated so far after
+        every chunk; an exception raised by it aborts the run.
+        """
+        cls.validate_input(params)
+        seed = params.seed if params.seed is not None else np.random.SeedSequence().entropy
+        rng = np.random.default_rng(seed)
+        percentiles = tuple(float(q) for q in params.percentiles)
+
+        total_interest = np.empty(params.paths)
+        net_benefit = np.empty(params.paths)
+        band_paths = min(params.band_sample_paths, params.paths)
+        band_sample = None
+
+        for start in range(0, params.paths, params.chunk_size):
+            chunk_paths = min(params.chunk_size, params.paths - start)
+            payments, chunk_interest, chunk_benefit = cls._simulate_chunk(rng, params, chunk_paths)
+            total_interest[start:start + chunk_paths] = chunk_interest
+            net_benefit[start:start + chunk_paths] = chunk_benefit
+            if start < band_paths:
+                keep = payments[:band_paths - start]
+                band_sample = keep if band_sample is None else np.concatenate((band_sample, keep))
+            if progress is not None:
+                progress(start + chunk_paths)
+
+        return MonteCarloResult(
+            paths=params.paths,
+            seed=seed,
+            percentiles=percentiles,
+            monthly_payment_bands=np.percentile(band_sample, percentiles, axis=0),
+            total_interest_paid=np.percentile(total_interest, percentiles),
+            net_benefit_buying=np.percentile(net_benefit, percentiles),
+            mean_net_benefit_buying=float(net_benefit.mean()),
+            probability_buying_wins=float(np.mean(net_benefit > 0))
+        )
+
+
+def params_from_request(request: Dict[str, Any]) -> MonteCarloParams:
+    """Build simulation params from an ``/api/monte_carlo`` request body.
+
+    Raises:
+        ValueError: If the scenario or a setting is invalid.
+    """
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(request['scenario'], allow_tiers=False)
+    params = MonteCarloParams(
+        mortgage_params=mortgage_params,
+        monthly_rent=monthly_rent,
+        investment_return_rate=investment_return_rate,
+        paths=request.get('paths', 1000),
+        seed=request.get('seed'),
+        rate_mean=Decimal(str(request['rate_mean'])) if request.get('rate_mean') is not None else None,
+        rate_reversion_speed=request.get('rate_reversion_speed', 0.5),
+        rate_volatility=request.get('rate_volatility', 0.01),
+        return_volatility=request.get('return_volatility', 0.15),
+        percentiles=tuple(request['percentiles']) if request.get('percentiles') is not None else DEFAULT_PERCENTILES
+    )
+    MonteCarloSimulation.validate_input(params)
+    return params
+
+
+def result_to_dict(result: MonteCarloResult) -> Dict[str, Any]:
+    """Convert a simulation result into JSON-compatible data keyed by percentile."""
+    labels = [f"p{q:g}" for q in result.percentiles]
+    return {
+        'paths': result.paths,
+        'seed': result.seed,
+        'percentiles': list(result.percentiles),
+        'monthly_payment_bands': dict(zip(labels, result.monthly_payment_bands.tolist())),
+        'total_interest_paid': dict(zip(labels, result.total_interest_paid.tolist())),
+        'net_benefit_buying': dict(zip(labels, result.net_benefit_buying.tolist())),
+        'mean_net_benefit_buying': result.mean_net_benefit_buying,
+        'probability_buying_wins': result.probability_buying_wins
+    }
@@ -1,7 +1,7 @@
-from typing import NamedTuple
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 from dataclasses import dataclass
-import numpy_financial as npf
 from decimal import Decimal, getcontext
+from .backends import DecimalBackend, get_backend
 
 # Set decimal precision for financial calculations
 getcontext().prec = 28
@@ -9,6 +9,11 @@ getcontext().prec = 28
 MONTHS_PER_YEAR = 12
 MAX_PROPERTY_PRICE = 1000000000000  # 1 trillion (reasonable upper limit)
 
+class RateTier(NamedTuple):
+    """A fixed-rate period of a tiered mortgage."""
+    duration_years: int
+    rate: Decimal
+
 @dataclass
 class MortgageParams:
     property_price: Decimal
@@ -17,13 +22,65 @@ class MortgageParams:
     interest_rate_subsequent: Decimal
     mortgage_term_years: int
     fixed_interest_duration_years: int
+    # Consecutive fixed-rate tiers, followed by interest_rate_subsequent for the
+    # rest of the term. None means a single tier of fixed_interest_duration_years
+    # at interest_rate_first_period. Build tiered params with from_tiers.
+    rate_tiers: Optional[Tuple[RateTier, ...]] = None
+
+    @classmethod
+    def from_tiers(cls, property_price: Decimal, down_payment_percentage: Decimal,
+                   rate_tiers: Sequence[Tuple[int, Decimal]], floating_rate: Decimal,
+                   mortgage_term_years: int) -> 'MortgageParams':
+        """Build params for a tiered product, e.g. 3 years at 2.5%, 2 years at 5%, then floating.
+
+        The first-period fields are derived from the tiers: the first tier's rate
+        and the combined duration of all tiers.
+        """
+        tiers = tuple(RateTier(duration_years, rate) for duration_years, rate in rate_tiers)
+        if not tiers:
+            raise ValueError("At least one rate tier is required")
+        return cls(
+            property_price=property_price,
+            down_payment_percentage=down_payment_percentage,
+            interest_rate_first_period=tiers[0].rate,
+            interest_rate_subsequent=floating_rate,
+            mortgage_term_years=mortgage_term_years,
+            fixed_interest_duration_years=sum(tier.duration_years for tier in tiers),
+            rate_tiers=tiers
+        )
+
+    def rate_segments(self) -> List[Tuple[int, Decimal]]:
+        """Return the (months, annual rate) periods of the loan, covering the whole term.
+
+        Without tiers the first period may be empty (a fixed duration of 0 years).
+        """
+        tiers = self.rate_tiers or (RateTier(self.fixed_interest_duration_years, self.interest_rate_first_period),)
+        segments = [(tier.duration_years * MONTHS_PER_YEAR, tier.rate) for tier in tiers]
+        fixed_months = sum(months for months, _ in segments)
+        term_months = self.mortgage_term_years * MONTHS_PER_YEAR
+        if fixed_months < term_months:
+            segments.append((term_months - fixed_months, self.interest_rate_subsequent))
+        return segments
+
+class PaymentSegment(NamedTuple):
+    """One rate period of the amortization, summarized in closed form."""
+    start_month: int  # 1-based first month of the period
+    months: int
+    annual_rate: Decimal
+    monthly_payment: Decimal
+    opening_balance: Decimal
+    closing_balance: Decimal
+    principal_paid: Decimal
+    interest_paid: Decimal
 
 class MortgagePayments(NamedTuple):
     monthly_payment_first_period: Decimal
-    monthly_payment_subsequent: Decimal
+    monthly_payment_subsequent: Decimal  # Payment of the last rate period
     loan_amount: Decimal
     fixed_interest_duration_months: int
     mortgage_term_months: int
+    # Non-empty rate periods in order; totals over them need no monthly loop
+    segments: Tuple[PaymentSegment, ...] = ()
 
 class MortgageCalculator:
     @staticmethod
@@ -44,7 +101,20 @@ class MortgageCalculator:
         if params.fixed_interest_duration_years < 0:
             raise ValueError("Fixed interest duration cannot be negative")
         if params.fixed_interest_duration_years > params.mortgage_term_years:
+            if params.rate_tiers:
+                raise ValueError("Rate tiers cannot exceed mortgage term")
             raise ValueError("Fixed interest duration cannot exceed mortgage term")
+        if params.rate_tiers is not None:
+            if not params.rate_tiers:
+                raise ValueError("At least one rate tier is required")
+            for tier in params.rate_tiers:
+                if tier.duration_years <= 0:
+                    raise ValueError("Rate tier duration must be greater than 0 years")
+                if tier.rate < 0:
+                    raise ValueError("Rate tier interest rate cannot be negative")
+            if (params.rate_tiers[0].rate != params.interest_rate_first_period
+                    or sum(tier.duration_years for tier in params.rate_tiers) != params.fixed_interest_duration_years):
+                raise ValueError("Rate tiers do not match the first period rate and fixed interest duration")
 
     @staticmethod
     def calculate_loan_amount(property_price: Decimal, down_payment_percentage: Decimal) -> Decimal:
@@ -57,77 +127,78 @@ class MortgageCalculator:
         return years * MONTHS_PER_YEAR
 
     @staticmethod
-    def calculate_monthly_payment(loan_amount: Decimal, annual_interest_rate: Decimal, term_months: int) -> Decimal:
-        """Calculate monthly mortgage payment with proper edge case handling."""
+    def calculate_monthly_payment(loan_amount: Decimal, annual_interest_rate: Decimal, term_months: int,
+                                  backend=DecimalBackend) -> Decimal:
+        """Calculate monthly mortgage payment with proper edge case handling.
+
+        Amounts are in the representation of ``backend`` (Decimal by default).
+        """
         try:
-            # Handle zero or very small interest rates
-            if annual_interest_rate <= Decimal('0.0000001'):  # Effectively zero
-                return loan_amount / Decimal(term_months)
-            
-            # Convert to float for numpy_financial compatibility
-            monthly_interest_rate = float(annual_interest_rate) / MONTHS_PER_YEAR
-            loan_amount_float = float(loan_amount)
-            
-            # Calculate payment using numpy-financial
-            payment = npf.pmt(monthly_interest_rate, term_months, -loan_amount_float)
-            
-            # Convert back to Decimal for precision
-            return Decimal(str(payment))
+            # Closed-form annuity payment (zero rates handled by the backend)
+            return backend.monthly_payment(loan_amount, annual_interest_rate, term_months)
         except Exception as e:
             raise ValueError(f"Error calculating monthly payment: {str(e)}")
 
     @staticmethod
     def calculate_remaining_balance(loan_amount: Decimal, annual_interest_rate: Decimal, 
-                                    duration_months: int, monthly_payment: Decimal) -> Decimal:
-        """Calculate remaining balance after fixed interest period."""
+                                    duration_months: int, monthly_payment: Decimal,
+                                    backend=DecimalBackend) -> Decimal:
+        """Calculate remaining balance after fixed interest period (never negative)."""
         try:
-            # Handle zero or very small interest rates
-            if annual_interest_rate <= Decimal('0.0000001'):  # Effectively zero
-                return loan_amount - (monthly_payment * Decimal(duration_months))
-            
-            # Convert to float for numpy_financial compatibility
-            monthly_interest_rate = float(annual_interest_rate) / MONTHS_PER_YEAR
-            loan_amount_float = float(loan_amount)
-            monthly_payment_float = float(monthly_payment)
-            
-            # Calculate future value using numpy-financial
-            balance = npf.fv(monthly_interest_rate, duration_months, monthly_payment_float, -loan_amount_float)
-            
-            # Convert back to Decimal and ensure non-negative result
-            return max(Decimal('0'), Decimal(str(balance)))
+            return backend.remaining_balance(loan_amount, annual_interest_rate, duration_months, monthly_payment)
         except Exception as e:
             raise ValueError(f"Error calculating remaining balance: {str(e)}")
 
     @classmethod
-    def calculate_mortgage_payments(cls, params: MortgageParams) -> MortgagePayments:
-        """Calculate mortgage payments with all relevant parameters."""
+    def calculate_mortgage_payments(cls, params: MortgageParams, backend: Optional[str] = None) -> MortgagePayments:
+        """Calculate mortgage payments with all relevant parameters.
+
+        The payment is recomputed at every rate reset to amortize the remaining
+        balance over the remaining term. Each rate period is summarized in closed
+        form (``MortgagePayments.segments``), so the cost is O(periods), not
+        O(months).
+
+        ``backend`` names the numeric backend (see calculations.backends); the
+        payments are returned as Decimals whichever backend computed them.
+        """
         cls.validate_input(params)
+        numeric = get_backend(backend)
 
         loan_amount = cls.calculate_loan_amount(params.property_price, params.down_payment_percentage)
         mortgage_term_months = cls.calculate_months(params.mortgage_term_years)
         fixed_interest_duration_months = cls.calculate_months(params.fixed_interest_duration_years)
 
-        monthly_payment_first_period = cls.calculate_monthly_payment(
-            loan_amount, params.interest_rate_first_period, mortgage_term_months)
-
-        # Different calculation paths based on fixed interest duration
-        if params.fixed_interest_duration_years != params.mortgage_term_years:
-            remaining_balance = cls.calculate_remaining_balance(
-                loan_amount, params.interest_rate_first_period, 
-                fixed_interest_duration_months, monthly_payment_first_period
-            )
-            
-            remaining_term_months = mortgage_term_months - fixed_interest_duration_months
-            
-            monthly_payment_subsequent = cls.calculate_monthly_payment(
-                remaining_balance, params.interest_rate_subsequent, remaining_term_months)
-        else:
-            monthly_payment_subsequent = monthly_payment_first_period
+        to_decimal = numeric.to_decimal
+        balance = numeric.from_decimal(loan_amount)
+        start_month = 1
+        payments = []
+        segments = []
+        for months, annual_rate in params.rate_segments():
+            remaining_term_months = mortgage_term_months - start_month + 1
+            monthly_payment = cls.calculate_monthly_payment(balance, annual_rate, remaining_term_months, numeric)
+            closing_balance = cls.calculate_remaining_balance(balance, annual_rate, months, monthly_payment, numeric)
+            payments.append(monthly_payment)
+            # An empty first period (fixed duration of 0) only defines the first-period payment
+            if months > 0:
+                opening, closing, payment = to_decimal(balance), to_decimal(closing_balance), to_decimal(monthly_payment)
+                segments.append(PaymentSegment(
+                    start_month=start_month,
+                    months=months,
+                    annual_rate=annual_rate,
+                    monthly_payment=payment,
+                    opening_balance=opening,
+                    closing_balance=closing,
+                    principal_paid=opening - closing,
+                    interest_paid=payment * months - (opening - closing)
+                ))
+            balance = closing_balance
+            start_month += months
 
         return MortgagePayments(
-            monthly_payment_first_period,
-            monthly_payment_subsequent,
+            to_decimal(payments[0]),
+            to_decimal(payments[-1]),
             loan_amount,
             fixed_interest_duration_months,
-            mortgage_term_months
-        )
\ No newline at end of file
+            mortgage_term_months,
+            tuple(segments)
+        )
@@ -0,0 +1,511 @@
+"""
+Prepayments and a search for the best prepayment strategy.
+
+A prepayment plan combines a one-off lump sum, paid together with the regular
+installment of ``lump_sum_month``, with a recurring extra payment made every
+month from ``extra_start_month`` to ``extra_end_month``. After each prepayment
+the loan is re-amortized in one of two modes:
+
+- ``shorten_term``: the installment stays and the loan is paid off early. Later
+  rate resets amortize the balance over the shortened term.
+- ``reduce_installment``: the term stays and the installment is recomputed to
+  amortize the balance over the remaining months.
+
+The comparison keeps the original term as its horizon and treats cash the same
+on both sides: the renter invests what the buyer pays (installments plus
+prepayments) minus the rent. A prepayment therefore only raises
+``net_benefit_buying`` when the interest it saves outweighs what the same cash
+would have earned invested. Once the loan is paid off the buyer pays nothing
+and the renter draws the rent from the investment.
+
+Plans are evaluated as a batch: the schedule is stepped month by month with one
+array element per plan, so each month costs a few array operations however many
+plans are evaluated. ``PrepaymentOptimizer`` enumerates the plans that spend at
+most a cash budget (shares of the budget as a lump sum and as recurring extras,
+their start years and spreading periods, both modes) and ranks them by
+``net_benefit_buying``. Arithmetic is float64 like ``calculations.vectorized``;
+without prepayments the totals agree with the Decimal engine within
+``VECTORIZED_RELATIVE_TOLERANCE``.
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import parse_scenario
+from .mortgage_calculations import MortgageCalculator, MortgageParams
+from .vectorized import annuity_payment
+
+MONTHS_PER_YEAR = 12
+MODE_SHORTEN_TERM = 'shorten_term'
+MODE_REDUCE_INSTALLMENT = 'reduce_installment'
+MODES = (MODE_SHORTEN_TERM, MODE_REDUCE_INSTALLMENT)
+
+MAX_PLANS = 1000  # Plans evaluated in one request
+MAX_CANDIDATES = 200000  # Plans enumerated by one search
+DEFAULT_SHARES = (0.0, 0.25, 0.5, 0.75, 1.0)
+DEFAULT_SPREAD_YEARS = (1, 2, 3, 5, 10)
+DEFAULT_TOP = 10
+MAX_TOP = 100
+PAID_OFF_BALANCE = 0.01  # IDR of balance below which the loan counts as repaid
+
+
+@dataclass
+class PrepaymentPlan:
+    lump_sum: Decimal = Decimal('0')
+    lump_sum_month: int = 0        # 1-based month the lump sum is paid in
+    monthly_extra: Decimal = Decimal('0')
+    extra_start_month: int = 0     # 1-based first month of the recurring extra
+    extra_end_month: int = 0       # Last month of the recurring extra (inclusive)
+    mode: str = MODE_SHORTEN_TERM
+
+
+@dataclass
+class OptimizationParams:
+    mortgage_params: MortgageParams
+    monthly_rent: Decimal
+    investment_return_rate: Decimal
+    budget: Decimal                                # Most cash prepaid over the term
+    shares: Tuple[float, ...] = DEFAULT_SHARES     # Budget shares tried for the lump sum and the extras
+    spread_years: Tuple[int, ...] = DEFAULT_SPREAD_YEARS  # Years the recurring share is spread over
+    year_step: int = 1                             # Spacing of the candidate start years
+    modes: Tuple[str, ...] = MODES
+    top: int = DEFAULT_TOP
+
+
+class PlanArrays(NamedTuple):
+    """A batch of plans as parallel arrays, one element per plan."""
+    lump_sum: np.ndarray
+    lump_sum_month: np.ndarray
+    monthly_extra: np.ndarray
+    extra_start_month: np.ndarray
+    extra_end_month: np.ndarray
+    reduce_installment: np.ndarray
+
+    @classmethod
+    def from_plans(cls, plans: Sequence[PrepaymentPlan]) -> 'PlanArrays':
+        return cls(
+            lump_sum=np.array([float(plan.lump_sum) for plan in plans], dtype=np.float64),
+            lump_sum_month=np.array([plan.lump_sum_month for plan in plans], dtype=np.int64),
+            monthly_extra=np.array([float(plan.monthly_extra) for plan in plans], dtype=np.float64),
+            extra_start_month=np.array([plan.extra_start_month for plan in plans], dtype=np.int64),
+            extra_end_month=np.array([plan.extra_end_month for plan in plans], dtype=np.int64),
+            reduce_installment=np.array([plan.mode == MODE_REDUCE_INSTALLMENT for plan in plans], dtype=bool)
+        )
+
+    def plan(self, index: int) -> PrepaymentPlan:
+        """Return plan ``index`` of the batch."""
+        return PrepaymentPlan(
+            lump_sum=Decimal(str(round(float(self.lump_sum[index]), 2))),
+            lump_sum_month=int(self.lump_sum_month[index]),
+            monthly_extra=Decimal(str(round(float(self.monthly_extra[index]), 2))),
+            extra_start_month=int(self.extra_start_month[index]),
+            extra_end_month=int(self.extra_end_month[index]),
+            mode=MODE_REDUCE_INSTALLMENT if self.reduce_installment[index] else MODE_SHORTEN_TERM
+        )
+
+
+class PlanOutcomes(NamedTuple):
+    # One entry per plan
+    net_benefit_buying: np.ndarray
+    total_interest_paid: np.ndarray
+    total_investment_growth: np.ndarray
+    total_prepaid: np.ndarray
+    total_mortgage_cost: np.ndarray  # Installments and prepayments
+    payoff_month: np.ndarray         # Month the balance reached zero
+    # Shape (plans, years) when yearly rollups were requested, else None
+    yearly_installments: Optional[np.ndarray] = None
+    yearly_interest: Optional[np.ndarray] = None
+    yearly_prepaid: Optional[np.ndarray] = None
+    yearly_closing_balance: Optional[np.ndarray] = None
+
+
+class PlanResult(NamedTuple):
+    plan: PrepaymentPlan
+    net_benefit_buying: float
+    total_interest_paid: float
+    total_investment_growth: float
+    total_prepaid: float
+    total_mortgage_cost: float
+    payoff_month: int
+
+
+class OptimizationResult(NamedTuple):
+    candidates: int
+    elapsed_seconds: float
+    baseline: PlanResult
+    best: List[PlanResult]  # Best first
+    # Yearly rollups of the best plan: {'installments': [...], 'interest': ..., 'prepaid': ..., 'closing_balance': ...}
+    best_yearly: Dict[str, List[float]]
+
+
+def _months_to_repay(balance: np.ndarray, payment: np.ndarray, monthly_rate: float) -> np.ndarray:
+    """Whole months a level ``payment`` takes to repay ``balance``."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if monthly_rate == 0.0:
+            months = balance / payment
+        else:
+            months = -np.log1p(-balance * monthly_rate / payment) / np.log1p(monthly_rate)
+    months = np.where((balance <= PAID_OFF_BALANCE) | ~np.isfinite(months), 0.0, months)
+    # Tolerate rounding just above a whole number of months
+    return np.ceil(months - 1e-9)
+
+
+class PrepaymentSchedule:
+    @staticmethod
+    def validate_plan(plan: PrepaymentPlan, term_months: int) -> None:
+        """Validate a plan against a loan of ``term_months``."""
+        if plan.mode not in MODES:
+            raise ValueError(f"Unknown prepayment mode '{plan.mode}', expected one of {', '.join(MODES)}")
+        if plan.lump_sum < 0 or plan.monthly_extra < 0:
+            raise ValueError("Prepayment amounts cannot be negative")
+        if plan.lump_sum > 0 and not 1 <= plan.lump_sum_month <= term_months:
+            raise ValueError(f"Lump sum month must be between 1 and {term_months}")
+        if plan.monthly_extra > 0:
+            if not 1 <= plan.extra_start_month <= term_months:
+                raise ValueError(f"Extra payment start month must be between 1 and {term_months}")
+            if plan.extra_end_month < plan.extra_start_month:
+                raise ValueError("Extra payment end month cannot be before its start month")
+
+    @staticmethod
+    def _rate_resets(mortgage_params: MortgageParams) -> Dict[int, float]:
+        """Return {first month: annual rate} of the non-empty rate periods."""
+        resets = {}
+        start_month = 1
+        for months, annual_rate in mortgage_params.rate_segments():
+            if months > 0:
+                resets[start_month] = float(annual_rate)
+            start_month += months
+        return resets
+
+    @classmethod
+    def evaluate(cls, mortgage_params: MortgageParams, monthly_rent: Decimal, investment_return_rate: Decimal,
+                 plans: PlanArrays, yearly: bool = False) -> PlanOutcomes:
+        """Step the schedule of every plan month by month and return their totals.
+
+        At every rate reset the installment amortizes the balance over the
+        plan's remaining term, as in ``MortgageCalculator.calculate_mortgage_payments``.
+        Prepayments are capped at the outstanding balance. With ``yearly`` the
+        outcomes also hold per-year rollups (meant for a handful of plans).
+        """
+        MortgageCalculator.validate_input(mortgage_params)
+        count = len(plans.lump_sum)
+        term_months = mortgage_params.mortgage_term_years * MONTHS_PER_YEAR
+        price = float(mortgage_params.property_price)
+        rent = float(monthly_rent)
+        investment_growth = 1.0 + float(investment_return_rate) / MONTHS_PER_YEAR
+        resets = cls._rate_resets(mortgage_params)
+
+        balance = np.full(count, price * (1.0 - float(mortgage_params.down_payment_percentage)))
+        payment = np.zeros(count)
+        # Last month of each plan's amortization; shortened by shorten_term prepayments
+        end_month = np.full(count, float(term_months))
+        cumulative = np.zeros(count)
+        invested = np.zeros(count)
+        total_interest = np.zeros(count)
+        total_prepaid = np.zeros(count)
+        total_cost = np.zeros(count)
+        payoff_month = np.zeros(count, dtype=np.int64)
+        has_lump_sum = plans.lump_sum > 0
+        has_extra = plans.monthly_extra > 0
+        reduce_installment = plans.reduce_installment
+
+        years = -(-term_months // MONTHS_PER_YEAR)
+        if yearly:
+            yearly_installments, yearly_interest, yearly_prepaid, yearly_balance = (
+                np.zeros((count, years)) for _ in range(4))
+            year_installments, year_interest, year_prepaid = np.zeros(count), np.zeros(count), np.zeros(count)
+
+        annual_rate = monthly_rate = 0.0
+        for month in range(1, term_months + 1):
+            if month in resets:
+                annual_rate = resets[month]
+                monthly_rate = annual_rate / MONTHS_PER_YEAR
+                payment = annuity_payment(np.maximum(balance, 0.0), annual_rate,
+                                          np.maximum(end_month - month + 1, 1.0))
+            interest = balance * monthly_rate
+            installment = np.minimum(payment, balance + interest)
+            balance = balance + interest - installment
+
+            extra = np.where(has_lump_sum & (plans.lump_sum_month == month), plans.lump_sum, 0.0)
+            extra += np.where(has_extra & (plans.extra_start_month <= month) & (month <= plans.extra_end_month),
+                              plans.monthly_extra, 0.0)
+            extra = np.minimum(extra, np.maximum(balance, 0.0))
+            rows = np.flatnonzero(extra > 0)
+            if rows.size:
+                left = balance[rows] - extra[rows]
+                balance[rows] = left
+                # Re-amortize: a lower installment over the same term, or the same one over fewer months
+                reducing = reduce_installment[rows]
+                remaining = end_month[rows] - month
+                payment[rows] = np.where(
+                    reducing, annuity_payment(left, annual_rate, np.maximum(remaining, 1.0)), payment[rows])
+                end_month[rows] = np.where(
+                    reducing, end_month[rows], month + _months_to_repay(left, payment[rows], monthly_rate))
+
+            outflow = installment + extra
+            contribution = outflow - rent
+            cumulative = contribution if month == 1 else (cumulative + contribution) * investment_growth
+            invested += contribution
+            total_interest += interest
+            total_prepaid += extra
+            total_cost += outflow
+            payoff_month[(payoff_month == 0) & (balance <= PAID_OFF_BALANCE)] = month
+
+            if yearly:
+                year_installments += installment
+                year_interest += interest
+                year_prepaid += extra
+                if month % MONTHS_PER_YEAR == 0 or month == term_months:
+                    year = (month - 1) // MONTHS_PER_YEAR
+                    yearly_installments[:, year] = year_installments
+                    yearly_interest[:, year] = year_interest
+                    yearly_prepaid[:, year] = year_prepaid
+                    yearly_balance[:, year] = np.maximum(balance, 0.0)
+                    year_installments, year_interest, year_prepaid = np.zeros(count), np.zeros(count), np.zeros(count)
+
+        total_investment_growth = cumulative - invested
+        outcomes = PlanOutcomes(
+            net_benefit_buying=price - total_interest - total_investment_growth,
+            total_interest_paid=total_interest,
+            total_investment_growth=total_investment_growth,
+            total_prepaid=total_prepaid,
+            total_mortgage_cost=total_cost,
+            payoff_month=np.where(payoff_month == 0, term_months, payoff_month)
+        )
+        if yearly:
+            outcomes = outcomes._replace(yearly_installments=yearly_installments, yearly_interest=yearly_interest,
+                                         yearly_prepaid=yearly_prepaid, yearly_closing_balance=yearly_balance)
+        return outcomes
+
+    @staticmethod
+    def result(plans: PlanArrays, outcomes: PlanOutcomes, index: int) -> PlanResult:
+        """Return the plan and totals of one evaluated plan."""
+        return PlanResult(
+            plan=plans.plan(index),
+            net_benefit_buying=float(outcomes.net_benefit_buying[index]),
+            total_interest_paid=float(outcomes.total_interest_paid[index]),
+            total_investment_growth=float(outcomes.total_investment_growth[index]),
+            total_prepaid=float(outcomes.total_prepaid[index]),
+            total_mortgage_cost=float(outcomes.total_mortgage_cost[index]),
+            payoff_month=int(outcomes.payoff_month[index])
+        )
+
+
+class PrepaymentOptimizer:
+    @staticmethod
+    def validate_input(params: OptimizationParams) -> None:
+        """Validate search parameters on top of the mortgage parameters."""
+        MortgageCalculator.validate_input(params.mortgage_params)
+        if params.budget <= 0:
+            raise ValueError("Budget must be greater than 0")
+        if not params.shares or any(not 0 <= share <= 1 for share in params.shares):
+            raise ValueError("Budget shares must be between 0 and 1")
+        if not params.spread_years or any(years <= 0 for years in params.spread_years):
+            raise ValueError("Spread years must be greater than 0")
+        if params.year_step <= 0:
+            raise ValueError("Year step must be greater than 0")
+        if not params.modes or any(mode not in MODES for mode in params.modes):
+            raise ValueError(f"Prepayment modes must be among {', '.join(MODES)}")
+        if not 1 <= params.top <= MAX_TOP:
+            raise ValueError(f"Top must be between 1 and {MAX_TOP}")
+
+    @staticmethod
+    def candidates(params: OptimizationParams) -> PlanArrays:
+        """Enumerate the candidate plans, the plan without prepayments first.
+
+        Prepayments start at the end of a candidate year: every ``year_step``
+        years, plus the end of every fixed-rate period. A lump sum takes one
+        share of the budget and recurring extras another (the shares add up to
+        at most the budget), spread evenly over ``spread_years``.
+
+        Raises:
+            ValueError: If there would be more than ``MAX_CANDIDATES`` plans.
+        """
+        mortgage_params = params.mortgage_params
+        term_years = mortgage_params.mortgage_term_years
+        budget = float(params.budget)
+        resets = {months // MONTHS_PER_YEAR
+                  for months in itertools.accumulate(months for months, _ in mortgage_params.rate_segments())}
+        years = sorted((set(range(params.year_step, term_years, params.year_step)) | resets) - {0, term_years})
+        shares = sorted(set(params.shares))
+
+        lump_sums = {share: [(share * budget, year * MONTHS_PER_YEAR) for year in years] for share in shares if share > 0}
+        extras = {
+            share: [(share * budget / (spread * MONTHS_PER_YEAR), year * MONTHS_PER_YEAR + 1,
+                     (year + spread) * MONTHS_PER_YEAR)
+                    for spread in sorted(set(params.spread_years)) for year in years if year + spread <= term_years]
+            for share in shares if share > 0
+        }
+        lump_sums[0.0] = [(0.0, 0)]
+        extras[0.0] = [(0.0, 0, 0)]
+
+        count = 1 + len(params.modes) * sum(
+            len(lump_sums[lump_share]) * len(extras[extra_share])
+            for lump_share, extra_share in itertools.product(lump_sums, extras)
+            if 0 < lump_share + extra_share <= 1 + 1e-9)
+        if count > MAX_CANDIDATES:
+            raise ValueError(f"Search would evaluate {count} plans, more than the maximum of {MAX_CANDIDATES}")
+
+        rows = [(0.0, 0, 0.0, 0, 0, False)]
+        for lump_share, extra_share in itertools.product(lump_sums, extras):
+            if not 0 < lump_share + extra_share <= 1 + 1e-9:
+                continue
+            for mode in params.modes:
+                reduce_installment = mode == MODE_REDUCE_INSTALLMENT
+                rows.extend((lump_sum, lump_sum_month, monthly_extra, start_month, end_month, reduce_installment)
+                            for (lump_sum, lump_sum_month), (monthly_extra, start_month, end_month)
+                            in itertools.product(lump_sums[lump_share], extras[extra_share]))
+        lump_sum, lump_sum_month, monthly_extra, start_month, end_month, reduce_installment = zip(*rows)
+        return PlanArrays(
+            lump_sum=np.array(lump_sum, dtype=np.float64),
+            lump_sum_month=np.array(lump_sum_month, dtype=np.int64),
+            monthly_extra=np.array(monthly_extra, dtype=np.float64),
+            extra_start_month=np.array(start_month, dtype=np.int64),
+            extra_end_month=np.array(end_month, dtype=np.int64),
+            reduce_installment=np.array(reduce_installment, dtype=bool)
+        )
+
+    @classmethod
+    def run(cls, params: OptimizationParams) -> OptimizationResult:
+        """Evaluate every candidate plan and return the best ones.
+
+        Plans are ranked by ``net_benefit_buying``; ties go to the plan that
+        prepays less. The plan without prepayments is a candidate, so the best
+        plan is never worse than not prepaying.
+        """
+        cls.validate_input(params)
+        started = time.perf_counter()
+        plans = cls.candidates(params)
+        outcomes = PrepaymentSchedule.evaluate(
+            params.mortgage_params, params.monthly_rent, params.investment_return_rate, plans)
+        order = np.lexsort((outcomes.total_prepaid, -outcomes.net_benefit_buying))[:params.top]
+        best = [PrepaymentSchedule.result(plans, outcomes, int(index)) for index in order]
+
+        best_plan = PlanArrays.from_plans([best[0].plan])
+        rollups = PrepaymentSchedule.evaluate(
+            params.mortgage_params, params.monthly_rent, params.investment_return_rate, best_plan, yearly=True)
+        return OptimizationResult(
+            candidates=len(plans.lump_sum),
+            elapsed_seconds=time.perf_counter() - started,
+            baseline=PrepaymentSchedule.result(plans, outcomes, 0),
+            best=best,
+            best_yearly={
+                'installments': rollups.yearly_installments[0].tolist(),
+                'interest': rollups.yearly_interest[0].tolist(),
+                'prepaid': rollups.yearly_prepaid[0].tolist(),
+                'closing_balance': rollups.yearly_closing_balance[0].tolist()
+            }
+        )
+
+
+def _amount(field: str, raw: Any) -> Decimal:
+    try:
+        value = Decimal(str(raw))
+        if not value.is_finite():
+            raise ValueError
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Invalid value for '{field}': {raw!r}")
+    return value
+
+
+def _month(field: str, raw: Any) -> int:
+    if isinstance(raw, bool) or not isinstance(raw, int):
+        raise ValueError(f"Invalid value for '{field}': {raw!r}")
+    return raw
+
+
+def plan_from_record(record: Dict[str, Any], term_months: int) -> PrepaymentPlan:
+    """Parse and validate a plan given as a JSON object.
+
+    ``extra_end_month`` defaults to the last month of the term.
+
+    Raises:
+        ValueError: If a field is malformed or the plan is invalid.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Prepayment plan must be an object")
+    plan = PrepaymentPlan(
+        lump_sum=_amount('lump_sum', record.get('lump_sum', 0)),
+        lump_sum_month=_month('lump_sum_month', record.get('lump_sum_month', 0)),
+        monthly_extra=_amount('monthly_extra', record.get('monthly_extra', 0)),
+        extra_start_month=_month('extra_start_month', record.get('extra_start_month', 0)),
+        extra_end_month=_month('extra_end_month', record.get('extra_end_month') or term_months),
+        mode=record.get('mode', MODE_SHORTEN_TERM)
+    )
+    PrepaymentSchedule.validate_plan(plan, term_months)
+    return plan
+
+
+def plan_result_to_dict(result: PlanResult) -> Dict[str, Any]:
+    """Convert an evaluated plan into JSON-compatible data."""
+    plan = result.plan
+    return {
+        'plan': {
+            'lump_sum': float(plan.lump_sum),
+            'lump_sum_month': plan.lump_sum_month,
+            'monthly_extra': float(plan.monthly_extra),
+            'extra_start_month': plan.extra_start_month,
+            'extra_end_month': plan.extra_end_month,
+            'mode': plan.mode
+        },
+        'net_benefit_buying': result.net_benefit_buying,
+        'total_interest_paid': result.total_interest_paid,
+        'total_investment_growth': result.total_investment_growth,
+        'total_prepaid': result.total_prepaid,
+        'total_mortgage_cost': result.total_mortgage_cost,
+        'payoff_month': result.payoff_month
+    }
+
+
+def run_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate the plans of an ``/api/prepayment`` request and run its search, if any.
+
+    Raises:
+        ValueError: If the scenario, a plan or a search setting is invalid.
+    """
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(request['scenario'])
+    term_months = mortgage_params.mortgage_term_years * MONTHS_PER_YEAR
+    records = request.get('plans') or []
+    budget = request.get('budget')
+    if not records and budget is None:
+        raise ValueError("Provide 'plans' to evaluate, a 'budget' to search, or both")
+    if len(records) > MAX_PLANS:
+        raise ValueError(f"Number of plans exceeds maximum of {MAX_PLANS}")
+
+    started = time.perf_counter()
+    plans = PlanArrays.from_plans([PrepaymentPlan()] + [plan_from_record(record, term_months) for record in records])
+    outcomes = PrepaymentSchedule.evaluate(mortgage_params, monthly_rent, investment_return_rate, plans)
+    response = {
+        'baseline': plan_result_to_dict(PrepaymentSchedule.result(plans, outcomes, 0)),
+        'plans': [plan_result_to_dict(PrepaymentSchedule.result(plans, outcomes, index))
+                  for index in range(1, len(plans.lump_sum))],
+        'optimization': None,
+        'elapsed_seconds': time.perf_counter() - started
+    }
+    if budget is not None:
+        params = OptimizationParams(
+            mortgage_params=mortgage_params,
+            monthly_rent=monthly_rent,
+            investment_return_rate=investment_return_rate,
+            budget=_amount('budget', budget),
+            shares=tuple(request['shares']) if request.get('shares') is not None else DEFAULT_SHARES,
+            spread_years=(tuple(request['spread_years']) if request.get('spread_years') is not None
+                          else DEFAULT_SPREAD_YEARS),
+            year_step=request.get('year_step', 1),
+            modes=tuple(request['modes']) if request.get('modes') is not None else MODES,
+            top=request.get('top', DEFAULT_TOP)
+        )
+        result = PrepaymentOptimizer.run(params)
+        response['optimization'] = {
+            'budget': float(params.budget),
+            'candidates': result.candidates,
+            'elapsed_seconds': result.elapsed_seconds,
+            'best': [plan_result_to_dict(item) for item in result.best],
+            'best_yearly': result.best_yearly
+        }
+    return response
@@ -0,0 +1,115 @@
+"""
+Two-dimensional sensitivity analysis of the buy-vs-rent verdict.
+
+A base scenario (see ``calculations.batch`` for the record format) is varied
+along two input dimensions and ``net_benefit_buying`` is evaluated for every
+cell at once by broadcasting the closed-form evaluator in
+``calculations.vectorized`` over the grid.
+"""
+
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+
+from .batch import parse_scenario
+from .vectorized import evaluate_summary
+
+# Dimensions that can be varied, and whether their values must be whole numbers
+SENSITIVITY_DIMENSIONS = {
+    'interest_rate_subsequent': False,
+    'investment_return_rate': False,
+    'monthly_rent': False,
+    'down_payment_percentage': False,
+    'mortgage_term_years': True,
+}
+MAX_AXIS_STEPS = 500
+
+
+class SensitivityGrid(NamedTuple):
+    x_dimension: str
+    x_values: np.ndarray
+    y_dimension: str
+    y_values: np.ndarray
+    # Shape (len(y_values), len(x_values)); NaN where the inputs are invalid
+    net_benefit_buying: np.ndarray
+
+
+def axis_values(dimension: str, start: float, stop: float, steps: int) -> np.ndarray:
+    """Build evenly spaced values for one grid axis.
+
+    Raises:
+        ValueError: If the dimension is unknown or the range is invalid.
+    """
+    if dimension not in SENSITIVITY_DIMENSIONS:
+        raise ValueError(f"Unknown dimension '{dimension}', expected one of {', '.join(SENSITIVITY_DIMENSIONS)}")
+    if not 1 <= steps <= MAX_AXIS_STEPS:
+        raise ValueError(f"Steps must be between 1 and {MAX_AXIS_STEPS}")
+    if not (np.isfinite(start) and np.isfinite(stop)):
+        raise ValueError("Range bounds must be finite numbers")
+
+    values = np.linspace(start, stop, steps)
+    if SENSITIVITY_DIMENSIONS[dimension]:
+        values = np.unique(np.round(values))
+    return values
+
+
+def sensitivity_grid(scenario: Dict[str, Any], x_dimension: str, x_values: np.ndarray,
+                     y_dimension: str, y_values: np.ndarray) -> SensitivityGrid:
+    """Evaluate ``net_benefit_buying`` over the grid spanned by two dimensions.
+
+    Raises:
+        ValueError: If the base scenario is invalid or both axes use the same dimension.
+    """
+    if x_dimension == y_dimension:
+        raise ValueError("The two grid dimensions must differ")
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(scenario, allow_tiers=False)
+
+    inputs = {
+        'property_price': float(mortgage_params.property_price),
+        'down_payment_percentage': float(mortgage_params.down_payment_percentage),
+        'interest_rate_first_period': float(mortgage_params.interest_rate_first_period),
+        'interest_rate_subsequent': float(mortgage_params.interest_rate_subsequent),
+        'mortgage_term_years': mortgage_params.mortgage_term_years,
+        'fixed_interest_duration_years': mortgage_params.fixed_interest_duration_years,
+        'monthly_rent': float(monthly_rent),
+        'investment_return_rate': float(investment_return_rate),
+    }
+    # x varies along columns and y along rows; broadcasting spans the grid
+    inputs[x_dimension] = np.asarray(x_values, dtype=np.float64)[np.newaxis, :]
+    inputs[y_dimension] = np.asarray(y_values, dtype=np.float64)[:, np.newaxis]
+
+    summary = evaluate_summary(**inputs)
+    return SensitivityGrid(
+        x_dimension=x_dimension,
+        x_values=np.asarray(x_values, dtype=np.float64),
+        y_dimension=y_dimension,
+        y_values=np.asarray(y_values, dtype=np.float64),
+        net_benefit_buying=summary.net_benefit_buying
+    )
+
+
+def grid_to_dict(grid: SensitivityGrid) -> Dict[str, Any]:
+    """Convert a grid into JSON-compatible data, with invalid cells as None."""
+    surface = grid.net_benefit_buying.astype(object)
+    surface[np.isnan(grid.net_benefit_buying)] = None
+    rows: List[List[Any]] = surface.tolist()
+    return {
+        'x': {'dimension': grid.x_dimension, 'values': grid.x_values.tolist()},
+        'y': {'dimension': grid.y_dimension, 'values': grid.y_values.tolist()},
+        'net_benefit_buying': rows
+    }
+
+
+def run_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate the grid of an ``/api/sensitivity`` request as JSON-compatible data.
+
+    Raises:
+        ValueError: If the scenario or an axis is invalid.
+    """
+    x, y = request['x'], request['y']
+    grid = sensitivity_grid(
+        request['scenario'],
+        x['dimension'], axis_values(x['dimension'], x['start'], x['stop'], x.get('steps', 50)),
+        y['dimension'], axis_values(y['dimension'], y['start'], y['stop'], y.get('steps', 50))
+    )
+    return grid_to_dict(grid)
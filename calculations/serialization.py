@@ -0,0 +1,96 @@
+"""
+Bulk JSON serialization of comparison results.
+
+Records are transposed into columns once and every column is converted with a
+single ``map``/``tolist`` call, avoiding per-field Python conversion loops.
+Decimal amounts are emitted either as strings carrying their exact digits
+(``'string'``) or as JSON numbers (``'float'``). The monthly schedule is
+serialized column-oriented (one list per field), which keeps payloads compact.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .comparison import ComparisonResult, MonthlyComparison, YearSummary
+from .mortgage_calculations import MortgagePayments, PaymentSegment
+
+DECIMAL_STRING = 'string'
+DECIMAL_FLOAT = 'float'
+DECIMAL_MODES = (DECIMAL_STRING, DECIMAL_FLOAT)
+
+INTEGER_FIELDS = frozenset(('month', 'year', 'month_of_year', 'start_month', 'months'))
+
+
+def _converter(decimal_mode: str) -> Callable[[Any], Any]:
+    if decimal_mode == DECIMAL_STRING:
+        return str
+    if decimal_mode == DECIMAL_FLOAT:
+        return float
+    raise ValueError(f"Unknown decimal mode '{decimal_mode}', expected one of {', '.join(DECIMAL_MODES)}")
+
+
+def _convert_value(value: Any, convert: Callable[[Any], Any]) -> Any:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (Decimal, float)):
+        return convert(value)
+    return value
+
+
+def serialize_columns(records: Sequence[tuple], fields: Sequence[str], decimal_mode: str = DECIMAL_STRING) -> Dict[str, List[Any]]:
+    """Serialize NamedTuple-like records into one list per field."""
+    convert = _converter(decimal_mode)
+    # A columnar MonthlySchedule hands out its columns directly; checked by duck
+    # typing so that serializing Decimal results never imports NumPy
+    if hasattr(records, 'column'):
+        columns = {}
+        for field in fields:
+            values = records.column(field).tolist()
+            # Floats already are exact in JSON; the string mode keeps the repr digits
+            columns[field] = values if field in INTEGER_FIELDS or decimal_mode == DECIMAL_FLOAT else list(map(repr, values))
+        return columns
+
+    transposed = list(zip(*records)) if records else [()] * len(fields)
+    return {
+        field: list(values) if field in INTEGER_FIELDS else list(map(convert, values))
+        for field, values in zip(fields, transposed)
+    }
+
+
+def serialize_objects(records: Sequence[tuple], fields: Sequence[str], decimal_mode: str = DECIMAL_STRING) -> List[Dict[str, Any]]:
+    """Serialize NamedTuple-like records as a list of objects, one per record."""
+    columns = serialize_columns(records, fields, decimal_mode)
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def serialize_yearly_summary(yearly_summary: Sequence[YearSummary], decimal_mode: str = DECIMAL_STRING) -> List[Dict[str, Any]]:
+    """Serialize yearly summaries as a list of objects, one per year."""
+    return serialize_objects(yearly_summary, YearSummary._fields, decimal_mode)
+
+
+def serialize_comparison(result: ComparisonResult, mortgage_payments: Optional[MortgagePayments] = None,
+                         decimal_mode: str = DECIMAL_STRING, include_monthly: bool = True) -> Dict[str, Any]:
+    """Serialize a comparison result (and optionally its payments) into JSON-compatible data."""
+    convert = _converter(decimal_mode)
+    data: Dict[str, Any] = {
+        field: _convert_value(getattr(result, field), convert)
+        for field in ComparisonResult._fields
+        if field not in ('monthly_comparison', 'yearly_summary')
+    }
+    if mortgage_payments is not None:
+        data['mortgage_payments'] = {
+            field: _convert_value(value, convert) for field, value in mortgage_payments._asdict().items()
+            if field != 'segments'
+        }
+        data['mortgage_payments']['segments'] = serialize_objects(
+            mortgage_payments.segments, PaymentSegment._fields, decimal_mode)
+    data['yearly_summary'] = serialize_yearly_summary(result.yearly_summary, decimal_mode)
+    if include_monthly:
+        data['monthly_comparison'] = serialize_columns(result.monthly_comparison, MonthlyComparison._fields, decimal_mode)
+    return data
+
+
+def dumps(data: Dict[str, Any]) -> bytes:
+    """Encode serialized data as compact UTF-8 JSON."""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,382 @@
+"""
+Vectorized NumPy engine for the mortgage vs. rent comparison.
+
+Computes the complete amortization schedule with array operations instead of
+the month-by-month Decimal loop in ``comparison.py``. The arithmetic is done in
+float64, so results are not bit-identical to the Decimal engine. Every monetary
+value agrees with it to within
+
+    max(VECTORIZED_ABSOLUTE_TOLERANCE,
+        VECTORIZED_RELATIVE_TOLERANCE * max(|value|, loan_amount))
+
+The loan amount is part of the scale because late-term interest is a small
+difference of large balances, so its error is bounded relative to the loan.
+
+Totals and yearly summaries are returned as Decimal like the Decimal engine;
+the per-month schedule is a columnar ``MonthlySchedule`` (float64 arrays with
+lazy row views) instead of a list of ``MonthlyComparison`` records.
+"""
+
+from decimal import Decimal
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .columnar import MonthlySchedule
+from .comparison import ComparisonParams, ComparisonResult, MortgageComparison, YearSummary
+from .mortgage_calculations import MAX_PROPERTY_PRICE
+
+# Documented agreement with MortgageComparison's Decimal engine for every
+# monetary field of ComparisonResult (including per-month and per-year values)
+VECTORIZED_RELATIVE_TOLERANCE = 1e-9
+VECTORIZED_ABSOLUTE_TOLERANCE = 0.01  # IDR
+
+MONTHS_PER_YEAR = 12
+
+
+# Annual rates at or below this are treated as zero when computing payments,
+# mirroring MortgageCalculator.calculate_monthly_payment
+ZERO_RATE_THRESHOLD = 1e-7
+
+
+class SummaryArrays(NamedTuple):
+    monthly_payment_first_period: np.ndarray
+    monthly_payment_subsequent: np.ndarray
+    total_mortgage_cost: np.ndarray
+    total_interest_paid: np.ndarray
+    total_investment_growth: np.ndarray
+    net_benefit_buying: np.ndarray
+
+
+class ArrayAmortization(NamedTuple):
+    """Mortgage side of a comparison as float64 arrays (see comparison.Amortization)."""
+    fixed_months: int
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    year_starts: np.ndarray
+    year_ends: np.ndarray
+    yearly_payment: np.ndarray  # Averages
+    yearly_principal: np.ndarray
+    yearly_interest: np.ndarray
+    total_mortgage_cost: float
+    total_interest_paid: float
+    total_principal_paid: float
+    mortgage_cost_fixed_period: float
+    mortgage_cost_variable: float
+
+
+class ArrayOverlay(NamedTuple):
+    """Rent and investment side as float64 arrays (see comparison.InvestmentOverlay)."""
+    rent: float
+    investment: np.ndarray
+    cumulative: np.ndarray
+    yearly_growth: np.ndarray
+    total_investment_growth: float
+    max_payment_difference: float
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Convert a float result back to Decimal the same way the calculator does."""
+    return Decimal(str(value))
+
+
+def _to_decimal_list(values: np.ndarray) -> List[Decimal]:
+    """Convert a float64 array into a list of Decimals in bulk."""
+    return list(map(Decimal, map(str, values.tolist())))
+
+
+class VectorizedComparison:
+    @staticmethod
+    def _rate_periods(params: ComparisonParams) -> List[Tuple[int, float, float]]:
+        """Split the term into (months, monthly_payment, monthly_rate) periods."""
+        return [(months, float(monthly_payment), float(annual_rate) / MONTHS_PER_YEAR)
+                for months, monthly_payment, annual_rate in MortgageComparison.payment_periods(params)]
+
+    @staticmethod
+    def amortize(loan_amount: float, periods: List[Tuple[int, float, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return per-month (payment, interest, principal) arrays for the given rate periods.
+
+        Within a period of constant payment P and monthly rate r the balance after
+        k months is B0 * g**k - P * (g**k - 1) / r with g = 1 + r, so each period is
+        evaluated in closed form over all of its months at once.
+        """
+        term_months = sum(months for months, _, _ in periods)
+        payment = np.empty(term_months)
+        rate = np.empty(term_months)
+        opening_balance = np.empty(term_months)
+
+        balance = loan_amount
+        start = 0
+        for months, monthly_payment, monthly_rate in periods:
+            end = start + months
+            elapsed = np.arange(months, dtype=np.float64)
+            if monthly_rate == 0.0:
+                opening_balance[start:end] = balance - monthly_payment * elapsed
+                balance = balance - monthly_payment * months
+            else:
+                growth = np.power(1.0 + monthly_rate, elapsed)
+                opening_balance[start:end] = balance * growth - monthly_payment * (growth - 1.0) / monthly_rate
+                final_growth = (1.0 + monthly_rate) ** months
+                balance = balance * final_growth - monthly_payment * (final_growth - 1.0) / monthly_rate
+            payment[start:end] = monthly_payment
+            rate[start:end] = monthly_rate
+            start = end
+
+        interest = opening_balance * rate
+        principal = payment - interest
+        return payment, interest, principal
+
+    @staticmethod
+    def cumulative_investment(investment: np.ndarray, monthly_rate: float) -> np.ndarray:
+        """Scan c[0] = x[0], c[m] = (c[m-1] + x[m]) * (1 + rate) over the investment stream.
+
+        Dividing by the growth factor turns the recurrence into a plain prefix sum:
+        c[m] = g**(m+1) * cumsum(x[j] * g**-j), except that x[0] is weighted by g**-1
+        because the first month's contribution does not grow.
+        """
+        growth = 1.0 + monthly_rate
+        if growth <= 0.0:
+            # Degenerate growth factor: fall back to the sequential recurrence
+            cumulative = np.empty_like(investment)
+            running = 0.0
+            for month, amount in enumerate(investment.tolist()):
+                running = amount if month == 0 else (running + amount) * growth
+                cumulative[month] = running
+            return cumulative
+
+        exponents = np.arange(investment.size, dtype=np.float64)
+        weighted = investment * np.power(growth, -exponents)
+        weighted[0] /= growth
+        return np.cumsum(weighted) * np.power(growth, exponents + 1.0)
+
+    @classmethod
+    def month_by_month_comparison(cls, params: ComparisonParams, summary_only: bool = False) -> ComparisonResult:
+        """Vectorized equivalent of MortgageComparison.month_by_month_comparison."""
+        amortization = cls.amortization(params)
+        return cls.aggregate(params, amortization, cls.investment_overlay(params, amortization), summary_only)
+
+    @classmethod
+    def amortization(cls, params: ComparisonParams, backend: Optional[str] = None,
+                     columns: bool = True) -> ArrayAmortization:
+        """Stage 1: the mortgage side as arrays.
+
+        ``backend`` is ignored, the engine is float64. The arrays are always
+        kept (``columns`` is ignored): they are compact and the yearly rollups
+        are reduced from them.
+        """
+        term_months = params.mortgage_payments.mortgage_term_months
+        fixed_months = params.mortgage_payments.fixed_interest_duration_months
+
+        payment, interest, principal = cls.amortize(
+            float(params.mortgage_payments.loan_amount), cls._rate_periods(params))
+
+        # Yearly rollups: reduce each block of 12 months (the last block may be shorter)
+        year_starts = np.arange(0, term_months, MONTHS_PER_YEAR)
+        year_ends = np.minimum(year_starts + MONTHS_PER_YEAR, term_months) - 1
+        months_in_year = (year_ends - year_starts + 1).astype(np.float64)
+
+        return ArrayAmortization(
+            fixed_months=fixed_months,
+            payment=payment,
+            interest=interest,
+            principal=principal,
+            year_starts=year_starts,
+            year_ends=year_ends,
+            yearly_payment=np.add.reduceat(payment, year_starts) / months_in_year,
+            yearly_principal=np.add.reduceat(principal, year_starts),
+            yearly_interest=np.add.reduceat(interest, year_starts),
+            total_mortgage_cost=payment.sum(),
+            total_interest_paid=interest.sum(),
+            total_principal_paid=principal.sum(),
+            mortgage_cost_fixed_period=payment[:fixed_months].sum(),
+            mortgage_cost_variable=payment[fixed_months:].sum()
+        )
+
+    @classmethod
+    def investment_overlay(cls, params: ComparisonParams, amortization: ArrayAmortization) -> ArrayOverlay:
+        """Stage 2: the investment stream and its growth as arrays."""
+        rent = float(params.monthly_rent)
+        investment = amortization.payment - rent
+        cumulative = cls.cumulative_investment(investment, float(params.investment_return_rate) / MONTHS_PER_YEAR)
+        year_ends = amortization.year_ends
+        previous_year_end = np.concatenate(([0.0], cumulative[year_ends[:-1]]))
+        return ArrayOverlay(
+            rent=rent,
+            investment=investment,
+            cumulative=cumulative,
+            yearly_growth=cumulative[year_ends] - previous_year_end - investment[year_ends],
+            total_investment_growth=cumulative[-1] - investment.sum(),
+            max_payment_difference=np.abs(cumulative).max()
+        )
+
+    @classmethod
+    def aggregate(cls, params: ComparisonParams, amortization: ArrayAmortization, overlay: ArrayOverlay,
+                  summary_only: bool = False) -> ComparisonResult:
+        """Stage 3: totals and yearly summaries as Decimal, the schedule as columns."""
+        term_months = params.mortgage_payments.mortgage_term_months
+        fixed_months = amortization.fixed_months
+        rent = overlay.rent
+        payment, interest, principal = amortization.payment, amortization.interest, amortization.principal
+        investment, cumulative = overlay.investment, overlay.cumulative
+
+        total_interest_paid = amortization.total_interest_paid
+        total_investment_growth = overlay.total_investment_growth
+        net_benefit_buying = float(params.mortgage_params.property_price) - total_interest_paid - total_investment_growth
+
+        # Fixed vs variable period split
+        total_mortgage_cost_fixed_period = amortization.mortgage_cost_fixed_period
+        total_mortgage_cost_variable = amortization.mortgage_cost_variable
+        total_rent_cost_fixed_period = rent * min(fixed_months, term_months)
+        total_rent_cost_variable = rent * max(term_months - fixed_months, 0)
+        payment_difference_fixed = total_rent_cost_fixed_period - total_mortgage_cost_fixed_period
+        payment_difference_variable = total_rent_cost_variable - total_mortgage_cost_variable
+
+        savings_percent_fixed = 0.0
+        if total_rent_cost_fixed_period > 0:
+            savings_percent_fixed = max(0.0, payment_difference_fixed / total_rent_cost_fixed_period * 100)
+        savings_percent_variable = 0.0
+        if total_rent_cost_variable > 0:
+            savings_percent_variable = max(0.0, payment_difference_variable / total_rent_cost_variable * 100)
+
+        # Keep the per-month schedule as columns: converting ~3,000 values to
+        # Decimal records would cost more than the whole vectorized computation
+        monthly_comparison = []
+        if not summary_only:
+            monthly_comparison = MonthlySchedule.from_columns(
+                monthly_mortgage_payment=payment,
+                monthly_rent=rent,
+                investment_opportunity=investment,
+                cumulative_investment=cumulative,
+                principal_for_the_month=principal,
+                interest_for_the_month=interest,
+                total_rent_and_savings=rent + principal,
+                difference=payment - (rent + principal)
+            )
+        monthly_rent = params.monthly_rent
+
+        year_starts = amortization.year_starts
+        yearly_summary = list(map(YearSummary._make, zip(
+            (year_starts // MONTHS_PER_YEAR + 1).tolist(),
+            _to_decimal_list(amortization.yearly_payment),
+            [monthly_rent] * len(year_starts),
+            _to_decimal_list(overlay.yearly_growth),
+            _to_decimal_list(amortization.yearly_principal),
+            _to_decimal_list(amortization.yearly_interest),
+        )))
+
+        net_benefit = _to_decimal(net_benefit_buying)
+        return ComparisonResult(
+            monthly_comparison=monthly_comparison,
+            yearly_summary=yearly_summary,
+            total_mortgage_cost=_to_decimal(amortization.total_mortgage_cost),
+            total_rent_cost=params.monthly_rent * term_months,
+            total_investment_growth=_to_decimal(total_investment_growth),
+            net_benefit_buying=net_benefit,
+            max_payment_difference=_to_decimal(overlay.max_payment_difference),
+            is_buying_cheaper=net_benefit > Decimal('0'),
+            payment_difference_fixed=_to_decimal(payment_difference_fixed),
+            payment_difference_variable=_to_decimal(payment_difference_variable),
+            savings_percent_fixed=_to_decimal(savings_percent_fixed),
+            savings_percent_variable=_to_decimal(savings_percent_variable),
+            total_interest_paid=_to_decimal(total_interest_paid),
+            total_principal_paid=_to_decimal(amortization.total_principal_paid)
+        )
+
+
+def _growth_minus_one(monthly_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Return (1 + rate) ** months - 1 without cancellation for small rates."""
+    return np.expm1(months * np.log1p(monthly_rate))
+
+
+def _accumulation_factor(monthly_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Return ((1 + rate) ** months - 1) / rate, which tends to ``months`` as the rate goes to 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(monthly_rate == 0, months, _growth_minus_one(monthly_rate, months) / monthly_rate)
+
+
+def annuity_payment(loan_amount: np.ndarray, annual_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Level monthly payment that amortizes ``loan_amount`` over ``months``."""
+    monthly_rate = annual_rate / MONTHS_PER_YEAR
+    with np.errstate(divide='ignore', invalid='ignore'):
+        amortizing = loan_amount * monthly_rate / -np.expm1(-months * np.log1p(monthly_rate))
+        return np.where(annual_rate <= ZERO_RATE_THRESHOLD, loan_amount / months, amortizing)
+
+
+def balance_after(balance: np.ndarray, monthly_rate: np.ndarray, payment: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Balance after paying ``payment`` for ``months`` at a constant monthly rate."""
+    return balance * (1.0 + _growth_minus_one(monthly_rate, months)) - payment * _accumulation_factor(monthly_rate, months)
+
+
+def evaluate_summary(property_price, down_payment_percentage, interest_rate_first_period,
+                     interest_rate_subsequent, mortgage_term_years, fixed_interest_duration_years,
+                     monthly_rent, investment_return_rate) -> SummaryArrays:
+    """Evaluate comparison totals in closed form for broadcastable array inputs.
+
+    Arguments follow the MortgageParams/ComparisonParams units (rates as decimal
+    fractions) and may be scalars or arrays of any broadcast-compatible shapes;
+    every output has the broadcast shape. Each cell costs O(1) regardless of the
+    term, and agrees with the Decimal engine within the module tolerance.
+    Cells that would fail MortgageCalculator.validate_input are NaN.
+    """
+    price, down_payment, rate_first, rate_subsequent, term_years, fixed_years, rent, return_rate = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (
+            property_price, down_payment_percentage, interest_rate_first_period, interest_rate_subsequent,
+            mortgage_term_years, fixed_interest_duration_years, monthly_rent, investment_return_rate)))
+
+    valid = ((price > 0) & (price <= MAX_PROPERTY_PRICE) & (down_payment >= 0) & (down_payment <= 1)
+             & (rate_first >= 0) & (rate_subsequent >= 0) & (term_years > 0)
+             & (fixed_years >= 0) & (fixed_years <= term_years))
+
+    loan_amount = price * (1.0 - down_payment)
+    term_months = term_years * MONTHS_PER_YEAR
+    single_rate = fixed_years == term_years
+    # When the fixed rate covers the whole term every month is a "first period" month
+    fixed_months = np.where(single_rate, term_months, fixed_years * MONTHS_PER_YEAR)
+    variable_months = term_months - fixed_months
+    monthly_rate_first = rate_first / MONTHS_PER_YEAR
+    monthly_rate_subsequent = rate_subsequent / MONTHS_PER_YEAR
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        payment_first = annuity_payment(loan_amount, rate_first, term_months)
+        balance_fixed_end = balance_after(loan_amount, monthly_rate_first, payment_first, fixed_months)
+        payment_subsequent = np.where(
+            single_rate, payment_first,
+            annuity_payment(np.maximum(balance_fixed_end, 0.0), rate_subsequent, variable_months))
+        final_balance = balance_after(balance_fixed_end, monthly_rate_subsequent, payment_subsequent, variable_months)
+
+        total_mortgage_cost = payment_first * fixed_months + payment_subsequent * variable_months
+        total_interest_paid = total_mortgage_cost - (loan_amount - final_balance)
+
+        # Cumulative investment after the last month, from the scan in
+        # cumulative_investment written as geometric sums per period:
+        # c_N = sum_j x_j g**(N-j+1) - x_1 * (g**N - g**(N-1))
+        investment_first = payment_first - rent
+        investment_subsequent = payment_subsequent - rent
+        monthly_return = return_rate / MONTHS_PER_YEAR
+        growth = 1.0 + monthly_return
+        growth_term = 1.0 + _growth_minus_one(monthly_return, term_months)
+        # sum of g**k for k = N-F+1 .. N, and for k = 1 .. N-F
+        fixed_weight = (growth_term - (1.0 + _growth_minus_one(monthly_return, variable_months))) * growth / np.where(
+            monthly_return == 0, 1.0, monthly_return)
+        fixed_weight = np.where(monthly_return == 0, fixed_months, fixed_weight)
+        variable_weight = growth * _accumulation_factor(monthly_return, variable_months)
+        first_investment = np.where(fixed_months > 0, investment_first, investment_subsequent)
+        cumulative = (investment_first * fixed_weight + investment_subsequent * variable_weight
+                      - first_investment * growth_term * monthly_return / growth)
+        invested = investment_first * fixed_months + investment_subsequent * variable_months
+        total_investment_growth = cumulative - invested
+
+        net_benefit_buying = price - total_interest_paid - total_investment_growth
+
+    def masked(values: np.ndarray) -> np.ndarray:
+        return np.where(valid, values, np.nan)
+
+    return SummaryArrays(
+        monthly_payment_first_period=masked(payment_first),
+        monthly_payment_subsequent=masked(payment_subsequent),
+        total_mortgage_cost=masked(total_mortgage_cost),
+        total_interest_paid=masked(total_interest_paid),
+        total_investment_growth=masked(total_investment_growth),
+        net_benefit_buying=masked(net_benefit_buying)
+    )
@@ -1,12 +1,12 @@
 #!/bin/bash
 set -e
 
-# If the first argument is "--cli", run in CLI mode
-if [ "$1" = "--cli" ]; then
-    echo "Running in CLI mode..."
-    exec python main.py --cli
+# If the first argument is "--cli" or "--input", run in CLI mode (bulk evaluation with --input)
+if [ "$1" = "--cli" ] || [ "$1" = "--input" ]; then
+    echo "Running in CLI mode..." >&2
+    exec python main.py "$@"
 fi
 
-# Otherwise start the web server
-echo "Starting web server..."
-exec python main.py
\ No newline at end of file
+# Otherwise start the web server; WEB_CONCURRENCY sets the number of worker processes
+echo "Starting web server with ${WEB_CONCURRENCY:-1} worker(s)..."
+exec python main.py --workers "${WEB_CONCURRENCY:-1}"
\ No newline at end of file
@@ -0,0 +1,643 @@
+"""
+Background jobs for analyses too long for a single request.
+
+``POST /api/jobs`` stores a job in a local SQLite database and a pool of worker
+processes executes it: the workers started with the server (one by default,
+see ``REALESTIMATE_JOB_WORKERS``) and any standalone ``python jobs.py``
+workers. There is no broker: workers poll the
+database and claim queued jobs in a write transaction, so any number of server
+processes and standalone workers can share one database file.
+
+Each job kind splits its work into units: chunks of ``BATCH_CHUNK_SIZE``
+scenarios for ``batch``, blocks of grid rows for ``sensitivity``, and a single
+unit for ``monte_carlo`` (which reports progress per chunk of paths). The
+items of every finished unit are committed with the job's progress, so
+``GET /api/jobs/{id}`` can return partial results while the job runs.
+
+Jobs survive restarts. A worker records its host and refreshes a heartbeat
+while it runs a job. A running job whose heartbeat is older than
+``HEARTBEAT_TIMEOUT_INTERVALS`` intervals is queued again, and resumes after
+its last committed unit; so is one whose worker process has exited on the
+same host. Jobs of live workers on other hosts sharing the database file are
+left alone. Workers recover jobs at startup and then once per timeout. A worker
+that is shut down cleanly queues its job again itself. Every write of a worker
+checks that the job is still running under its pid and host; a worker whose job
+was reclaimed in the meantime stops working on it without writing anything.
+
+Cancelling a queued job takes effect immediately. A running job stops at the
+next unit boundary or progress report, and keeps its partial results.
+
+Configuration:
+
+- ``REALESTIMATE_JOBS_DB``: database path (default ``realestimate-jobs.sqlite3``
+  in the working directory).
+- ``REALESTIMATE_JOB_WORKERS``: worker processes started with each server
+  process (default 1; 0 leaves the jobs to ``python jobs.py``, which starts one
+  worker per CPU unless this is set).
+- ``REALESTIMATE_JOB_POLL_INTERVAL``: seconds an idle worker waits between
+  polls (default 0.5).
+- ``REALESTIMATE_JOB_HEARTBEAT_INTERVAL``: seconds between the heartbeats of a
+  busy worker (default 5).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+JOB_BATCH = 'batch'
+JOB_MONTE_CARLO = 'monte_carlo'
+JOB_SENSITIVITY = 'sensitivity'
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+
+DEFAULT_DB_PATH = 'realestimate-jobs.sqlite3'
+DEFAULT_SERVER_WORKERS = 1
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_HEARTBEAT_INTERVAL = 5.0
+# Heartbeat intervals without a heartbeat after which a running job is reclaimed
+HEARTBEAT_TIMEOUT_INTERVALS = 6
+SHUTDOWN_TIMEOUT = 5.0
+SENSITIVITY_ROWS_PER_UNIT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    worker_host TEXT,
+    heartbeat_at REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_units (
+    job_id TEXT NOT NULL,
+    unit INTEGER NOT NULL,
+    items TEXT NOT NULL,
+    PRIMARY KEY (job_id, unit)
+);
+"""
+# Columns added after the first release, added to existing databases on open
+MIGRATIONS = (
+    ('worker_host', 'ALTER TABLE jobs ADD COLUMN worker_host TEXT'),
+    ('heartbeat_at', 'ALTER TABLE jobs ADD COLUMN heartbeat_at REAL'),
+)
+# Matches a job still running under one worker; parameters (id, status, worker_pid, worker_host)
+_OWNED = 'id = ? AND status = ? AND worker_pid = ? AND worker_host = ?'
+
+# Item range [start, stop) of one unit of work
+UnitRange = Tuple[int, int]
+
+
+class JobNotFound(LookupError):
+    """Raised when no job has the requested id."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when cancellation of its job was requested."""
+
+
+class WorkerStopping(Exception):
+    """Raised inside a worker when it is asked to stop before the job is done."""
+
+
+class JobLost(Exception):
+    """Raised inside a worker when its job is no longer running under it, e.g. after recovery."""
+
+
+class JobKind(NamedTuple):
+    """How a kind of job is validated, split into units, executed and assembled."""
+    # Validate the request parameters and build the execution state
+    prepare: Callable[[Dict[str, Any]], Any]
+    # Item ranges of the units; progress is counted in items
+    units: Callable[[Any], List[UnitRange]]
+    # Execute one unit, reporting the items done so far within it; returns the unit's items
+    run_unit: Callable[[Any, int, int, Callable[[int], None]], List[Any]]
+    # Assemble the final result from the items of all units, in order
+    finish: Callable[[Any, List[Any]], Dict[str, Any]]
+
+
+def _chunk_ranges(total: int, size: int) -> List[UnitRange]:
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _prepare_batch(params: Dict[str, Any]) -> Dict[str, Any]:
+    from calculations import batch
+    engine = params.get('engine') or batch.ENGINE_DECIMAL
+    backend = batch.validate_batch(params['scenarios'], engine, params.get('backend'))
+    return {'records': params['scenarios'], 'engine': engine, 'backend': backend}
+
+
+def _batch_units(state: Dict[str, Any]) -> List[UnitRange]:
+    from calculations.batch import BATCH_CHUNK_SIZE
+    return _chunk_ranges(len(state['records']), BATCH_CHUNK_SIZE)
+
+
+def _run_batch_unit(state: Dict[str, Any], start: int, stop: int, progress: Callable[[int], None]) -> List[Any]:
+    from calculations import batch
+    return batch.evaluate_records(state['records'], start, stop, state['engine'], state['backend'])
+
+
+def _finish_batch(state: Dict[str, Any], items: List[Any]) -> Dict[str, Any]:
+    return {
+        'count': len(items),
+        'error_count': sum(1 for item in items if 'error' in item),
+        'results': items
+    }
+
+
+def _prepare_monte_carlo(params: Dict[str, Any]) -> Any:
+    from calculations.monte_carlo import params_from_request
+    return params_from_request(params)
+
+
+def _monte_carlo_units(state: Any) -> List[UnitRange]:
+    return [(0, state.paths)]
+
+
+def _run_monte_carlo_unit(state: Any, start: int, stop: int, progress: Callable[[int], None]) -> List[Any]:
+    from calculations.monte_carlo import MonteCarloSimulation, result_to_dict
+    return [result_to_dict(MonteCarloSimulation.run(state, progress=progress))]
+
+
+def _finish_monte_carlo(state: Any, items: List[Any]) -> Dict[str, Any]:
+    return items[0]
+
+
+def _prepare_sensitivity(params: Dict[str, Any]) -> Dict[str, Any]:
+    from calculations import batch, sensitivity
+    x, y = params['x'], params['y']
+    if x['dimension'] == y['dimension']:
+        raise ValueError("The two grid dimensions must differ")
+    batch.parse_scenario(params['scenario'], allow_tiers=False)
+    return {
+        'scenario': params['scenario'],
+        'x_dimension': x['dimension'],
+        'x_values': sensitivity.axis_values(x['dimension'], x['start'], x['stop'], x.get('steps', 50)),
+        'y_dimension': y['dimension'],
+        'y_values': sensitivity.axis_values(y['dimension'], y['start'], y['stop'], y.get('steps', 50))
+    }
+
+
+def _sensitivity_units(state: Dict[str, Any]) -> List[UnitRange]:
+    return _chunk_ranges(len(state['y_values']), SENSITIVITY_ROWS_PER_UNIT)
+
+
+def _run_sensitivity_unit(state: Dict[str, Any], start: int, stop: int, progress: Callable[[int], None]) -> List[Any]:
+    from calculations import sensitivity
+    grid = sensitivity.sensitivity_grid(state['scenario'], state['x_dimension'], state['x_values'],
+                                        state['y_dimension'], state['y_values'][start:stop])
+    return sensitivity.grid_to_dict(grid)['net_benefit_buying']
+
+
+def _finish_sensitivity(state: Dict[str, Any], items: List[Any]) -> Dict[str, Any]:
+    return {
+        'x': {'dimension': state['x_dimension'], 'values': state['x_values'].tolist()},
+        'y': {'dimension': state['y_dimension'], 'values': state['y_values'].tolist()},
+        'net_benefit_buying': items
+    }
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    JOB_BATCH: JobKind(_prepare_batch, _batch_units, _run_batch_unit, _finish_batch),
+    JOB_MONTE_CARLO: JobKind(_prepare_monte_carlo, _monte_carlo_units, _run_monte_carlo_unit, _finish_monte_carlo),
+    JOB_SENSITIVITY: JobKind(_prepare_sensitivity, _sensitivity_units, _run_sensitivity_unit, _finish_sensitivity),
+}
+
+
+def get_kind(kind: str) -> JobKind:
+    """Return the job kind called ``kind``.
+
+    Raises:
+        ValueError: If no job kind has that name.
+    """
+    try:
+        return JOB_KINDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown job kind '{kind}', expected one of {', '.join(JOB_KINDS)}")
+
+
+def _host_id() -> str:
+    """Identify this host and boot, so that pids are only compared within one boot."""
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as boot_id:
+            return f"{socket.gethostname()}/{boot_id.read().strip()}"
+    except OSError:
+        return socket.gethostname()
+
+
+HOST_ID = _host_id()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """Jobs, their progress and their results in a SQLite database.
+
+    Every call opens its own connection, so a store can be shared between
+    threads; workers keep one store per process.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode; multi-statement changes use explicit transactions,
+        # which closing the connection rolls back if they were not committed
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.row_factory = sqlite3.Row
+            if not self._initialized:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.executescript(SCHEMA)
+                columns = {row['name'] for row in connection.execute('PRAGMA table_info(jobs)')}
+                for column, statement in MIGRATIONS:
+                    if column not in columns:
+                        connection.execute(statement)
+                self._initialized = True
+            yield connection
+        finally:
+            connection.close()
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a job and queue it; returns its status.
+
+        Raises:
+            ValueError: If the kind is unknown or the parameters are invalid.
+        """
+        job_kind = get_kind(kind)
+        units = job_kind.units(job_kind.prepare(params))
+        job_id = uuid.uuid4().hex
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT INTO jobs (id, kind, params, status, progress_total, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(params), STATUS_QUEUED, units[-1][1] if units else 0, time.time()))
+        return self.get(job_id, include_results=False)
+
+    def get(self, job_id: str, include_results: bool = True) -> Dict[str, Any]:
+        """Return the status of a job, with its result or the partial results so far.
+
+        Raises:
+            JobNotFound: If no job has that id.
+        """
+        with self._connect() as connection:
+            row = connection.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                raise JobNotFound(job_id)
+            total = row['progress_total']
+            job = {
+                'id': row['id'],
+                'kind': row['kind'],
+                'status': row['status'],
+                'progress': {
+                    'done': row['progress_done'],
+                    'total': total,
+                    'fraction': row['progress_done'] / total if total else 1.0
+                },
+                'cancel_requested': bool(row['cancel_requested']),
+                'created_at': row['created_at'],
+                'started_at': row['started_at'],
+                'finished_at': row['finished_at'],
+                'error': row['error']
+            }
+            if include_results:
+                if row['status'] == STATUS_SUCCEEDED:
+                    job['result'] = json.loads(row['result'])
+                else:
+                    job['partial_results'] = self._unit_items(connection, job_id)
+        return job
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued job, or ask the worker running it to stop; returns its status.
+
+        Finished jobs are left unchanged.
+
+        Raises:
+            JobNotFound: If no job has that id.
+        """
+        with self._connect() as connection:
+            cancelled = connection.execute(
+                'UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ? AND status = ?',
+                (STATUS_CANCELLED, time.time(), job_id, STATUS_QUEUED)).rowcount
+            if not cancelled:
+                connection.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?',
+                                   (job_id, STATUS_RUNNING))
+        return self.get(job_id, include_results=False)
+
+    def recover(self, heartbeat_timeout: float, stale_pid: Optional[int] = None, host: str = HOST_ID) -> int:
+        """Queue again the running jobs whose worker is gone; returns how many.
+
+        A worker is gone when its last heartbeat is older than
+        ``heartbeat_timeout`` seconds or, on this ``host``, when its process has
+        exited. A new worker passes its own pid as ``stale_pid``: jobs recorded
+        under it on this host belong to an earlier process that had the same pid.
+        """
+        stale_before = time.time() - heartbeat_timeout
+        with self._connect() as connection:
+            rows = connection.execute('SELECT id, worker_pid, worker_host, heartbeat_at FROM jobs WHERE status = ?',
+                                      (STATUS_RUNNING,)).fetchall()
+            recovered = 0
+            for row in rows:
+                pid = row['worker_pid']
+                local = row['worker_host'] == host
+                if ((row['heartbeat_at'] or 0) < stale_before
+                        or local and (pid is None or pid == stale_pid or not _pid_alive(pid))):
+                    # Matching the heartbeat too leaves a job alone if its worker was just slow
+                    recovered += connection.execute(
+                        'UPDATE jobs SET status = ?, worker_pid = NULL, worker_host = NULL, heartbeat_at = NULL '
+                        'WHERE id = ? AND status = ? AND worker_pid IS ? AND worker_host IS ? AND heartbeat_at IS ?',
+                        (STATUS_QUEUED, row['id'], STATUS_RUNNING, pid, row['worker_host'],
+                         row['heartbeat_at'])).rowcount
+        return recovered
+
+    def claim(self, worker_pid: int, host: str = HOST_ID) -> Optional[sqlite3.Row]:
+        """Mark the oldest queued job as running in ``worker_pid`` on ``host`` and return it, as claimed."""
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                                     (STATUS_QUEUED,)).fetchone()
+            if row is not None:
+                now = time.time()
+                connection.execute(
+                    'UPDATE jobs SET status = ?, worker_pid = ?, worker_host = ?, heartbeat_at = ?, '
+                    'started_at = COALESCE(started_at, ?) WHERE id = ?',
+                    (STATUS_RUNNING, worker_pid, host, now, now, row['id']))
+                row = connection.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone()
+            connection.execute('COMMIT')
+        return row
+
+    def heartbeat(self, job_id: str, worker_pid: int, host: str = HOST_ID) -> bool:
+        """Record that the worker running a job is still alive; returns False if the job is no longer its own."""
+        with self._connect() as connection:
+            return bool(connection.execute(
+                'UPDATE jobs SET heartbeat_at = ? WHERE ' + _OWNED,
+                (time.time(), job_id, STATUS_RUNNING, worker_pid, host)).rowcount)
+
+    def completed_units(self, job_id: str) -> Dict[int, List[Any]]:
+        """Return the items of the units already committed, by unit index."""
+        with self._connect() as connection:
+            rows = connection.execute('SELECT unit, items FROM job_units WHERE job_id = ?', (job_id,)).fetchall()
+        return {row['unit']: json.loads(row['items']) for row in rows}
+
+    def save_unit(self, job_id: str, unit: int, items: List[Any], done: int, worker_pid: int,
+                  host: str = HOST_ID) -> bool:
+        """Commit the items of a finished unit and the job's progress; returns True if cancellation was requested.
+
+        Raises:
+            JobLost: If the job is no longer running under ``worker_pid`` on ``host``.
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            if not connection.execute('UPDATE jobs SET progress_done = ?, heartbeat_at = ? WHERE ' + _OWNED,
+                                      (done, time.time(), job_id, STATUS_RUNNING, worker_pid, host)).rowcount:
+                connection.execute('ROLLBACK')
+                raise JobLost(job_id)
+            connection.execute('INSERT OR REPLACE INTO job_units (job_id, unit, items) VALUES (?, ?, ?)',
+                               (job_id, unit, json.dumps(items)))
+            connection.execute('COMMIT')
+            return self._cancel_requested(connection, job_id)
+
+    def set_progress(self, job_id: str, done: int, worker_pid: int, host: str = HOST_ID) -> bool:
+        """Record progress within a unit; returns True if cancellation was requested.
+
+        Raises:
+            JobLost: If the job is no longer running under ``worker_pid`` on ``host``.
+        """
+        with self._connect() as connection:
+            if not connection.execute('UPDATE jobs SET progress_done = ?, heartbeat_at = ? WHERE ' + _OWNED,
+                                      (done, time.time(), job_id, STATUS_RUNNING, worker_pid, host)).rowcount:
+                raise JobLost(job_id)
+            return self._cancel_requested(connection, job_id)
+
+    def finish(self, job_id: str, status: str, worker_pid: int, host: str = HOST_ID,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """Record the outcome of a job. A successful job keeps only its final result.
+
+        Raises:
+            JobLost: If the job is no longer running under ``worker_pid`` on ``host``.
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            if not connection.execute(
+                    'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, '
+                    'worker_pid = NULL, worker_host = NULL, heartbeat_at = NULL WHERE ' + _OWNED,
+                    (status, json.dumps(result) if result is not None else None, error, time.time(),
+                     job_id, STATUS_RUNNING, worker_pid, host)).rowcount:
+                connection.execute('ROLLBACK')
+                raise JobLost(job_id)
+            if status == STATUS_SUCCEEDED:
+                connection.execute('DELETE FROM job_units WHERE job_id = ?', (job_id,))
+            connection.execute('COMMIT')
+
+    def release(self, job_id: str, worker_pid: int, host: str = HOST_ID) -> None:
+        """Queue a job running under ``worker_pid`` on ``host`` again, keeping its committed units."""
+        with self._connect() as connection:
+            connection.execute('UPDATE jobs SET status = ?, worker_pid = NULL, worker_host = NULL, heartbeat_at = NULL '
+                               'WHERE ' + _OWNED, (STATUS_QUEUED, job_id, STATUS_RUNNING, worker_pid, host))
+
+    @staticmethod
+    def _cancel_requested(connection: sqlite3.Connection, job_id: str) -> bool:
+        row = connection.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row['cancel_requested'])
+
+    @staticmethod
+    def _unit_items(connection: sqlite3.Connection, job_id: str) -> List[Any]:
+        rows = connection.execute('SELECT items FROM job_units WHERE job_id = ? ORDER BY unit', (job_id,)).fetchall()
+        return [item for row in rows for item in json.loads(row['items'])]
+
+
+def execute_job(store: JobStore, job: sqlite3.Row, should_stop: Callable[[], bool]) -> Optional[str]:
+    """Run a job, as returned by ``claim``, to completion, cancellation or shutdown; returns its final status.
+
+    Returns None, leaving the job untouched, if it stopped running under the
+    worker that claimed it (for instance because it was recovered meanwhile).
+    """
+    job_id = job['id']
+    owner = (job['worker_pid'], job['worker_host'])
+
+    def check(cancel_requested: bool) -> None:
+        if cancel_requested:
+            raise JobCancelled(job_id)
+        if should_stop():
+            raise WorkerStopping(job_id)
+
+    try:
+        try:
+            kind = get_kind(job['kind'])
+            state = kind.prepare(json.loads(job['params']))
+            completed = store.completed_units(job_id)
+            for unit, (start, stop) in enumerate(kind.units(state)):
+                if unit in completed:
+                    continue
+                check(False)
+                items = kind.run_unit(state, start, stop,
+                                      lambda done, start=start: check(store.set_progress(job_id, start + done, *owner)))
+                completed[unit] = items
+                check(store.save_unit(job_id, unit, items, stop, *owner))
+            result = kind.finish(state, [item for unit in sorted(completed) for item in completed[unit]])
+        except (JobCancelled, WorkerStopping, JobLost):
+            raise
+        except Exception as e:
+            store.finish(job_id, STATUS_FAILED, *owner, error=f"{type(e).__name__}: {e}")
+            return STATUS_FAILED
+        store.finish(job_id, STATUS_SUCCEEDED, *owner, result=result)
+        return STATUS_SUCCEEDED
+    except JobCancelled:
+        store.finish(job_id, STATUS_CANCELLED, *owner)
+        return STATUS_CANCELLED
+    except WorkerStopping:
+        store.release(job_id, *owner)
+        return STATUS_QUEUED
+    except JobLost:
+        # Another worker may already be running the job; leave it to that worker
+        return None
+
+
+def run_worker(path: str, stop_event: Any, poll_interval: float = DEFAULT_POLL_INTERVAL,
+               heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL) -> None:
+    """Worker process loop: claim and execute jobs until ``stop_event`` is set.
+
+    A thread refreshes the heartbeat of the running job every
+    ``heartbeat_interval`` seconds, so long units do not look abandoned.
+    """
+    # Ctrl+C reaches the whole process group; the parent stops workers through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent_pid = os.getppid()
+
+    def should_stop() -> bool:
+        # A killed server cannot set stop_event; its workers must not outlive it
+        return stop_event.is_set() or os.getppid() != parent_pid
+
+    store = JobStore(path)
+    pid = os.getpid()
+    heartbeat_timeout = heartbeat_interval * HEARTBEAT_TIMEOUT_INTERVALS
+    running: List[str] = []
+
+    def beat() -> None:
+        while not stop_event.wait(heartbeat_interval):
+            for job_id in list(running):
+                store.heartbeat(job_id, pid)
+
+    threading.Thread(target=beat, name='job-heartbeat', daemon=True).start()
+    store.recover(heartbeat_timeout, stale_pid=pid)
+    next_recovery = time.monotonic() + heartbeat_timeout
+    while not should_stop():
+        if time.monotonic() >= next_recovery:
+            store.recover(heartbeat_timeout)
+            next_recovery = time.monotonic() + heartbeat_timeout
+        job = store.claim(pid)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        running.append(job['id'])
+        try:
+            execute_job(store, job, should_stop)
+        finally:
+            running.clear()
+
+
+class JobWorkerPool:
+    """Worker processes executing the jobs of one database."""
+
+    def __init__(self, path: str, workers: int = 0, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        # Spawned rather than forked: the server process runs threads
+        self._context = multiprocessing.get_context('spawn')
+        self._stop_event = None
+        self._processes: List[Any] = []
+
+    def start(self) -> None:
+        """Start the worker processes (no-op without workers or if already started)."""
+        if self._processes or self.workers <= 0:
+            return
+        self._stop_event = self._context.Event()
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=run_worker, args=(self.path, self._stop_event, self.poll_interval, self.heartbeat_interval),
+                name='realestimate-job-worker', daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Ask the workers to stop after their current unit; terminate those that do not in time.
+
+        Jobs of terminated workers are queued again by the next worker's ``recover``.
+        """
+        if not self._processes:
+            return
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+
+store = JobStore(os.environ.get('REALESTIMATE_JOBS_DB', DEFAULT_DB_PATH))
+pool = JobWorkerPool(
+    store.path,
+    workers=int(os.environ.get('REALESTIMATE_JOB_WORKERS', DEFAULT_SERVER_WORKERS)),
+    poll_interval=float(os.environ.get('REALESTIMATE_JOB_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)),
+    heartbeat_interval=float(os.environ.get('REALESTIMATE_JOB_HEARTBEAT_INTERVAL', DEFAULT_HEARTBEAT_INTERVAL))
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run job workers without the web server")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('REALESTIMATE_JOB_WORKERS', 0)) or os.cpu_count() or 1,
+                        help="Worker processes (default: $REALESTIMATE_JOB_WORKERS, else the CPU count)")
+    parser.add_argument('--db', default=store.path, help="Job database path")
+    args = parser.parse_args()
+
+    worker_pool = JobWorkerPool(args.db, workers=args.workers, poll_interval=pool.poll_interval,
+                                heartbeat_interval=pool.heartbeat_interval)
+    print(f"Running {worker_pool.workers} job workers on {worker_pool.path}")
+    worker_pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        worker_pool.stop()
+
+
+if __name__ == '__main__':
+    main()
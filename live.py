@@ -0,0 +1,141 @@
+"""
+Live recalculation sessions for the results page.
+
+In live mode the results page keeps a WebSocket open to ``/ws/live`` and sends
+the form fields whenever the user edits them, as
+``{"seq": <int>, "params": {...}}``. Each connection is served by a
+``LiveSession``:
+
+- Updates are debounced. A calculation starts once no newer update arrived for
+  ``debounce`` seconds, or at the latest ``max_delay`` seconds after the first
+  waiting update, so a continuous drag still refreshes. Only the latest update
+  is calculated.
+- A connection has one calculation at a time. Work handed to an executor
+  cannot be interrupted, so an update arriving during a calculation waits for
+  it to finish; its result is then discarded and the latest update is
+  calculated next. A connection therefore never holds more than one executor
+  slot.
+- Results are sent as deltas against the previous result of the connection:
+  ``{"type": "result", "seq", "totals", "years", "yearly", "server_ms"}`` with
+  only the totals and yearly summary columns that changed. Failed updates get
+  ``{"type": "error", "seq", "detail"}`` and leave the previous result in place.
+
+``REALESTIMATE_LIVE_DEBOUNCE`` sets the debounce in seconds (default 0.015)
+and ``REALESTIMATE_LIVE_MAX_DELAY`` the longest delay (default 0.1).
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_DEBOUNCE = 0.015
+DEFAULT_MAX_DELAY = 0.1
+MAX_MESSAGE_BYTES = 16384
+DEBOUNCE = float(os.environ.get('REALESTIMATE_LIVE_DEBOUNCE', DEFAULT_DEBOUNCE))
+MAX_DELAY = float(os.environ.get('REALESTIMATE_LIVE_MAX_DELAY', DEFAULT_MAX_DELAY))
+
+# A calculated result: {'totals': {name: value}, 'yearly': {column: [value per year]}}
+LiveResult = Dict[str, Dict[str, Any]]
+
+
+def delta(previous: Optional[LiveResult], current: LiveResult) -> Dict[str, Any]:
+    """Return the totals and yearly columns of ``current`` that differ from ``previous``."""
+    yearly = current['yearly']
+    years = len(next(iter(yearly.values()), []))
+    if previous is None:
+        return {'totals': dict(current['totals']), 'years': years, 'yearly': dict(yearly)}
+    totals = {name: value for name, value in current['totals'].items() if previous['totals'].get(name) != value}
+    changed = {name: values for name, values in yearly.items() if previous['yearly'].get(name) != values}
+    return {'totals': totals, 'years': years, 'yearly': changed}
+
+
+class LiveSession:
+    """Debounces the updates of one connection and sends result deltas."""
+
+    def __init__(self, calculate: Callable[[Dict[str, Any]], Awaitable[LiveResult]],
+                 send: Callable[[Dict[str, Any]], Awaitable[None]],
+                 debounce: float = DEBOUNCE, max_delay: float = MAX_DELAY):
+        self._calculate = calculate
+        self._send = send
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self._latest: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._changed = asyncio.Event()
+        self._previous: Optional[LiveResult] = None
+        self.updates = 0
+        self.calculations = 0
+        self.superseded = 0
+
+    async def receive(self, text: str) -> None:
+        """Handle one message from the client."""
+        try:
+            if len(text) > MAX_MESSAGE_BYTES:
+                raise ValueError("Message is too large")
+            message = json.loads(text)
+            if not isinstance(message, dict) or not isinstance(message.get('params'), dict):
+                raise ValueError("Expected an object with 'seq' and 'params'")
+            seq = message.get('seq')
+            if not isinstance(seq, int) or isinstance(seq, bool):
+                raise ValueError("'seq' must be an integer")
+        except ValueError as e:
+            await self._send({'type': 'error', 'seq': None, 'detail': str(e)})
+            return
+        self.updates += 1
+        self._latest = (seq, message['params'])
+        self._changed.set()
+
+    async def _settle(self) -> None:
+        # Wait until updates pause for `debounce`, but no longer than `max_delay`
+        deadline = time.perf_counter() + self.max_delay
+        while True:
+            self._changed.clear()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(self.debounce, remaining))
+            except asyncio.TimeoutError:
+                return
+
+    async def run(self) -> None:
+        """Calculate and send results until cancelled."""
+        while True:
+            await self._changed.wait()
+            await self._settle()
+            seq, params = self._latest
+            started = time.perf_counter()
+            calculation = asyncio.ensure_future(self._calculate(params))
+            try:
+                await asyncio.wait((calculation,))
+            finally:
+                # Closing the connection drops a calculation that has not started yet
+                if not calculation.done():
+                    calculation.cancel()
+            if self._changed.is_set():
+                # The newer update is calculated on the next iteration
+                if not calculation.cancelled():
+                    calculation.exception()  # Retrieved so a dropped failure is not reported
+                self.superseded += 1
+                continue
+            try:
+                result = calculation.result()
+            except ValueError as e:
+                await self._send({'type': 'error', 'seq': seq, 'detail': str(e)})
+                continue
+            except Exception as e:
+                import traceback
+                print(f"Error in live calculation: {e}\n{traceback.format_exc()}")
+                await self._send({'type': 'error', 'seq': seq, 'detail': "An error occurred during calculation"})
+                continue
+            self.calculations += 1
+            message = {'type': 'result', 'seq': seq, **delta(self._previous, result),
+                       'server_ms': round((time.perf_counter() - started) * 1000, 2)}
+            self._previous = result
+            await self._send(message)
+
+
+def columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Turn a list of row dicts into a dict of columns."""
+    return {name: [row[name] for row in rows] for name in (rows[0] if rows else ())}
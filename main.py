@@ -3,13 +3,18 @@ Main application module for the RealEstimate CLI interface.
 
 This script demonstrates the mortgage vs. rent comparison functionality using 
 the updated calculation modules with improved numerical precision and algorithms.
+With ``--input`` it evaluates a CSV file of listings instead (see
+calculations.bulk). ``--profile PREFIX`` profiles either run (see profiling).
 """
 
+import argparse
+import os
+import sys
 from decimal import Decimal, getcontext
-import uvicorn
-from app import app
 from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
-from calculations.comparison import MortgageComparison, ComparisonParams
+from calculations.comparison import MortgageComparison, ComparisonParams, ENGINE_DECIMAL, ENGINES
+from calculations import bulk
+import profiling
 
 # Set precision for financial calculations
 getcontext().prec = 28
@@ -28,8 +33,7 @@ def run_cli_demo():
             property_price=Decimal('750000000'),  # IDR
             down_payment_percentage=Decimal('0.20'),
             interest_rate_first_period=Decimal('0.0792'),
-            interest_rate_subsequent_min=Decimal('0.12'),
-            interest_rate_subsequent_max=Decimal('0.12'),
+            interest_rate_subsequent=Decimal('0.12'),
             mortgage_term_years=5,  # Longer term for more realistic analysis
             fixed_interest_duration_years=3  # Some fixed period followed by variable
         )
@@ -57,25 +61,23 @@ def run_cli_demo():
         
         print("\n----- PAYMENT DETAILS -----")
         print(f"Monthly Payment (First {mortgage_params.fixed_interest_duration_years} years): {format_currency(mortgage_payments.monthly_payment_first_period)}")
-        print(f"Monthly Payment (After fixed period): {format_currency(mortgage_payments.monthly_payment_subsequent_min)} to {format_currency(mortgage_payments.monthly_payment_subsequent_max)}")
+        print(f"Monthly Payment (After fixed period): {format_currency(mortgage_payments.monthly_payment_subsequent)}")
         
         print("\n----- TOTAL COSTS -----")
         print(f"Total Principal Paid: {format_currency(comparison_result.total_principal_paid)}")
-        print(f"Total Interest Paid: {format_currency(comparison_result.total_interest_paid_min)} to {format_currency(comparison_result.total_interest_paid_max)}")
-        print(f"Total Mortgage Cost: {format_currency(comparison_result.total_mortgage_cost_min)} to {format_currency(comparison_result.total_mortgage_cost_max)}")
+        print(f"Total Interest Paid: {format_currency(comparison_result.total_interest_paid)}")
+        print(f"Total Mortgage Cost: {format_currency(comparison_result.total_mortgage_cost)}")
         print(f"Total Rent Cost: {format_currency(comparison_result.total_rent_cost)}")
-        print(f"Investment Growth (if renting): {format_currency(comparison_result.total_investment_growth_min)} to {format_currency(comparison_result.total_investment_growth_max)}")
+        print(f"Investment Growth (if renting): {format_currency(comparison_result.total_investment_growth)}")
         
         print("\n----- BUYING VS. RENTING COMPARISON -----")
-        print(f"Net Benefit of Buying: {format_currency(comparison_result.net_benefit_buying_min)} to {format_currency(comparison_result.net_benefit_buying_max)}")
+        print(f"Net Benefit of Buying: {format_currency(comparison_result.net_benefit_buying)}")
         
         # Display results with recommendation
-        if comparison_result.is_buying_cheaper_min and comparison_result.is_buying_cheaper_max:
-            print("\nCONCLUSION: Buying is more economical in all scenarios.")
-        elif not comparison_result.is_buying_cheaper_min and not comparison_result.is_buying_cheaper_max:
-            print("\nCONCLUSION: Renting is more economical in all scenarios.")
+        if comparison_result.is_buying_cheaper:
+            print("\nCONCLUSION: Buying is more economical.")
         else:
-            print("\nCONCLUSION: The outcome depends on future interest rates and investment returns.")
+            print("\nCONCLUSION: Renting is more economical.")
         
         # Optional detailed monthly output (only first few months)
         print_monthly_details = False
@@ -85,11 +87,11 @@ def run_cli_demo():
             for i in range(display_months):
                 mc = comparison_result.monthly_comparison[i]
                 print(f"\nMonth {mc.month}:")
-                print(f"  Monthly Mortgage Payment: {format_currency(mc.monthly_mortgage_payment_min)} to {format_currency(mc.monthly_mortgage_payment_max)}")
-                print(f"  Principal: {format_currency(mc.principal_for_the_month_min)} to {format_currency(mc.principal_for_the_month_max)}")
-                print(f"  Interest: {format_currency(mc.interest_for_the_month_min)} to {format_currency(mc.interest_for_the_month_max)}")
+                print(f"  Monthly Mortgage Payment: {format_currency(mc.monthly_mortgage_payment)}")
+                print(f"  Principal: {format_currency(mc.principal_for_the_month)}")
+                print(f"  Interest: {format_currency(mc.interest_for_the_month)}")
                 print(f"  Monthly Rent: {format_currency(mc.monthly_rent)}")
-                print(f"  Investment Growth: {format_currency(mc.cumulative_investment_min)} to {format_currency(mc.cumulative_investment_max)}")
+                print(f"  Investment Growth: {format_currency(mc.cumulative_investment)}")
     
     except ValueError as e:
         print(f"Error in calculation: {e}")
@@ -97,12 +99,83 @@ def run_cli_demo():
         print(f"Unexpected error: {e}")
 
 
+def run_bulk(args):
+    """Evaluate a CSV file of listings and write one result row per listing."""
+    output_format = args.format or (bulk.FORMAT_NDJSON if args.output.endswith(('.ndjson', '.jsonl')) else bulk.FORMAT_CSV)
+    source = sys.stdin if args.input == "-" else open(args.input, newline="")
+    destination = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        summary = bulk.evaluate_file(
+            source, destination, engine=args.engine, backend=args.backend, output_format=output_format,
+            processes=args.processes, chunk_size=args.chunk_size, id_column=args.id_column,
+            progress=None if args.quiet else sys.stderr)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if destination is not sys.stdout:
+            destination.close()
+    if not args.quiet:
+        print(f"Evaluated {summary.rows:,} listings ({summary.errors:,} errors) in {summary.seconds:.1f}s, "
+              f"{summary.rows_per_second:,.0f} rows/s", file=sys.stderr)
+    return 0
+
+
+def run_profiled(func, prefix):
+    """Run ``func()`` under the profiler and write the profile files next to ``prefix``."""
+    result, stats, stacks = profiling.capture(func)
+    profile = profiling.Profile()
+    profile.add(stats, stacks)
+    paths = profile.save(prefix)
+    print(f"Profile written to {', '.join(paths)}", file=sys.stderr)
+    return result
+
+
+def parse_args():
+    """Parse command line options for the web server, the CLI demo and bulk evaluation."""
+    parser = argparse.ArgumentParser(description="RealEstimate mortgage vs. rent calculator")
+    parser.add_argument("--cli", action="store_true", help="Run the CLI demonstration instead of the web server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", 1)),
+                        help="Number of uvicorn worker processes (default: $WEB_CONCURRENCY or 1)")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="Profile the CLI demo or bulk run and write PREFIX.prof, PREFIX.txt and PREFIX.collapsed")
+
+    bulk_options = parser.add_argument_group("bulk evaluation", "Evaluate a CSV of listings instead of serving the app")
+    bulk_options.add_argument("--input", metavar="PATH", help="CSV of listings with the /api/batch field names ('-' for stdin)")
+    bulk_options.add_argument("--output", metavar="PATH", default="-", help="Results file (default: stdout)")
+    bulk_options.add_argument("--format", choices=bulk.OUTPUT_FORMATS,
+                              help="Output format (default: ndjson for .ndjson/.jsonl outputs, else csv)")
+    bulk_options.add_argument("--engine", default=ENGINE_DECIMAL, choices=ENGINES,
+                              help="numpy evaluates whole chunks in closed form, much faster for large files")
+    bulk_options.add_argument("--backend", help="Numeric backend of the decimal engine")
+    bulk_options.add_argument("--processes", type=int, help="Worker processes (default: the CPU count)")
+    bulk_options.add_argument("--chunk-size", type=int, default=bulk.DEFAULT_CHUNK_SIZE,
+                              help=f"Rows per chunk (default: {bulk.DEFAULT_CHUNK_SIZE})")
+    bulk_options.add_argument("--id-column", help="Input column copied to every result row")
+    bulk_options.add_argument("--quiet", action="store_true", help="Do not print progress")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    # Determine if we should run the web app or CLI demo
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--cli":
+    # Determine if we should run the web app, a bulk evaluation or the CLI demo
+    args = parse_args()
+    if args.profile and not (args.input or args.cli):
+        sys.exit("Error: --profile needs --cli or --input; set REALESTIMATE_PROFILING=1 to profile web requests")
+    if args.profile and args.input and args.processes != 1:
+        # Worker processes are not profiled, so evaluate every chunk in this one
+        print("Profiling evaluates in a single process (--processes 1)", file=sys.stderr)
+        args.processes = 1
+    if args.input:
+        sys.exit(run_profiled(lambda: run_bulk(args), args.profile) if args.profile else run_bulk(args))
+    elif args.cli:
         # Run CLI demonstration
-        run_cli_demo()
+        run_profiled(run_cli_demo, args.profile) if args.profile else run_cli_demo()
     else:
-        # Start web application server
-        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+        # Start web application server; multiple workers need the app as an import string.
+        # uvicorn (and the app) are only imported here so the CLI starts quickly
+        import uvicorn
+        uvicorn.run("app:app", host=args.host, port=args.port, workers=args.workers)
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Request metrics in Prometheus text format, plus per-request Server-Timing headers.
+
+Enabled by setting ``REALESTIMATE_METRICS=1``. When enabled, ``MetricsMiddleware``
+counts requests by route and status code, tracks the number of requests in
+flight, and times every request. Handlers time their own stages (form parsing,
+payment calculation, comparison, rendering) with ``request_timer(request).stage(name)``.
+The durations are recorded into per-stage histograms and returned in a
+``Server-Timing`` response header.
+
+When disabled, the middleware is not installed and ``request_timer`` returns a
+shared no-op timer, so instrumented code only pays for one attribute lookup
+and an empty ``with`` block.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+METRICS_ENABLED = os.environ.get('REALESTIMATE_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; finer than the Prometheus defaults because most stages take well under 10 ms
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}"
+
+
+class Gauge(Counter):
+    metric_type = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative) ..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound:g}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative:g}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]:.9g}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative:g}"
+
+
+REQUESTS = Counter('realestimate_requests_total', "HTTP requests by route and status code.", ('route', 'status'))
+REQUEST_SECONDS = Histogram('realestimate_request_duration_seconds', "HTTP request duration by route.", ('route',))
+STAGE_SECONDS = Histogram('realestimate_stage_duration_seconds', "Duration of request handling stages.", ('stage',))
+IN_FLIGHT = Gauge('realestimate_requests_in_flight', "HTTP requests currently being handled.")
+REGISTRY = (REQUESTS, REQUEST_SECONDS, STAGE_SECONDS, IN_FLIGHT)
+
+
+def render() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    return '\n'.join(line for metric in REGISTRY for line in metric.collect()) + '\n'
+
+
+class _Stage:
+    __slots__ = ('_timer', '_name', '_started')
+
+    def __init__(self, timer: 'RequestTimer', name: str):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._timer.record(self._name, time.perf_counter() - self._started)
+
+
+class RequestTimer:
+    """Stage durations of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def stage(self, name: str) -> _Stage:
+        """Context manager timing one stage of the request."""
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+        STAGE_SECONDS.observe(seconds, name)
+
+    def server_timing(self) -> str:
+        """Format the recorded stages (and the total so far) as a Server-Timing header value."""
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return ', '.join(entries)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _NullTimer:
+    """Stand-in used when metrics are disabled; records nothing."""
+
+    __slots__ = ()
+    _stage = _NullStage()
+
+    def stage(self, name: str) -> _NullStage:
+        return self._stage
+
+    def record(self, name: str, seconds: float) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def request_timer(request: Any) -> Any:
+    """Return the timer attached to ``request`` by MetricsMiddleware, or the no-op timer."""
+    return request.scope.get('state', {}).get('metrics_timer', NULL_TIMER)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, durations, in-flight requests and Server-Timing."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        scope.setdefault('state', {})['metrics_timer'] = timer
+        status: Optional[int] = None
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', timer.server_timing().encode('latin-1')))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            IN_FLIGHT.dec()
+            # Label by route template, not the raw path, to keep the label set bounded
+            route = scope.get('route')
+            route_label = getattr(route, 'path', None) or 'unmatched'
+            REQUESTS.inc(route_label, str(status or 500))
+            REQUEST_SECONDS.observe(time.perf_counter() - timer.started, route_label)
@@ -0,0 +1,127 @@
+"""
+Bounded executor for CPU-bound request work.
+
+Calculations and template rendering run outside the event loop so a long
+comparison never delays other requests. The executor kind is selected with
+``REALESTIMATE_EXECUTOR``:
+
+- ``thread`` (default): a thread pool. The calculation still holds the GIL
+  while it runs, but the interpreter switches back to the event loop every few
+  milliseconds, so light requests are no longer queued behind heavy ones.
+- ``process``: a process pool, for true parallelism across cores. Work
+  functions and their arguments must be picklable.
+- ``inline``: run on the event loop, as before (no back-pressure).
+
+``REALESTIMATE_EXECUTOR_WORKERS`` sets the pool size (default: the CPU count)
+and ``REALESTIMATE_EXECUTOR_QUEUE`` the maximum number of tasks running or
+waiting per server process (default 64). Beyond that ``run`` raises
+``ExecutorSaturated`` so the caller can answer 503 instead of queueing without
+bound. A task keeps its slot until the pool has finished with it: cancelling
+the awaiting coroutine drops a task that has not started yet, but one already
+running holds its slot until it returns.
+
+When the request is being profiled (see ``profiling``), the work runs under
+``profiling.capture`` so the profile covers the pool thread or process too.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import profiling
+
+EXECUTOR_INLINE = 'inline'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+EXECUTOR_KINDS = (EXECUTOR_INLINE, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+DEFAULT_QUEUE_SIZE = 64
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the executor already holds its maximum number of tasks."""
+
+
+class BoundedExecutor:
+    """Executor wrapper limiting the number of tasks running or waiting at once."""
+
+    def __init__(self, kind: str = EXECUTOR_THREAD, max_workers: Optional[int] = None,
+                 max_pending: int = DEFAULT_QUEUE_SIZE):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor '{kind}', expected one of {', '.join(EXECUTOR_KINDS)}")
+        if max_pending <= 0:
+            raise ValueError("Executor queue size must be greater than 0")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        # Slots are released from pool threads when their task finishes
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == EXECUTOR_PROCESS:
+                # Spawn rather than fork: forking the threaded server could
+                # copy locks held by other threads into the worker
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='realestimate')
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` in the executor and return its result.
+
+        Raises:
+            ExecutorSaturated: If ``max_pending`` tasks are already running or waiting.
+        """
+        if self.kind == EXECUTOR_INLINE:
+            return func(*args)
+        profile = profiling.current() if profiling.PROFILING_ENABLED else None
+        task = functools.partial(func, *args)
+        if profile is not None:
+            task = functools.partial(profiling.capture, func, *args)
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorSaturated(f"Executor queue is full ({self.max_pending} tasks)")
+            self.pending += 1
+        try:
+            future = self._get_executor().submit(task)
+        except BaseException:
+            self._release(None)
+            raise
+        # Released by the pool's future, which outlives a cancelled await if the task already runs
+        future.add_done_callback(self._release)
+        result = await asyncio.wrap_future(future)
+        if profile is not None:
+            result, stats, stacks = result
+            profile.add(stats, stacks)
+        return result
+
+    def _release(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Shut down the underlying pool if it was started."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+executor = BoundedExecutor(
+    kind=os.environ.get('REALESTIMATE_EXECUTOR', EXECUTOR_THREAD),
+    max_workers=int(os.environ.get('REALESTIMATE_EXECUTOR_WORKERS', 0)) or None,
+    max_pending=int(os.environ.get('REALESTIMATE_EXECUTOR_QUEUE', DEFAULT_QUEUE_SIZE))
+)
+
+
+async def run(func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func(*args)`` on the shared executor; see ``BoundedExecutor.run``."""
+    return await executor.run(func, *args)
@@ -0,0 +1,313 @@
+"""
+On-demand profiling of single web requests and CLI runs.
+
+Web requests are profiled only when ``REALESTIMATE_PROFILING=1``. With it,
+``ProfilingMiddleware`` profiles requests that carry an ``X-Profile`` header
+or a ``profile`` query parameter:
+
+- ``1`` (or ``save``): the response is unchanged and carries an
+  ``X-Profile-Id`` header; the profile is saved under ``PROFILE_DIR`` and
+  served by ``/api/profiles/{id}/{report|collapsed|pstats}``.
+- ``report``: the response body is replaced by the sorted cProfile report
+  (``profile_sort`` picks the sort key, default ``cumulative``).
+- ``collapsed``: the response body is replaced by collapsed stacks for
+  flamegraph tools (``flamegraph.pl``, speedscope, inferno).
+
+Each profile combines a cProfile run, for the sortable report, with a stack
+sampler, for the collapsed stacks. Both cover the event loop thread and every
+``offload.run`` call made by the request, in whichever thread or process it
+runs. Work done on the event loop for concurrent requests is included too, so
+profile on an otherwise idle server. Profiled requests bypass single-flight
+coalescing (see ``singleflight``), so they always run their own calculation;
+one answered from the result cache still has little left to profile.
+
+When profiling is disabled the middleware is not installed and ``offload``
+skips the profiling hook after one flag check, so requests pay nothing.
+
+``main.py --profile PREFIX`` profiles a CLI run and writes ``PREFIX.prof``,
+``PREFIX.txt`` and ``PREFIX.collapsed``.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+PROFILING_ENABLED = os.environ.get('REALESTIMATE_PROFILING', '').lower() in ('1', 'true', 'yes', 'on')
+PROFILE_DIR = os.environ.get('REALESTIMATE_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'realestimate-profiles'))
+SAMPLE_INTERVAL = float(os.environ.get('REALESTIMATE_PROFILE_INTERVAL', 0.001))
+
+MODE_SAVE = 'save'
+MODE_REPORT = 'report'
+MODE_COLLAPSED = 'collapsed'
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls', 'time', 'name', 'filename')
+DEFAULT_SORT = 'cumulative'
+REPORT_LIMIT = 60
+PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+# Saved file of each profile output
+OUTPUT_SUFFIXES = {'pstats': '.prof', 'report': '.txt', 'collapsed': '.collapsed'}
+
+# cProfile statistics as produced by ``Profile.create_stats`` (picklable)
+StatsData = Dict[Tuple[str, int, str], Tuple]
+# Sampled stacks ("outer;inner" frame labels) and their sample counts
+StackCounts = Dict[str, int]
+
+
+class _StatsHolder:
+    """Adapts raw statistics to the interface ``pstats.Stats`` loads from."""
+
+    def __init__(self, stats: StatsData):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+_switch_lock = threading.Lock()
+_switch_users = 0
+_saved_switch_interval = 0.0
+
+
+def _shorten_switch_interval(interval: float) -> None:
+    # A sampler only runs when the sampled thread releases the GIL, at most
+    # every switch interval (5 ms by default)
+    global _switch_users, _saved_switch_interval
+    with _switch_lock:
+        if _switch_users == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(interval, _saved_switch_interval))
+        _switch_users += 1
+
+
+def _restore_switch_interval() -> None:
+    global _switch_users
+    with _switch_lock:
+        _switch_users -= 1
+        if _switch_users == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name='realestimate-profile-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.counts[';'.join(reversed(labels))] += 1
+
+    def stop(self) -> StackCounts:
+        self._stopped.set()
+        self.join()
+        return dict(self.counts)
+
+
+class Recorder:
+    """Profiles the calling thread between ``start`` and ``stop``."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self._profiler = cProfile.Profile()
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self) -> None:
+        _shorten_switch_interval(self.interval)
+        self._sampler = StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+        self._profiler.enable()
+
+    def stop(self) -> Tuple[StatsData, StackCounts]:
+        self._profiler.disable()
+        stacks = self._sampler.stop()
+        _restore_switch_interval()
+        self._profiler.create_stats()
+        return self._profiler.stats, stacks
+
+
+def capture(func: Callable[..., Any], *args: Any) -> Tuple[Any, StatsData, StackCounts]:
+    """Call ``func(*args)`` under a recorder; returns the result, its statistics and its stacks.
+
+    Module-level so it can be sent to a process pool.
+    """
+    recorder = Recorder()
+    recorder.start()
+    try:
+        result = func(*args)
+    finally:
+        stats, stacks = recorder.stop()
+    return result, stats, stacks
+
+
+class Profile:
+    """Statistics and sampled stacks collected for one request or CLI run."""
+
+    def __init__(self, profile_id: Optional[str] = None):
+        self.id = profile_id or uuid.uuid4().hex
+        self._stats: Optional[pstats.Stats] = None
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, stats: StatsData, stacks: StackCounts) -> None:
+        """Merge the statistics and stacks of one recorded thread."""
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(_StatsHolder(stats))
+            else:
+                self._stats.add(_StatsHolder(stats))
+            self.stacks.update(stacks)
+
+    def report(self, sort: str = DEFAULT_SORT, limit: int = REPORT_LIMIT) -> str:
+        """Return the cProfile report sorted by ``sort``."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}', expected one of {', '.join(SORT_KEYS)}")
+        if self._stats is None:
+            return "No profile data\n"
+        stream = io.StringIO()
+        self._stats.stream = stream
+        self._stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def collapsed(self) -> str:
+        """Return the sampled stacks in the collapsed format, one ``stack count`` line each."""
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def save(self, prefix: str) -> List[str]:
+        """Write ``prefix.prof`` (pstats), ``prefix.txt`` (report) and ``prefix.collapsed``; returns the paths."""
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        paths = [prefix + suffix for suffix in OUTPUT_SUFFIXES.values()]
+        if self._stats is not None:
+            self._stats.dump_stats(paths[0])
+        with open(paths[1], 'w') as f:
+            f.write(self.report())
+        with open(paths[2], 'w') as f:
+            f.write(self.collapsed())
+        return paths
+
+
+_current: ContextVar[Optional[Profile]] = ContextVar('realestimate_profile', default=None)
+
+
+def current() -> Optional[Profile]:
+    """Return the profile of the request being handled, if it is profiled."""
+    return _current.get()
+
+
+def saved_output(profile_id: str, output: str, sort: str = DEFAULT_SORT) -> Tuple[str, bytes]:
+    """Return ``(media type, content)`` of a saved profile output.
+
+    The report is re-sorted from the saved statistics.
+
+    Raises:
+        ValueError: If the output or sort key is unknown.
+        FileNotFoundError: If no profile has that id.
+    """
+    if output not in OUTPUT_SUFFIXES:
+        raise ValueError(f"Unknown profile output '{output}', expected one of {', '.join(OUTPUT_SUFFIXES)}")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key '{sort}', expected one of {', '.join(SORT_KEYS)}")
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        raise FileNotFoundError(profile_id)
+    path = os.path.join(PROFILE_DIR, profile_id + OUTPUT_SUFFIXES[output])
+    if output == 'report':
+        stream = io.StringIO()
+        pstats.Stats(os.path.join(PROFILE_DIR, profile_id + OUTPUT_SUFFIXES['pstats']),
+                     stream=stream).sort_stats(sort).print_stats(REPORT_LIMIT)
+        return 'text/plain; charset=utf-8', stream.getvalue().encode('utf-8')
+    with open(path, 'rb') as f:
+        content = f.read()
+    return ('application/octet-stream' if output == 'pstats' else 'text/plain; charset=utf-8'), content
+
+
+def _requested_mode(scope: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Return the profiling mode and sort key requested by a request, or (None, ...)."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    value = query.get('profile', [None])[0]
+    if value is None:
+        for name, header in scope.get('headers', ()):
+            if name == b'x-profile':
+                value = header.decode('latin-1')
+                break
+    sort = query.get('profile_sort', [DEFAULT_SORT])[0]
+    if value is None or value.lower() in ('', '0', 'false', 'no', 'off'):
+        return None, sort
+    value = value.lower()
+    return (value if value in (MODE_REPORT, MODE_COLLAPSED) else MODE_SAVE), sort
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests that ask for it (see the module docstring)."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        mode, sort = _requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if sort not in SORT_KEYS:
+            sort = DEFAULT_SORT
+
+        profile = Profile()
+        replace_body = mode in (MODE_REPORT, MODE_COLLAPSED)
+
+        async def send_with_profile(message: Dict[str, Any]) -> None:
+            if replace_body:
+                # The profile replaces the response, which is only needed to finish the request
+                return
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'x-profile-id', profile.id.encode('latin-1')))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        token = _current.set(profile)
+        recorder = Recorder()
+        recorder.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profile.add(*recorder.stop())
+            _current.reset(token)
+            profile.save(os.path.join(PROFILE_DIR, profile.id))
+
+        if replace_body:
+            body = (profile.report(sort) if mode == MODE_REPORT else profile.collapsed()).encode('utf-8')
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8'),
+                            (b'content-length', str(len(body)).encode('latin-1')),
+                            (b'x-profile-id', profile.id.encode('latin-1'))]
+            })
+            await send({'type': 'http.response.body', 'body': body})
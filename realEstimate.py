@@ -28,71 +28,68 @@ def main():
         if property_price > Decimal('1000000000000'):  # 1 trillion limit
             raise ValueError("Property price exceeds maximum supported value")
         
-        # Set up calculation parameters
-        mortgage_params = MortgageParams(
-            property_price=property_price,
-            down_payment_percentage=down_payment_percentage,
-            interest_rate_first_period=interest_rate_first_period,
-            interest_rate_subsequent_min=interest_rate_subsequent_min,
-            interest_rate_subsequent_max=interest_rate_subsequent_max,
-            mortgage_term_years=mortgage_term_years,
-            fixed_interest_duration_years=fixed_interest_duration_years
-        )
+        # Evaluate the lowest and highest subsequent rate to show the range of outcomes
+        def compare_at(interest_rate_subsequent: Decimal):
+            mortgage_params = MortgageParams(
+                property_price=property_price,
+                down_payment_percentage=down_payment_percentage,
+                interest_rate_first_period=interest_rate_first_period,
+                interest_rate_subsequent=interest_rate_subsequent,
+                mortgage_term_years=mortgage_term_years,
+                fixed_interest_duration_years=fixed_interest_duration_years
+            )
+            mortgage_payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params)
+            comparison_params = ComparisonParams(
+                monthly_rent=monthly_rent,
+                mortgage_params=mortgage_params,
+                mortgage_payments=mortgage_payments,
+                investment_return_rate=investment_return_rate
+            )
+            return mortgage_payments, MortgageComparison.month_by_month_comparison(comparison_params)
 
-        # Calculate mortgage payments
-        mortgage_payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params)
-        
-        # Set up comparison parameters
-        comparison_params = ComparisonParams(
-            monthly_rent=monthly_rent,
-            mortgage_params=mortgage_params,
-            mortgage_payments=mortgage_payments,
-            investment_return_rate=investment_return_rate
-        )
-
-        # Perform month-by-month comparison
-        comparison_result = MortgageComparison.month_by_month_comparison(comparison_params)
+        payments_min, result_min = compare_at(interest_rate_subsequent_min)
+        payments_max, result_max = compare_at(interest_rate_subsequent_max)
         
         # Output Summary
         print("\n===== MORTGAGE VS. RENT COMPARISON SUMMARY =====")
         print(f"Property Price: {format_currency(property_price)}")
         print(f"Down Payment: {format_currency(property_price * down_payment_percentage)} ({down_payment_percentage * 100}%)")
-        print(f"Loan Amount: {format_currency(mortgage_payments.loan_amount)}")
+        print(f"Loan Amount: {format_currency(payments_min.loan_amount)}")
         print(f"Monthly Rent: {format_currency(monthly_rent)}")
         print("\n----- PAYMENT DETAILS -----")
-        print(f"Monthly Payment (Initial Fixed Period): {format_currency(mortgage_payments.monthly_payment_first_period)}")
-        print(f"Monthly Payment After Fixed Period (Min): {format_currency(mortgage_payments.monthly_payment_subsequent_min)}")
-        print(f"Monthly Payment After Fixed Period (Max): {format_currency(mortgage_payments.monthly_payment_subsequent_max)}")
+        print(f"Monthly Payment (Initial Fixed Period): {format_currency(payments_min.monthly_payment_first_period)}")
+        print(f"Monthly Payment After Fixed Period (Min): {format_currency(payments_min.monthly_payment_subsequent)}")
+        print(f"Monthly Payment After Fixed Period (Max): {format_currency(payments_max.monthly_payment_subsequent)}")
         
         print("\n----- TOTAL COSTS OVER MORTGAGE TERM -----")
-        print(f"Total Principal Paid: {format_currency(comparison_result.total_principal_paid)}")
-        print(f"Total Interest Paid: {format_currency(comparison_result.total_interest_paid_min)} to {format_currency(comparison_result.total_interest_paid_max)}")
-        print(f"Total Mortgage Cost: {format_currency(comparison_result.total_mortgage_cost_min)} to {format_currency(comparison_result.total_mortgage_cost_max)}")
-        print(f"Total Rent Cost: {format_currency(comparison_result.total_rent_cost)}")
+        print(f"Total Principal Paid: {format_currency(result_min.total_principal_paid)}")
+        print(f"Total Interest Paid: {format_currency(result_min.total_interest_paid)} to {format_currency(result_max.total_interest_paid)}")
+        print(f"Total Mortgage Cost: {format_currency(result_min.total_mortgage_cost)} to {format_currency(result_max.total_mortgage_cost)}")
+        print(f"Total Rent Cost: {format_currency(result_min.total_rent_cost)}")
         
         print("\n----- INVESTMENT ANALYSIS -----")
         print(f"Investment Return Rate: {investment_return_rate * 100}% annually")
-        print(f"Total Investment Growth (if renting): {format_currency(comparison_result.total_investment_growth_min)} to {format_currency(comparison_result.total_investment_growth_max)}")
+        print(f"Total Investment Growth (if renting): {format_currency(result_min.total_investment_growth)} to {format_currency(result_max.total_investment_growth)}")
         
         print("\n----- BUYING VS. RENTING COMPARISON -----")
-        print(f"Net Benefit of Buying: {format_currency(comparison_result.net_benefit_buying_min)} to {format_currency(comparison_result.net_benefit_buying_max)}")
-        print(f"Is Buying Cheaper? {get_yes_no(comparison_result.is_buying_cheaper_min)} to {get_yes_no(comparison_result.is_buying_cheaper_max)}")
+        print(f"Net Benefit of Buying: {format_currency(result_min.net_benefit_buying)} to {format_currency(result_max.net_benefit_buying)}")
+        print(f"Is Buying Cheaper? {get_yes_no(result_min.is_buying_cheaper)} to {get_yes_no(result_max.is_buying_cheaper)}")
         
         # Optional: Display month-by-month comparison for a specific range
         display_detailed_months = False
         if display_detailed_months:
             print("\n===== DETAILED MONTHLY COMPARISON (FIRST 12 MONTHS) =====")
-            display_months = min(12, len(comparison_result.monthly_comparison))
+            display_months = min(12, len(result_min.monthly_comparison))
             for i in range(display_months):
-                mc = comparison_result.monthly_comparison[i]
-                print(f"\nMonth {mc.month}:")
-                print(f"  Monthly Mortgage Payment: {format_currency(mc.monthly_mortgage_payment_min)} to {format_currency(mc.monthly_mortgage_payment_max)}")
-                print(f"  Principal Payment: {format_currency(mc.principal_for_the_month_min)} to {format_currency(mc.principal_for_the_month_max)}")
-                print(f"  Interest Payment: {format_currency(mc.interest_for_the_month_min)} to {format_currency(mc.interest_for_the_month_max)}")
-                print(f"  Monthly Rent: {format_currency(mc.monthly_rent)}")
-                print(f"  Total Rent + Principal Savings: {format_currency(mc.total_rent_and_savings_min)} to {format_currency(mc.total_rent_and_savings_max)}")
-                print(f"  Financial Difference: {format_currency(mc.difference_min)} to {format_currency(mc.difference_max)}")
-                print(f"  Cumulative Investment (if renting): {format_currency(mc.cumulative_investment_min)} to {format_currency(mc.cumulative_investment_max)}")
+                mc_min, mc_max = result_min.monthly_comparison[i], result_max.monthly_comparison[i]
+                print(f"\nMonth {mc_min.month}:")
+                print(f"  Monthly Mortgage Payment: {format_currency(mc_min.monthly_mortgage_payment)} to {format_currency(mc_max.monthly_mortgage_payment)}")
+                print(f"  Principal Payment: {format_currency(mc_min.principal_for_the_month)} to {format_currency(mc_max.principal_for_the_month)}")
+                print(f"  Interest Payment: {format_currency(mc_min.interest_for_the_month)} to {format_currency(mc_max.interest_for_the_month)}")
+                print(f"  Monthly Rent: {format_currency(mc_min.monthly_rent)}")
+                print(f"  Total Rent + Principal Savings: {format_currency(mc_min.total_rent_and_savings)} to {format_currency(mc_max.total_rent_and_savings)}")
+                print(f"  Financial Difference: {format_currency(mc_min.difference)} to {format_currency(mc_max.difference)}")
+                print(f"  Cumulative Investment (if renting): {format_currency(mc_min.cumulative_investment)} to {format_currency(mc_max.cumulative_investment)}")
     
     except ValueError as e:
         print(f"Error: {e}")
@@ -0,0 +1,117 @@
+"""
+Single-flight coalescing of identical concurrent calculations.
+
+A burst of identical requests (for example a campaign link to a preset
+scenario) would otherwise run the same calculation once per request, because
+the result cache is only filled when the first one finishes. ``SingleFlight``
+keeps one in-flight task per key: the first caller starts it and later callers
+with the same key await the same task and share its result. Keys are built
+from the normalized calculation inputs (see ``calculations.cache``).
+
+- Errors propagate to every caller waiting on the failed task. The key is
+  released as soon as the task finishes, so a later call computes again.
+- Each caller waits at most ``timeout`` seconds and then gets
+  ``SingleFlightTimeout``. The task itself keeps running for the other callers
+  (work handed to an executor cannot be interrupted anyway). The same holds
+  when a caller is cancelled, e.g. by a client disconnect.
+- Profiled requests (see ``profiling``) bypass coalescing in ``run``: they
+  neither join nor lead a shared task, so their profile, ``X-Profile-Id`` and
+  stage timings cover a calculation of their own.
+
+Must be used from a single event loop. ``REALESTIMATE_SINGLEFLIGHT_TIMEOUT``
+sets the timeout in seconds (default 30; 0 waits without limit) and
+``REALESTIMATE_SINGLEFLIGHT=0`` disables coalescing.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import profiling
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised when a caller waited longer than the timeout for a calculation."""
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with equal keys into one execution."""
+
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT, enabled: bool = True):
+        self.timeout = timeout or None
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``await func()``, shared with concurrent calls for ``key``.
+
+        Raises:
+            SingleFlightTimeout: If the result is not ready within the timeout.
+            Exception: Whatever the shared execution raised.
+        """
+        if not self.enabled:
+            self.executed += 1
+            return await func()
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+
+        try:
+            # Shielded so neither a timeout nor a cancelled caller cancels the shared task
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise SingleFlightTimeout(f"Calculation did not finish within {self.timeout:g} seconds")
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so it is not reported as unhandled when every caller timed out
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters of executed and coalesced calls."""
+        calls = self.executed + self.coalesced
+        return {
+            'enabled': self.enabled,
+            'timeout': self.timeout,
+            'in_flight': len(self._inflight),
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'coalesced_rate': self.coalesced / calls if calls else 0.0
+        }
+
+    def reset(self) -> None:
+        """Reset the counters (in-flight tasks are kept)."""
+        self.executed = self.coalesced = self.errors = self.timeouts = 0
+
+
+group = SingleFlight(
+    timeout=float(os.environ.get('REALESTIMATE_SINGLEFLIGHT_TIMEOUT', DEFAULT_TIMEOUT)),
+    enabled=os.environ.get('REALESTIMATE_SINGLEFLIGHT', '1').lower() not in ('0', 'false', 'no', 'off')
+)
+
+
+async def run(key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``func`` once for concurrent calls with equal ``key``; see ``SingleFlight.run``.
+
+    A profiled request always runs its own ``func``.
+    """
+    if profiling.PROFILING_ENABLED and profiling.current() is not None:
+        return await func()
+    return await group.run(key, func)
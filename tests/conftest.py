@@ -0,0 +1,56 @@
+import random
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from calculations import cache
+from calculations.comparison import ComparisonParams
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams
+
+
+def random_params(rng: random.Random, backend: str = None) -> ComparisonParams:
+    """A random but realistic scenario, including zero rates and full-term fixed periods."""
+    term_years = rng.choice([1, 5, 10, 20, 30])
+    mortgage_params = MortgageParams(
+        property_price=Decimal(rng.randrange(300, 9000) * 1000000),
+        down_payment_percentage=Decimal(rng.randrange(10, 40)) / 100,
+        interest_rate_first_period=Decimal(rng.choice([0, rng.randrange(100, 900)])) / 10000,
+        interest_rate_subsequent=Decimal(rng.randrange(500, 1400)) / 10000,
+        mortgage_term_years=term_years,
+        fixed_interest_duration_years=rng.randint(0, term_years)
+    )
+    return ComparisonParams(
+        monthly_rent=Decimal(rng.randrange(20, 300) * 100000),
+        mortgage_params=mortgage_params,
+        mortgage_payments=MortgageCalculator.calculate_mortgage_payments(mortgage_params, backend),
+        investment_return_rate=Decimal(rng.randrange(0, 12)) / 100
+    )
+
+
+@pytest.fixture
+def scenarios() -> List[ComparisonParams]:
+    rng = random.Random(2024)
+    return [random_params(rng) for _ in range(25)]
+
+
+@pytest.fixture
+def scenario_record() -> dict:
+    """One scenario in the calculations.batch record format."""
+    return {
+        'property_price': 1600000000,
+        'down_payment_percentage': 0.2,
+        'interest_rate_first_period': 0.025,
+        'interest_rate_subsequent': 0.11,
+        'mortgage_term_years': 30,
+        'fixed_interest_duration_years': 5,
+        'monthly_rent': 3500000,
+        'investment_return_rate': 0.07
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    cache.clear_caches()
+    yield
+    cache.clear_caches()
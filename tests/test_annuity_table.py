@@ -0,0 +1,90 @@
+from decimal import Decimal, localcontext
+
+import pytest
+
+from calculations import annuity_table
+from calculations.backends import DecimalBackend
+
+MAX_RATE = Decimal('0.12')
+MAX_MONTHS = 120
+
+
+@pytest.fixture(scope='module')
+def table_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('annuity') / 'annuity.bin')
+    annuity_table.build(path, max_rate=MAX_RATE, max_months=MAX_MONTHS)
+    return path
+
+
+@pytest.fixture
+def table(table_path, monkeypatch):
+    """The small table, loaded for growth_factor; the previous table state is restored afterwards."""
+    monkeypatch.setattr(annuity_table, '_table', None)
+    monkeypatch.setattr(annuity_table, '_loaded', False)
+    loaded = annuity_table.load(table_path)
+    yield loaded
+    loaded.close()
+
+
+def power(annual_rate: Decimal, months: int) -> Decimal:
+    return (1 + annual_rate / 12) ** months
+
+
+@pytest.mark.parametrize('annual_rate', ['0.0001', '0.025', '0.0792', '0.11', '0.12'])
+@pytest.mark.parametrize('months', [1, 12, 59, 120])
+def test_table_entries_equal_the_computed_power(table, annual_rate, months):
+    rate = Decimal(annual_rate)
+    assert annuity_table.growth_factor(rate, rate / 12, months) == power(rate, months)
+
+
+@pytest.mark.parametrize('annual_rate, months', [
+    ('0.025', 121),     # Beyond the table's months
+    ('0.13', 12),       # Above the table's rates
+    ('0.02505', 12),    # Off the 0.01% grid
+])
+def test_lookups_outside_the_table_fall_back_to_the_power(table, annual_rate, months):
+    rate = Decimal(annual_rate)
+    assert table.growth(rate, months) is None
+    assert annuity_table.growth_factor(rate, rate / 12, months) == power(rate, months)
+
+
+def test_other_precision_falls_back(table):
+    with localcontext() as context:
+        context.prec = 40
+        assert table.growth(Decimal('0.025'), 12) is None
+        assert annuity_table.growth_factor(Decimal('0.025'), Decimal('0.025') / 12, 12) == power(Decimal('0.025'), 12)
+
+
+def test_payments_are_identical_with_and_without_the_table(table, monkeypatch):
+    cases = [(Decimal('1280000000'), Decimal(rate) / 100, months)
+             for rate in ('2.5', '7.92', '11', '3.333') for months in (12, 60, 120, 360)]
+    with_table = [DecimalBackend.monthly_payment(*case) for case in cases]
+    monkeypatch.setattr(annuity_table, '_table', None)
+    assert [DecimalBackend.monthly_payment(*case) for case in cases] == with_table
+
+
+def test_missing_file_disables_the_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(annuity_table, '_table', None)
+    monkeypatch.setattr(annuity_table, '_loaded', False)
+    assert annuity_table.load(str(tmp_path / 'missing.bin')) is None
+    assert annuity_table.growth_factor(Decimal('0.025'), Decimal('0.025') / 12, 12) == power(Decimal('0.025'), 12)
+
+
+def test_decoded_entries_are_evicted_least_recently_used_first(table, monkeypatch):
+    monkeypatch.setattr(annuity_table, 'DECODED_LIMIT', 2)
+    table.clear_decoded()
+    rate = Decimal('0.025')
+    for months in (12, 24, 12, 36):
+        assert table.growth(rate, months) == power(rate, months)
+    assert list(table._decoded) == [(rate, 12), (rate, 36)]
+
+
+def test_the_table_needs_an_explicit_path(monkeypatch, capsys):
+    monkeypatch.setattr(annuity_table, 'TABLE_PATH', '')
+    monkeypatch.setattr(annuity_table, '_table', None)
+    monkeypatch.setattr(annuity_table, '_loaded', False)
+    assert annuity_table.load() is None
+    monkeypatch.setattr('sys.argv', ['annuity_table', 'build'])
+    with pytest.raises(SystemExit):
+        annuity_table.main()
+    assert 'REALESTIMATE_ANNUITY_TABLE' in capsys.readouterr().err
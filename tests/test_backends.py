@@ -0,0 +1,65 @@
+import dataclasses
+import random
+from decimal import Decimal
+
+import pytest
+
+from calculations.backends import (BACKEND_DECIMAL, BACKEND_FIXED, BACKEND_FLOAT, DecimalBackend, FixedPointBackend,
+                                   RATE_SCALE, _divide_half_even)
+from calculations.comparison import MortgageComparison
+from calculations.mortgage_calculations import MortgageCalculator
+
+from .conftest import random_params
+
+MONEY_FIELDS = ('total_mortgage_cost', 'total_rent_cost', 'total_investment_growth', 'net_benefit_buying',
+                'max_payment_difference', 'payment_difference_fixed', 'payment_difference_variable',
+                'total_interest_paid', 'total_principal_paid')
+
+
+@pytest.mark.parametrize('numerator, denominator, expected', [
+    (5, 2, 2), (7, 2, 4), (-5, 2, -2), (-7, 2, -4),  # Ties go to the even neighbour
+    (11, 4, 3), (9, 4, 2), (-11, 4, -3), (-9, 4, -2),
+    (6, 3, 2), (0, 7, 0),
+])
+def test_divide_half_even(numerator, denominator, expected):
+    assert _divide_half_even(numerator, denominator) == expected
+
+
+@pytest.mark.parametrize('amount, sen', [
+    ('0.005', 0), ('0.015', 2), ('0.025', 2), ('0.0251', 3), ('-0.005', 0), ('-0.015', -2), ('1234.565', 123456),
+])
+def test_fixed_point_amounts_round_half_even_to_the_sen(amount, sen):
+    assert FixedPointBackend.from_decimal(Decimal(amount)) == sen
+
+
+def test_fixed_point_products_round_half_even():
+    half = RATE_SCALE // 2
+    assert FixedPointBackend.mul(1, half) == 0
+    assert FixedPointBackend.mul(3, half) == 2
+    assert FixedPointBackend.mul(5, half) == 2
+    assert FixedPointBackend.div(250, 100) == 2
+    assert FixedPointBackend.div(350, 100) == 4
+
+
+def test_fixed_point_payment_is_the_exact_payment_rounded_to_the_sen():
+    loan = FixedPointBackend.from_decimal(Decimal('1280000000'))
+    payment = FixedPointBackend.monthly_payment(loan, Decimal('0.025'), 360)
+    expected = DecimalBackend.monthly_payment(FixedPointBackend.to_decimal(loan), Decimal('0.025'), 360)
+    assert FixedPointBackend.to_decimal(payment) == expected.quantize(Decimal('0.01'))
+
+
+@pytest.mark.parametrize('backend, relative', [(BACKEND_FLOAT, 1e-9), (BACKEND_FIXED, 1e-6)])
+def test_backends_agree_with_decimal(backend, relative):
+    rng = random.Random(7)
+    for _ in range(15):
+        params = random_params(rng)
+        payments = MortgageCalculator.calculate_mortgage_payments(params.mortgage_params, backend)
+        other = MortgageComparison.month_by_month_comparison(
+            dataclasses.replace(params, mortgage_payments=payments), backend=backend)
+        exact = MortgageComparison.month_by_month_comparison(params, backend=BACKEND_DECIMAL)
+        loan = float(params.mortgage_payments.loan_amount)
+        for field in MONEY_FIELDS:
+            actual, expected = getattr(other, field), getattr(exact, field)
+            assert isinstance(actual, Decimal)
+            assert abs(float(actual) - float(expected)) <= max(0.01, relative * max(abs(float(expected)), loan))
+        assert len(other.monthly_comparison) == len(exact.monthly_comparison)
@@ -0,0 +1,37 @@
+import pytest
+
+from calculations import batch
+
+
+def test_invalid_records_get_per_item_errors(scenario_record):
+    records = [
+        scenario_record,
+        {**scenario_record, 'down_payment_percentage': 1.5},
+        {key: value for key, value in scenario_record.items() if key != 'monthly_rent'},
+        {**scenario_record, 'mortgage_term_years': 'thirty'},
+        {**scenario_record, 'mortgage_term_years': 20},
+    ]
+    results = batch.evaluate_batch(records)
+    assert [item['index'] for item in results] == list(range(len(records)))
+    assert [('result' in item, 'error' in item) for item in results] == [
+        (True, False), (False, True), (False, True), (False, True), (True, False)]
+    assert results[1]['error'] == "Down payment percentage must be between 0 and 1"
+    assert 'monthly_rent' in results[2]['error']
+    assert results[3]['error'] == "Invalid value for 'mortgage_term_years': 'thirty'"
+    assert results[0]['result'] == batch.evaluate_batch([scenario_record])[0]['result']
+
+
+def test_whole_batch_errors_raise(scenario_record):
+    with pytest.raises(ValueError, match='Unknown calculation engine'):
+        batch.evaluate_batch([scenario_record], engine='abacus')
+    with pytest.raises(ValueError, match='exceeds maximum'):
+        batch.evaluate_batch([scenario_record] * (batch.MAX_BATCH_SIZE + 1))
+
+
+def test_pool_results_match_in_process(scenario_record):
+    records = [{**scenario_record, 'mortgage_term_years': years} for years in (5, 10, 0, 30)]
+    try:
+        pooled = batch.evaluate_batch(records, chunk_size=1)
+    finally:
+        batch.shutdown_executor()
+    assert pooled == batch.evaluate_batch(records)
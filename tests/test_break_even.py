@@ -0,0 +1,54 @@
+import pytest
+
+from calculations.break_even import BREAK_EVEN_VARIABLES, solve_listings
+from calculations.vectorized import evaluate_summary
+
+
+def net_benefit(record):
+    return float(evaluate_summary(**record).net_benefit_buying)
+
+
+@pytest.mark.parametrize('variable', sorted(BREAK_EVEN_VARIABLES))
+def test_thresholds_zero_the_net_benefit(scenario_record, variable):
+    records = [{**scenario_record, 'mortgage_term_years': years, variable: None} for years in (10, 20, 30)]
+    solved = solve_listings(records, variable)
+    assert solved['variable'] == variable
+    for item in solved['results']:
+        if item['threshold'] is None:
+            assert 'error' in item
+            continue
+        assert item['converged']
+        record = {**records[item['index']], variable: item['threshold']}
+        assert abs(net_benefit(record)) <= 1.0
+        # Nudging the threshold in the reported direction favours buying
+        step = 1e-3 * max(abs(item['threshold']), 1e-3)
+        above = net_benefit({**record, variable: item['threshold'] + step})
+        assert (above > 0) == item['buying_better_above']
+
+
+def test_rent_threshold_is_found(scenario_record):
+    item = solve_listings([scenario_record], 'monthly_rent')['results'][0]
+    assert item['converged'] and item['threshold'] > 0 and item['buying_better_above']
+
+
+def test_invalid_listings_get_per_item_errors(scenario_record):
+    results = solve_listings([scenario_record, {**scenario_record, 'down_payment_percentage': 2}],
+                             'monthly_rent')['results']
+    assert 'threshold' in results[0]
+    assert results[1] == {'index': 1, 'error': "Down payment percentage must be between 0 and 1"}
+
+
+def test_range_without_a_sign_change_reports_an_error(scenario_record):
+    item = solve_listings([scenario_record], 'monthly_rent', lower=1.0, upper=2.0)['results'][0]
+    assert item['threshold'] is None and not item['converged']
+    assert item['error'] == "No break-even point within the search range"
+
+
+@pytest.mark.parametrize('options, message', [
+    ({'variable': 'mortgage_term_years'}, 'Unknown variable'),
+    ({'variable': 'monthly_rent', 'lower': 5.0, 'upper': 1.0}, 'Lower bound'),
+])
+def test_invalid_requests_raise(scenario_record, options, message):
+    with pytest.raises(ValueError, match=message):
+        solve_listings([scenario_record], **options)
+
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+
+import pytest
+
+from calculations import batch, bulk
+from calculations.comparison import ENGINE_NUMPY
+
+
+def listings_csv(scenario_record, rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, ['listing_id', *scenario_record])
+    writer.writeheader()
+    for number, overrides in enumerate(rows):
+        writer.writerow({'listing_id': f'L{number}', **scenario_record, **overrides})
+    return buffer.getvalue()
+
+
+def evaluate(text, **options):
+    output = io.StringIO()
+    summary = bulk.evaluate_file(io.StringIO(text), output, progress=None, **options)
+    return summary, output.getvalue()
+
+
+ROWS = [{}, {'mortgage_term_years': '20.0'}, {'down_payment_percentage': '1.5'}, {'mortgage_term_years': '20.5'},
+        {'monthly_rent': '4,000,000'}]
+
+
+def test_rows_are_evaluated_in_order_with_inline_errors(scenario_record):
+    summary, text = evaluate(listings_csv(scenario_record, ROWS), processes=1, id_column='listing_id')
+    assert (summary.rows, summary.errors) == (5, 2)
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row['listing_id'] for row in rows] == ['L0', 'L1', 'L2', 'L3', 'L4']
+    assert [row['row'] for row in rows] == ['1', '2', '3', '4', '5']
+    assert [bool(row['error']) for row in rows] == [False, False, True, True, False]
+    assert rows[3]['error'] == "Invalid value for 'mortgage_term_years': '20.5'"
+    expected = batch.evaluate_batch([scenario_record])[0]['result']
+    assert float(rows[0]['net_benefit_buying']) == pytest.approx(expected['net_benefit_buying'], rel=1e-12)
+
+
+def test_numpy_engine_agrees_with_decimal(scenario_record):
+    _, exact = evaluate(listings_csv(scenario_record, ROWS), processes=1, output_format=bulk.FORMAT_NDJSON)
+    _, vectorized = evaluate(listings_csv(scenario_record, ROWS), processes=1, engine=ENGINE_NUMPY,
+                             output_format=bulk.FORMAT_NDJSON)
+    for exact_item, vectorized_item in zip(map(json.loads, exact.splitlines()),
+                                           map(json.loads, vectorized.splitlines())):
+        assert ('error' in exact_item) == ('error' in vectorized_item)
+        if 'error' not in exact_item:
+            assert vectorized_item['net_benefit_buying'] == pytest.approx(exact_item['net_benefit_buying'], rel=1e-6)
+
+
+def test_pooled_chunks_are_written_in_input_order(scenario_record):
+    text = listings_csv(scenario_record, ROWS * 4)
+    single = evaluate(text, processes=1, chunk_size=3)
+    pooled = evaluate(text, processes=2, chunk_size=3)
+    assert pooled[1] == single[1]
+    assert pooled[0][:2] == single[0][:2] == (20, 8)
+
+
+def test_missing_columns_are_rejected(scenario_record):
+    text = listings_csv({key: value for key, value in scenario_record.items() if key != 'monthly_rent'}, [{}])
+    with pytest.raises(ValueError, match='missing required columns: monthly_rent'):
+        evaluate(text)
+
+
+@pytest.mark.parametrize('raw', [20, '20', 20.0, '20.0', ' 20 '])
+def test_integral_decimals_are_accepted_for_integer_fields(scenario_record, raw):
+    mortgage_params, _, _ = batch.parse_scenario({**scenario_record, 'mortgage_term_years': raw})
+    assert mortgage_params.mortgage_term_years == 20
+
+
+@pytest.mark.parametrize('raw', [20.5, '20.5', True, 'inf', ''])
+def test_non_integers_are_rejected_for_integer_fields(scenario_record, raw):
+    with pytest.raises(ValueError, match="Invalid value for 'mortgage_term_years'"):
+        batch.parse_scenario({**scenario_record, 'mortgage_term_years': raw})
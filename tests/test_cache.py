@@ -0,0 +1,52 @@
+import dataclasses
+from decimal import Decimal
+
+from calculations import cache
+from calculations.mortgage_calculations import MortgageParams
+
+BASE = MortgageParams(Decimal('1600000000'), Decimal('0.20'), Decimal('0.025'), Decimal('0.11'), 30, 5)
+
+
+def test_equal_values_written_differently_share_a_key():
+    same = MortgageParams(Decimal('1.6E9'), Decimal('0.2'), Decimal('0.0250'), Decimal('0.110'), 30, 5)
+    assert cache.mortgage_params_key(same) == cache.mortgage_params_key(BASE)
+    zero_rate = dataclasses.replace(BASE, interest_rate_first_period=Decimal('0E-8'))
+    assert cache.mortgage_params_key(zero_rate) == cache.mortgage_params_key(
+        dataclasses.replace(BASE, interest_rate_first_period=Decimal('0')))
+
+
+def test_subsequent_rate_is_ignored_when_fixed_for_the_full_term():
+    full_term = dataclasses.replace(BASE, fixed_interest_duration_years=30)
+    assert (cache.mortgage_params_key(full_term)
+            == cache.mortgage_params_key(dataclasses.replace(full_term, interest_rate_subsequent=Decimal('0.2'))))
+    assert (cache.mortgage_params_key(BASE)
+            != cache.mortgage_params_key(dataclasses.replace(BASE, interest_rate_subsequent=Decimal('0.2'))))
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    lru = cache.LRUCache(maxsize=2)
+    lru.put('a', 1)
+    lru.put('b', 2)
+    assert lru.get('a') == (True, 1)
+    lru.put('c', 3)
+    assert lru.get('b') == (False, None)
+    assert lru.get('a') == (True, 1) and lru.get('c') == (True, 3)
+    assert lru.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    lru = cache.LRUCache(maxsize=2, ttl=10)
+    lru.put('a', 1)
+    now[0] += 9
+    assert lru.get('a') == (True, 1)
+    now[0] += 2
+    assert lru.get('a') == (False, None)
+    assert lru.stats()['expirations'] == 1
+
+
+def test_zero_size_disables_caching():
+    lru = cache.LRUCache(maxsize=0)
+    assert lru.get_or_compute('a', lambda: 1) == 1
+    assert lru.get('a') == (False, None)
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+import pytest
+
+from calculations import cache
+from calculations.backends import BACKEND_DECIMAL, BACKEND_FIXED, BACKEND_FLOAT
+from calculations.comparison import MortgageComparison
+
+MONEY_FIELDS = ('total_mortgage_cost', 'total_rent_cost', 'total_investment_growth', 'net_benefit_buying',
+                'max_payment_difference', 'payment_difference_fixed', 'payment_difference_variable',
+                'total_interest_paid', 'total_principal_paid')
+
+
+def test_summary_only_keeps_no_monthly_records(scenarios):
+    for params in scenarios:
+        summary = MortgageComparison.month_by_month_comparison(params, summary_only=True)
+        full = MortgageComparison.month_by_month_comparison(params)
+        assert summary.monthly_comparison == []
+        assert len(full.monthly_comparison) == params.mortgage_params.mortgage_term_years * 12
+        assert summary.yearly_summary == full.yearly_summary
+        for field in MONEY_FIELDS:
+            expected = getattr(full, field)
+            # Closed-form segment totals differ from the monthly sums only in the last Decimal digits
+            assert abs(getattr(summary, field) - expected) <= abs(expected) * Decimal('1e-20') + Decimal('1e-10')
+
+
+@pytest.mark.parametrize('backend', [BACKEND_DECIMAL, BACKEND_FLOAT, BACKEND_FIXED])
+def test_compact_stages_match_full_stages(scenarios, backend):
+    for params in scenarios:
+        compact = MortgageComparison.amortization(params, backend, columns=False)
+        full = MortgageComparison.amortization(params, backend)
+        assert compact.payment == compact.interest == compact.principal == []
+        assert compact._replace(columns=True, payment=full.payment, interest=full.interest,
+                                principal=full.principal) == full
+
+        compact_overlay = MortgageComparison.investment_overlay(params, compact)
+        full_overlay = MortgageComparison.investment_overlay(params, full)
+        assert compact_overlay.investment == compact_overlay.cumulative_investment == []
+        assert (MortgageComparison.aggregate(params, compact, compact_overlay, summary_only=True)
+                == MortgageComparison.aggregate(params, full, full_overlay, summary_only=True))
+
+
+def test_monthly_records_need_full_stages(scenarios):
+    params = scenarios[0]
+    amortization = MortgageComparison.amortization(params, columns=False)
+    overlay = MortgageComparison.investment_overlay(params, amortization)
+    with pytest.raises(ValueError):
+        MortgageComparison.aggregate(params, amortization, overlay)
+
+
+def test_cached_summary_uses_compact_stages(scenarios):
+    params = scenarios[0]
+    summary = cache.cached_comparison(params, summary_only=True)
+    assert summary == MortgageComparison.month_by_month_comparison(params, summary_only=True)
+    full = cache.cached_comparison(params)
+    assert len(full.monthly_comparison) == params.mortgage_params.mortgage_term_years * 12
+    # Summary and full comparisons keep separate stages, so neither reuses the other
+    assert cache.cache_stats()['amortization']['misses'] == 2
@@ -0,0 +1,34 @@
+import csv
+import io
+import json
+
+from calculations import export
+
+
+def test_exported_balances_are_never_negative_zero(scenario_record):
+    rows = list(export.iter_schedule_rows([scenario_record, {**scenario_record, 'mortgage_term_years': 7}]))
+    balance = export.EXPORT_COLUMNS.index('remaining_balance')
+    assert all(str(row[balance]) != '-0.00' and row[balance] >= 0 for row in rows)
+    assert str(rows[-1][balance]) == '0.00'
+
+
+def test_csv_has_one_row_per_month_and_inline_errors(scenario_record):
+    short = {**scenario_record, 'mortgage_term_years': 2, 'fixed_interest_duration_years': 1}
+    records = [scenario_record, {**scenario_record, 'mortgage_term_years': 0}, short]
+    chunks = list(export.iter_csv(records))
+    # The header is flushed on its own, then one chunk per scenario
+    assert len(chunks) == 4
+    rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+    assert [row['scenario'] for row in rows] == ['0'] * 360 + ['1'] + ['2'] * 24
+    assert rows[360]['error'] == "Mortgage term must be greater than 0 years" and rows[360]['month'] == ''
+    assert rows[0]['monthly_rent'] == '3500000.00'
+
+
+def test_ndjson_rounds_to_the_requested_decimals(scenario_record):
+    short = {**scenario_record, 'mortgage_term_years': 2, 'fixed_interest_duration_years': 1}
+    records = [short, {**scenario_record, 'monthly_rent': 'x'}]
+    lines = [json.loads(line) for line in ''.join(export.iter_ndjson(records, decimals=0)).splitlines()]
+    assert len(lines) == 25
+    assert lines[0]['month'] == 1 and lines[0]['monthly_mortgage_payment'] == round(
+        lines[0]['monthly_mortgage_payment'])
+    assert lines[-1] == {'scenario': 1, 'error': "Invalid value for 'monthly_rent': 'x'"}
@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+import jobs
+
+HEARTBEAT_TIMEOUT = 30.0
+
+
+@pytest.fixture
+def store(tmp_path):
+    return jobs.JobStore(str(tmp_path / 'jobs.sqlite3'))
+
+
+def submit_batch(store, record, count):
+    return store.submit(jobs.JOB_BATCH, {'scenarios': [record] * count})['id']
+
+
+def test_invalid_jobs_are_rejected_at_submission(store, scenario_record):
+    with pytest.raises(ValueError, match='Unknown job kind'):
+        store.submit('astrology', {})
+    with pytest.raises(ValueError, match='Unknown calculation engine'):
+        store.submit(jobs.JOB_BATCH, {'scenarios': [scenario_record], 'engine': 'abacus'})
+    with pytest.raises(jobs.JobNotFound):
+        store.get('missing')
+
+
+def test_cancelling_a_queued_job_takes_effect_immediately(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 3)
+    assert store.cancel(job_id)['status'] == jobs.STATUS_CANCELLED
+    assert store.claim(os.getpid()) is None
+
+
+def test_cancelling_a_running_job_stops_it_after_the_current_unit(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 600)
+    job = store.claim(os.getpid())
+    status = store.cancel(job_id)
+    assert status['status'] == jobs.STATUS_RUNNING and status['cancel_requested']
+
+    assert jobs.execute_job(store, job, should_stop=lambda: False) == jobs.STATUS_CANCELLED
+    cancelled = store.get(job_id)
+    assert cancelled['status'] == jobs.STATUS_CANCELLED
+    assert len(cancelled['partial_results']) == cancelled['progress']['done'] == 250
+
+
+def test_a_stopped_worker_requeues_its_job_which_resumes_after_the_committed_units(store, scenario_record):
+    records = [scenario_record] * 600
+    job_id = store.submit(jobs.JOB_BATCH, {'scenarios': records})['id']
+    units_done = []
+    original_save_unit = store.save_unit
+
+    def save_unit(*args):
+        units_done.append(args[1])
+        return original_save_unit(*args)
+
+    store.save_unit = save_unit
+    assert jobs.execute_job(store, store.claim(os.getpid()), should_stop=lambda: bool(units_done)) == jobs.STATUS_QUEUED
+    assert store.get(job_id)['status'] == jobs.STATUS_QUEUED
+
+    assert jobs.execute_job(store, store.claim(os.getpid()), should_stop=lambda: False) == jobs.STATUS_SUCCEEDED
+    assert units_done == [0, 1, 2]
+    result = store.get(job_id)['result']
+    assert [item['index'] for item in result['results']] == list(range(600))
+    assert result['error_count'] == 0
+
+
+def set_heartbeat(store, job_id, heartbeat_at):
+    with store._connect() as connection:
+        connection.execute('UPDATE jobs SET heartbeat_at = ? WHERE id = ?', (heartbeat_at, job_id))
+
+
+def test_recovery_leaves_live_workers_on_other_hosts_alone(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 1)
+    # A pid that does not exist here, but may well exist on the other host
+    store.claim(2 ** 22 + 1, host='other-host')
+    assert store.recover(HEARTBEAT_TIMEOUT) == 0
+    assert store.get(job_id)['status'] == jobs.STATUS_RUNNING
+
+    set_heartbeat(store, job_id, time.time() - 2 * HEARTBEAT_TIMEOUT)
+    assert store.recover(HEARTBEAT_TIMEOUT) == 1
+    assert store.get(job_id)['status'] == jobs.STATUS_QUEUED
+
+
+def test_recovery_reclaims_jobs_of_exited_workers_on_this_host(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 1)
+    store.claim(2 ** 22 + 1)
+    assert store.recover(HEARTBEAT_TIMEOUT) == 1
+    assert store.get(job_id)['status'] == jobs.STATUS_QUEUED
+
+    # A live pid is only reclaimed when a new worker reports it as its own (a reused pid)
+    store.claim(os.getpid())
+    assert store.recover(HEARTBEAT_TIMEOUT) == 0
+    assert store.recover(HEARTBEAT_TIMEOUT, stale_pid=os.getpid()) == 1
+
+
+def test_heartbeats_keep_a_job_claimed(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 1)
+    store.claim(2 ** 22 + 1, host='other-host')
+    set_heartbeat(store, job_id, time.time() - 2 * HEARTBEAT_TIMEOUT)
+    assert store.heartbeat(job_id, 2 ** 22 + 1, host='other-host')
+    assert store.recover(HEARTBEAT_TIMEOUT) == 0
+    assert not store.heartbeat(job_id, os.getpid())
+
+
+def test_a_worker_whose_job_was_reclaimed_stops_without_writing(store, scenario_record):
+    job_id = submit_batch(store, scenario_record, 600)
+    stale = store.claim(2 ** 22 + 1, host='other-host')
+    set_heartbeat(store, job_id, time.time() - 2 * HEARTBEAT_TIMEOUT)
+    assert store.recover(HEARTBEAT_TIMEOUT) == 1
+    current = store.claim(os.getpid())
+    assert (current['worker_pid'], current['worker_host']) == (os.getpid(), jobs.HOST_ID)
+
+    assert jobs.execute_job(store, stale, should_stop=lambda: False) is None
+    assert store.completed_units(job_id) == {}
+    with pytest.raises(jobs.JobLost):
+        store.finish(job_id, jobs.STATUS_FAILED, 2 ** 22 + 1, 'other-host', error='late')
+    status = store.get(job_id)
+    assert status['status'] == jobs.STATUS_RUNNING and status['progress']['done'] == 0
+
+    assert jobs.execute_job(store, current, should_stop=lambda: False) == jobs.STATUS_SUCCEEDED
+
+
+def test_databases_from_before_heartbeats_are_migrated(tmp_path, scenario_record):
+    path = str(tmp_path / 'old.sqlite3')
+    old_schema = jobs.SCHEMA.replace('    worker_host TEXT,\n    heartbeat_at REAL,\n', '')
+    assert 'heartbeat_at' not in old_schema
+    connection = sqlite3.connect(path)
+    connection.executescript(old_schema)
+    connection.close()
+    store = jobs.JobStore(path)
+    job_id = submit_batch(store, scenario_record, 1)
+    assert store.claim(os.getpid())['id'] == job_id
+    assert store.recover(HEARTBEAT_TIMEOUT) == 0
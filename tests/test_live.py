@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import live
+
+
+def message(seq, **params):
+    return json.dumps({'seq': seq, 'params': params})
+
+
+def result(total, yearly):
+    return {'totals': {'net': total, 'rent': 1}, 'yearly': {'payment': yearly, 'rent': [1, 1]}}
+
+
+def test_delta_sends_only_changed_totals_and_columns():
+    first = result(5, [10, 10])
+    assert live.delta(None, first) == {'totals': {'net': 5, 'rent': 1}, 'years': 2, 'yearly': first['yearly']}
+    assert live.delta(first, result(6, [10, 10])) == {'totals': {'net': 6}, 'years': 2, 'yearly': {}}
+    assert live.delta(first, result(5, [10, 11])) == {'totals': {}, 'years': 2, 'yearly': {'payment': [10, 11]}}
+
+
+def test_columns():
+    assert live.columns([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}]) == {'a': [1, 3], 'b': [2, 4]}
+    assert live.columns([]) == {}
+
+
+class Harness:
+    """A session with a controllable calculation and a list of sent messages."""
+
+    def __init__(self, calculation_seconds=0.0, **options):
+        self.sent = []
+        self.calculated = []
+        self.calculation_seconds = calculation_seconds
+        self.session = live.LiveSession(self.calculate, self.send, **options)
+
+    async def calculate(self, params):
+        self.calculated.append(params['value'])
+        await asyncio.sleep(self.calculation_seconds)
+        if params['value'] < 0:
+            raise ValueError("Value cannot be negative")
+        return result(params['value'], [params['value']] * 2)
+
+    async def send(self, item):
+        self.sent.append(item)
+
+
+def run_session(harness, script):
+    async def scenario():
+        runner = asyncio.ensure_future(harness.session.run())
+        try:
+            await script(harness.session)
+        finally:
+            runner.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_rapid_updates_are_debounced_into_one_calculation():
+    harness = Harness(debounce=0.02, max_delay=1.0)
+
+    async def script(session):
+        for value in range(5):
+            await session.receive(message(value, value=value))
+            await asyncio.sleep(0.002)
+        await asyncio.sleep(0.1)
+
+    run_session(harness, script)
+    assert harness.calculated == [4]
+    assert [(item['type'], item['seq']) for item in harness.sent] == [('result', 4)]
+    assert harness.sent[0]['totals'] == {'net': 4, 'rent': 1}
+
+
+def test_updates_during_a_calculation_supersede_its_result():
+    harness = Harness(calculation_seconds=0.05, debounce=0.001, max_delay=0.01)
+
+    async def script(session):
+        await session.receive(message(1, value=1))
+        await asyncio.sleep(0.02)
+        await session.receive(message(2, value=2))
+        await asyncio.sleep(0.15)
+
+    run_session(harness, script)
+    assert harness.calculated == [1, 2]
+    assert [item['seq'] for item in harness.sent] == [2]
+    assert harness.session.superseded == 1 and harness.session.calculations == 1
+
+
+def test_errors_are_reported_and_keep_the_previous_result():
+    harness = Harness(debounce=0.001, max_delay=0.01)
+
+    async def script(session):
+        await session.receive(message(1, value=1))
+        await asyncio.sleep(0.03)
+        await session.receive(message(2, value=-1))
+        await asyncio.sleep(0.03)
+        await session.receive('not json')
+        await session.receive(message(3, value=1))
+        await asyncio.sleep(0.03)
+
+    run_session(harness, script)
+    assert [(item['type'], item['seq']) for item in harness.sent] == [
+        ('result', 1), ('error', 2), ('error', None), ('result', 3)]
+    assert harness.sent[1]['detail'] == "Value cannot be negative"
+    # Unchanged against the last successful result
+    assert harness.sent[3]['totals'] == {} and harness.sent[3]['yearly'] == {}
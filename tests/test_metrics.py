@@ -0,0 +1,60 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram('test_seconds', "Test durations.", ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, 'parse')
+    lines = list(histogram.collect())
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1"} 3' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'test_seconds_sum{stage="parse"} 6.05' in lines
+    assert histogram.count('parse') == 4
+
+
+def test_counters_and_gauges():
+    counter = metrics.Counter('test_total', "Test events.", ('route',))
+    counter.inc('/a')
+    counter.inc('/a', amount=2)
+    assert counter.value('/a') == 3 and counter.value('/b') == 0
+    assert 'test_total{route="/a"} 3' in list(counter.collect())
+    gauge = metrics.Gauge('test_in_flight', "Test gauge.")
+    gauge.inc()
+    gauge.dec()
+    assert gauge.value() == 0
+
+
+def test_middleware_records_routes_and_server_timing():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get('/items/{item}')
+    async def item(request: Request, item: int):
+        with metrics.request_timer(request).stage('lookup'):
+            return {'item': item}
+
+    before = metrics.REQUESTS.value('/items/{item}', '200')
+    lookups = metrics.STAGE_SECONDS.count('lookup')
+    with TestClient(app) as client:
+        response = client.get('/items/1')
+        client.get('/missing')
+    assert response.headers['server-timing'].startswith('lookup;dur=')
+    assert 'total;dur=' in response.headers['server-timing']
+    assert metrics.REQUESTS.value('/items/{item}', '200') == before + 1
+    assert metrics.REQUESTS.value('unmatched', '404') >= 1
+    assert metrics.STAGE_SECONDS.count('lookup') == lookups + 1
+    assert metrics.IN_FLIGHT.value() == 0
+
+
+def test_request_timer_is_a_no_op_without_the_middleware():
+    class Bare:
+        scope = {}
+
+    timer = metrics.request_timer(Bare())
+    assert timer is metrics.NULL_TIMER
+    with timer.stage('lookup'):
+        pass
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from calculations.batch import parse_scenario
+from calculations.comparison import ComparisonParams, MortgageComparison
+from calculations.monte_carlo import MonteCarloParams, MonteCarloSimulation, params_from_request, result_to_dict
+from calculations.mortgage_calculations import MortgageCalculator
+
+
+def simulation_params(scenario_record, **settings) -> MonteCarloParams:
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(scenario_record)
+    return MonteCarloParams(mortgage_params, monthly_rent, investment_return_rate, **settings)
+
+
+def test_drawn_seed_is_reported_and_reproduces_the_run(scenario_record):
+    first = MonteCarloSimulation.run(simulation_params(scenario_record, paths=50))
+    assert isinstance(first.seed, int)
+    again = MonteCarloSimulation.run(simulation_params(scenario_record, paths=50, seed=first.seed))
+    assert again.seed == first.seed
+    assert np.array_equal(again.net_benefit_buying, first.net_benefit_buying)
+    assert result_to_dict(first)['seed'] == first.seed
+    other = MonteCarloSimulation.run(simulation_params(scenario_record, paths=50))
+    assert other.seed != first.seed
+
+
+def test_zero_volatility_reproduces_the_deterministic_comparison(scenario_record):
+    params = simulation_params(scenario_record, paths=20, seed=1, rate_volatility=0.0, return_volatility=0.0)
+    result = MonteCarloSimulation.run(params)
+    mortgage_params = params.mortgage_params
+    expected = MortgageComparison.month_by_month_comparison(ComparisonParams(
+        params.monthly_rent, mortgage_params, MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+        params.investment_return_rate), summary_only=True)
+    loan = float(mortgage_params.property_price * (1 - mortgage_params.down_payment_percentage))
+    assert np.allclose(result.net_benefit_buying, float(expected.net_benefit_buying), rtol=0, atol=1e-9 * loan)
+    assert result.probability_buying_wins == float(expected.is_buying_cheaper)
+
+
+def test_progress_is_reported_per_chunk(scenario_record):
+    reported = []
+    MonteCarloSimulation.run(simulation_params(scenario_record, paths=25, seed=3, chunk_size=10), reported.append)
+    assert reported == [10, 20, 25]
+
+
+@pytest.mark.parametrize('setting, value, message', [
+    ('paths', 0, 'Number of paths'),
+    ('rate_volatility', -0.1, 'Volatilities'),
+    ('percentiles', [101], 'Percentiles'),
+])
+def test_invalid_settings_are_rejected(scenario_record, setting, value, message):
+    with pytest.raises(ValueError, match=message):
+        params_from_request({'scenario': scenario_record, setting: value})
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import offload
+from app import app
+
+
+def test_saturated_executor_rejects_new_tasks():
+    executor = offload.BoundedExecutor(max_workers=1, max_pending=1)
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(time.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        with pytest.raises(offload.ExecutorSaturated):
+            await executor.run(sum, [1, 2])
+        await running
+        return await executor.run(sum, [1, 2])
+
+    try:
+        assert asyncio.run(scenario()) == 3
+        assert executor.rejected == 1 and executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_process_executor_runs_tasks():
+    executor = offload.BoundedExecutor(offload.EXECUTOR_PROCESS, max_workers=1)
+    try:
+        assert asyncio.run(executor.run(sum, [1, 2])) == 3
+    finally:
+        executor.shutdown()
+
+
+def test_sensitivity_grid_runs_on_the_executor(monkeypatch, scenario_record):
+    request = {'scenario': scenario_record,
+               'x': {'dimension': 'interest_rate_subsequent', 'start': 0.05, 'stop': 0.15, 'steps': 3},
+               'y': {'dimension': 'investment_return_rate', 'start': 0.02, 'stop': 0.1, 'steps': 2}}
+    client = TestClient(app)
+    response = client.post('/api/sensitivity', json=request)
+    assert response.status_code == 200
+    assert len(response.json()['net_benefit_buying']) == 2
+
+    monkeypatch.setattr(offload.executor, 'pending', offload.executor.max_pending)
+    response = client.post('/api/sensitivity', json=request)
+    assert response.status_code == 503 and response.headers['retry-after'] == '1'
+
+
+def test_cancelled_tasks_keep_their_slot_while_they_run():
+    executor = offload.BoundedExecutor(max_workers=1, max_pending=4)
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        queued = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        await asyncio.sleep(0.02)
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.02)
+        # The queued task was dropped; the running one cannot be interrupted
+        during = executor.pending
+        await asyncio.sleep(0.15)
+        return during, executor.pending
+
+    try:
+        assert asyncio.run(scenario()) == (1, 0)
+    finally:
+        executor.shutdown()
@@ -0,0 +1,136 @@
+from decimal import Decimal
+
+import pytest
+
+from calculations import prepayment
+from calculations.batch import parse_scenario
+from calculations.comparison import ComparisonParams, MortgageComparison
+from calculations.mortgage_calculations import MortgageCalculator
+from calculations.prepayment import (MODE_REDUCE_INSTALLMENT, MODE_SHORTEN_TERM, OptimizationParams, PlanArrays,
+                                     PrepaymentOptimizer, PrepaymentPlan, PrepaymentSchedule)
+from calculations.vectorized import VECTORIZED_RELATIVE_TOLERANCE
+
+TOTAL_FIELDS = ('net_benefit_buying', 'total_interest_paid', 'total_investment_growth', 'total_mortgage_cost')
+
+
+def evaluate(record, plans):
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record)
+    arrays = PlanArrays.from_plans(plans)
+    outcomes = PrepaymentSchedule.evaluate(mortgage_params, monthly_rent, investment_return_rate, arrays)
+    return [PrepaymentSchedule.result(arrays, outcomes, index) for index in range(len(plans))]
+
+
+@pytest.mark.parametrize('overrides', [
+    {},
+    {'fixed_interest_duration_years': 30},
+    {'fixed_interest_duration_years': 0, 'interest_rate_subsequent': 0},
+    {'interest_rate_first_period': None, 'fixed_interest_duration_years': None, 'rate_tiers': [[3, 0.025], [2, 0.05]]},
+])
+def test_plan_without_prepayments_matches_the_comparison(scenario_record, overrides):
+    record = {key: value for key, value in {**scenario_record, **overrides}.items() if value is not None}
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record)
+    expected = MortgageComparison.month_by_month_comparison(ComparisonParams(
+        monthly_rent, mortgage_params, MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+        investment_return_rate), summary_only=True)
+    loan = float(mortgage_params.property_price * (1 - mortgage_params.down_payment_percentage))
+
+    baseline = evaluate(record, [PrepaymentPlan()])[0]
+    for field in TOTAL_FIELDS:
+        value = float(getattr(expected, field))
+        assert abs(getattr(baseline, field) - value) <= VECTORIZED_RELATIVE_TOLERANCE * max(abs(value), loan)
+    assert baseline.total_prepaid == 0
+    assert baseline.payoff_month == mortgage_params.mortgage_term_years * 12
+
+
+def test_prepayments_save_interest(scenario_record):
+    baseline, shorten, reduce, extra = evaluate(scenario_record, [
+        PrepaymentPlan(),
+        PrepaymentPlan(lump_sum=Decimal('100000000'), lump_sum_month=60),
+        PrepaymentPlan(lump_sum=Decimal('100000000'), lump_sum_month=60, mode=MODE_REDUCE_INSTALLMENT),
+        PrepaymentPlan(monthly_extra=Decimal('2000000'), extra_start_month=61, extra_end_month=360),
+    ])
+    for plan in (shorten, reduce, extra):
+        assert plan.total_interest_paid < baseline.total_interest_paid
+        assert plan.total_prepaid > 0
+    assert shorten.total_prepaid == 100000000
+    # Shortening the term repays early; reducing the installment keeps the term
+    assert shorten.payoff_month < baseline.payoff_month
+    assert reduce.payoff_month == baseline.payoff_month
+    assert shorten.total_interest_paid < reduce.total_interest_paid
+
+
+def test_lump_sum_is_capped_at_the_balance(scenario_record):
+    baseline, repaid = evaluate(scenario_record, [PrepaymentPlan(),
+                                                  PrepaymentPlan(lump_sum=Decimal('2000000000'), lump_sum_month=60)])
+    assert repaid.payoff_month == 60
+    assert repaid.total_prepaid < 2000000000
+    assert repaid.total_interest_paid < baseline.total_interest_paid
+
+
+def test_batch_matches_single_plans(scenario_record):
+    plans = [
+        PrepaymentPlan(lump_sum=Decimal('50000000'), lump_sum_month=24),
+        PrepaymentPlan(lump_sum=Decimal('50000000'), lump_sum_month=24, mode=MODE_REDUCE_INSTALLMENT),
+        PrepaymentPlan(monthly_extra=Decimal('1000000'), extra_start_month=1, extra_end_month=120),
+        PrepaymentPlan(lump_sum=Decimal('30000000'), lump_sum_month=120, monthly_extra=Decimal('500000'),
+                       extra_start_month=61, extra_end_month=180, mode=MODE_REDUCE_INSTALLMENT),
+    ]
+    batch = evaluate(scenario_record, plans)
+    for plan, result in zip(plans, batch):
+        assert evaluate(scenario_record, [plan])[0] == result
+
+
+def test_optimizer_ranks_plans_within_the_budget(scenario_record):
+    mortgage_params, monthly_rent, investment_return_rate = parse_scenario(scenario_record)
+    budget = Decimal('300000000')
+    result = PrepaymentOptimizer.run(OptimizationParams(
+        mortgage_params, monthly_rent, investment_return_rate, budget, year_step=5, top=5))
+    assert len(result.best) == 5
+    assert result.candidates > len(result.best)
+    assert result.baseline.total_prepaid == 0
+    benefits = [item.net_benefit_buying for item in result.best]
+    assert benefits == sorted(benefits, reverse=True)
+    assert benefits[0] >= result.baseline.net_benefit_buying
+    for item in result.best:
+        assert item.total_prepaid <= float(budget) * (1 + 1e-9)
+        # The reported plan evaluates to the reported totals
+        evaluated = evaluate(scenario_record, [item.plan])[0]
+        assert evaluated.net_benefit_buying == pytest.approx(item.net_benefit_buying, rel=1e-9)
+    assert len(result.best_yearly['closing_balance']) == mortgage_params.mortgage_term_years
+
+
+def test_request_evaluates_plans_and_searches(scenario_record):
+    response = prepayment.run_request({
+        'scenario': scenario_record,
+        'plans': [{'lump_sum': 100000000, 'lump_sum_month': 60}],
+        'budget': 100000000,
+        'year_step': 10,
+        'top': 3,
+    })
+    assert response['baseline']['total_prepaid'] == 0
+    assert len(response['plans']) == 1
+    plan = response['plans'][0]
+    assert plan['plan']['mode'] == MODE_SHORTEN_TERM
+    # extra_end_month defaults to the end of the term
+    assert plan['plan']['extra_end_month'] == 360
+    assert plan['total_interest_paid'] < response['baseline']['total_interest_paid']
+    assert len(response['optimization']['best']) == 3
+
+
+@pytest.mark.parametrize('request_fields', [
+    {},
+    {'plans': [{'lump_sum': 100000000}]},
+    {'plans': [{'lump_sum': 100000000, 'lump_sum_month': 361}]},
+    {'plans': [{'lump_sum': -1, 'lump_sum_month': 12}]},
+    {'plans': [{'monthly_extra': 1000000, 'extra_start_month': 120, 'extra_end_month': 60}]},
+    {'plans': [{'lump_sum': 'lots', 'lump_sum_month': 12}]},
+    {'plans': [{'lump_sum': 100000000, 'lump_sum_month': 12.5}]},
+    {'plans': [{'lump_sum': 100000000, 'lump_sum_month': 12, 'mode': 'skip_payments'}]},
+    {'plans': [{}] * (prepayment.MAX_PLANS + 1)},
+    {'budget': 0},
+    {'budget': 100000000, 'shares': [1.5]},
+    {'budget': 100000000, 'modes': ['skip_payments']},
+])
+def test_invalid_requests_are_rejected(scenario_record, request_fields):
+    with pytest.raises(ValueError):
+        prepayment.run_request({'scenario': scenario_record, **request_fields})
@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+import profiling
+
+
+def busy(count):
+    return sum(i * i for i in range(count))
+
+
+def test_capture_records_the_call():
+    result, stats, stacks = profiling.capture(busy, 200000)
+    assert result == busy(200000)
+    assert any(name == 'busy' for _, _, name in stats)
+    profile = profiling.Profile()
+    profile.add(stats, stacks)
+    assert 'busy' in profile.report('tottime')
+    with pytest.raises(ValueError, match='Unknown sort key'):
+        profile.report('wallclock')
+
+
+def test_profiles_are_saved_and_served(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    profile = profiling.Profile()
+    stats = profiling.capture(busy, 1000)[1]
+    profile.add(stats, {})
+    profile.add(stats, {'app.py:handler;test_profiling.py:busy': 3})
+    profile.save(str(tmp_path / profile.id))
+
+    media_type, content = profiling.saved_output(profile.id, 'collapsed')
+    assert media_type.startswith('text/plain') and b'test_profiling.py:busy 3\n' in content
+    assert b'busy' in profiling.saved_output(profile.id, 'report', 'calls')[1]
+    assert profiling.saved_output(profile.id, 'pstats')[0] == 'application/octet-stream'
+    with pytest.raises(FileNotFoundError):
+        profiling.saved_output('../' + profile.id, 'report')
+    with pytest.raises(ValueError, match='Unknown profile output'):
+        profiling.saved_output(profile.id, 'svg')
+
+
+def test_middleware_profiles_only_requests_that_ask(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+    @app.get('/work')
+    async def work():
+        return {'profiled': profiling.current() is not None, 'total': busy(1000)}
+
+    client = TestClient(app)
+    plain = client.get('/work')
+    assert plain.json()['profiled'] is False and 'x-profile-id' not in plain.headers
+
+    saved = client.get('/work', headers={'X-Profile': '1'})
+    assert saved.json()['profiled'] is True
+    assert (tmp_path / (saved.headers['x-profile-id'] + '.prof')).exists()
+
+    report = client.get('/work?profile=report&profile_sort=tottime')
+    assert report.headers['content-type'].startswith('text/plain') and 'busy' in report.text
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from calculations import sensitivity
+from calculations.batch import parse_scenario
+from calculations.comparison import ComparisonParams, MortgageComparison
+from calculations.mortgage_calculations import MortgageCalculator
+from calculations.vectorized import VECTORIZED_RELATIVE_TOLERANCE
+
+
+def test_grid_cells_agree_with_the_decimal_engine(scenario_record):
+    rates = sensitivity.axis_values('interest_rate_subsequent', 0.05, 0.15, 3)
+    rents = sensitivity.axis_values('monthly_rent', 2000000, 6000000, 4)
+    grid = sensitivity.sensitivity_grid(scenario_record, 'interest_rate_subsequent', rates, 'monthly_rent', rents)
+    assert grid.net_benefit_buying.shape == (4, 3)
+    for row, rent in enumerate(rents):
+        for column, rate in enumerate(rates):
+            record = {**scenario_record, 'interest_rate_subsequent': rate, 'monthly_rent': rent}
+            mortgage_params, monthly_rent, investment_return_rate = parse_scenario(record)
+            expected = MortgageComparison.month_by_month_comparison(ComparisonParams(
+                monthly_rent, mortgage_params, MortgageCalculator.calculate_mortgage_payments(mortgage_params),
+                investment_return_rate), summary_only=True).net_benefit_buying
+            loan = float(mortgage_params.property_price * (1 - mortgage_params.down_payment_percentage))
+            assert abs(grid.net_benefit_buying[row, column] - float(expected)) <= VECTORIZED_RELATIVE_TOLERANCE * loan
+
+
+def test_invalid_cells_are_reported_as_none(scenario_record):
+    down_payments = np.array([0.2, 1.5])
+    returns = np.array([0.05])
+    grid = sensitivity.sensitivity_grid(scenario_record, 'down_payment_percentage', down_payments,
+                                        'investment_return_rate', returns)
+    surface = sensitivity.grid_to_dict(grid)['net_benefit_buying']
+    assert surface[0][0] is not None and surface[0][1] is None
+
+
+def test_whole_number_dimensions_are_rounded_and_deduplicated():
+    assert sensitivity.axis_values('mortgage_term_years', 10, 12, 7).tolist() == [10, 11, 12]
+
+
+@pytest.mark.parametrize('dimension, start, stop, steps, message', [
+    ('property_tax', 0, 1, 3, 'Unknown dimension'),
+    ('monthly_rent', 0, 1, 0, 'Steps must be between'),
+    ('monthly_rent', 0, float('inf'), 3, 'finite'),
+])
+def test_invalid_axes_are_rejected(dimension, start, stop, steps, message):
+    with pytest.raises(ValueError, match=message):
+        sensitivity.axis_values(dimension, start, stop, steps)
+
+
+def test_dimensions_must_differ(scenario_record):
+    values = np.array([3500000.0])
+    with pytest.raises(ValueError, match='must differ'):
+        sensitivity.sensitivity_grid(scenario_record, 'monthly_rent', values, 'monthly_rent', values)
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+import singleflight
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_callers_share_one_execution():
+    group = singleflight.SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def burst():
+        return await asyncio.gather(*(group.run('key', compute) for _ in range(10)))
+
+    assert run(burst()) == ['result'] * 10
+    assert calls == 1
+    assert group.stats()['executed'] == 1 and group.stats()['coalesced'] == 9
+
+
+def test_errors_reach_every_caller_and_release_the_key():
+    group = singleflight.SingleFlight()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("Invalid scenario")
+
+    async def burst():
+        results = await asyncio.gather(*(group.run('key', fail) for _ in range(5)), return_exceptions=True)
+        assert group.stats()['in_flight'] == 0
+        # The failure is not cached: a later call executes again
+        with pytest.raises(ValueError):
+            await group.run('key', fail)
+        return results
+
+    results = run(burst())
+    assert [type(result) for result in results] == [ValueError] * 5
+    assert all(str(result) == "Invalid scenario" for result in results)
+    assert calls == 2
+    assert group.stats()['errors'] == 2
+
+
+def test_timed_out_callers_leave_the_task_running():
+    group = singleflight.SingleFlight(timeout=0.01)
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return 'late'
+
+    async def scenario():
+        with pytest.raises(singleflight.SingleFlightTimeout):
+            await group.run('key', slow)
+        await asyncio.sleep(0.1)
+
+    run(scenario())
+    assert finished == [True]
+    assert group.stats()['timeouts'] == 1 and group.stats()['in_flight'] == 0
+
+
+def test_profiled_requests_run_their_own_calculation(monkeypatch):
+    monkeypatch.setattr(singleflight, 'group', singleflight.SingleFlight())
+    monkeypatch.setattr(singleflight.profiling, 'PROFILING_ENABLED', True)
+    profiled = {'request': False}
+    monkeypatch.setattr(singleflight.profiling, 'current', lambda: object() if profiled['request'] else None)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.01)
+        return call
+
+    async def burst():
+        shared = [asyncio.ensure_future(singleflight.run('key', compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        profiled['request'] = True
+        own = await singleflight.run('key', compute)
+        return await asyncio.gather(*shared), own
+
+    shared, own = run(burst())
+    assert calls == 2 and shared[0] == shared[1] == shared[2] != own
+    assert singleflight.group.stats()['executed'] == 1
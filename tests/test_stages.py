@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+import pytest
+
+from calculations import cache
+from calculations.backends import BACKEND_DECIMAL, BACKEND_FIXED, BACKEND_FLOAT
+from calculations.comparison import ENGINE_DECIMAL, ENGINE_NUMPY, ComparisonParams, MortgageComparison
+from calculations.mortgage_calculations import MortgageParams
+
+BASE = MortgageParams(Decimal('1600000000'), Decimal('0.20'), Decimal('0.025'), Decimal('0.11'), 30, 5)
+
+
+@pytest.mark.parametrize('backend', [BACKEND_DECIMAL, BACKEND_FLOAT, BACKEND_FIXED])
+def test_stages_compose_into_the_full_comparison(scenarios, backend):
+    for params in scenarios[:10]:
+        amortization = MortgageComparison.amortization(params, backend)
+        overlay = MortgageComparison.investment_overlay(params, amortization)
+        assert (MortgageComparison.aggregate(params, amortization, overlay)
+                == MortgageComparison.month_by_month_comparison(params, backend=backend))
+
+
+def test_rent_changes_reuse_the_cached_amortization():
+    payments = cache.cached_mortgage_payments(BASE)
+    for rent in ('3500000', '4000000', '3500000.00'):
+        params = ComparisonParams(Decimal(rent), BASE, payments, Decimal('0.07'))
+        result = cache.cached_comparison(params, summary_only=True)
+        assert result == MortgageComparison.month_by_month_comparison(params, summary_only=True)
+    stats = cache.cache_stats()
+    assert stats['amortization']['misses'] == 1 and stats['amortization']['hits'] == 1
+    assert stats['comparison']['misses'] == 2 and stats['comparison']['hits'] == 1
+
+
+def test_return_changes_recompute_only_the_overlay():
+    payments = cache.cached_mortgage_payments(BASE)
+    for engine in (ENGINE_DECIMAL, ENGINE_NUMPY):
+        for rate in ('0.07', '0.09'):
+            params = ComparisonParams(Decimal('3500000'), BASE, payments, Decimal(rate))
+            assert (cache.cached_comparison(params, engine, summary_only=True)
+                    == MortgageComparison.month_by_month_comparison(params, engine, summary_only=True))
+    stats = cache.cache_stats()
+    assert stats['amortization']['misses'] == 2 and stats['amortization']['hits'] == 2
+    assert stats['overlay']['misses'] == 4 and stats['overlay']['hits'] == 0
@@ -0,0 +1,65 @@
+import dataclasses
+from decimal import Decimal
+
+from calculations import cache
+from calculations.backends import BACKEND_FIXED
+from calculations.comparison import ComparisonParams, MortgageComparison
+from calculations.mortgage_calculations import MortgageCalculator, MortgageParams, RateTier
+
+BASE = MortgageParams(Decimal('1600000000'), Decimal('0.20'), Decimal('0.025'), Decimal('0.11'), 30, 5)
+
+
+def compare(mortgage_params: MortgageParams, summary_only: bool = False, backend: str = None):
+    payments = MortgageCalculator.calculate_mortgage_payments(mortgage_params, backend)
+    return payments, MortgageComparison.month_by_month_comparison(ComparisonParams(
+        monthly_rent=Decimal('3500000'),
+        mortgage_params=mortgage_params,
+        mortgage_payments=payments,
+        investment_return_rate=Decimal('0.07')
+    ), summary_only=summary_only, backend=backend)
+
+
+def test_single_tier_is_bit_identical_to_plain_params():
+    plain = BASE
+    tiered = MortgageParams.from_tiers(Decimal('1600000000'), Decimal('0.20'), [(5, Decimal('0.025'))],
+                                       Decimal('0.11'), 30)
+    assert dataclasses.replace(tiered, rate_tiers=None) == plain
+    assert compare(tiered) == compare(plain)
+
+
+def test_tiers_reset_the_payment_at_every_period():
+    params = MortgageParams.from_tiers(Decimal('1600000000'), Decimal('0.20'),
+                                       [(3, Decimal('0.025')), (2, Decimal('0.05'))], Decimal('0.11'), 30)
+    payments, result = compare(params)
+    assert [(segment.start_month, segment.months) for segment in payments.segments] == [(1, 36), (37, 24), (61, 300)]
+    assert len({segment.monthly_payment for segment in payments.segments}) == 3
+    for previous, segment in zip(payments.segments, payments.segments[1:]):
+        assert segment.opening_balance == previous.closing_balance
+    assert abs(payments.segments[-1].closing_balance) < Decimal('1e-6')
+    months = result.monthly_comparison
+    assert months[36].monthly_mortgage_payment == payments.segments[1].monthly_payment
+    assert months[60].monthly_mortgage_payment == payments.segments[2].monthly_payment
+
+
+def test_summary_totals_come_from_the_segments():
+    params = MortgageParams.from_tiers(Decimal('1600000000'), Decimal('0.20'),
+                                       [(3, Decimal('0.025')), (2, Decimal('0.05'))], Decimal('0.11'), 30)
+    payments, summary = compare(params, summary_only=True)
+    _, full = compare(params)
+    assert summary.total_interest_paid == sum(segment.interest_paid for segment in payments.segments)
+    for field in ('total_mortgage_cost', 'total_interest_paid', 'total_principal_paid', 'net_benefit_buying'):
+        assert abs(getattr(summary, field) - getattr(full, field)) <= Decimal('1e-10')
+
+
+def test_fixed_point_summary_uses_monthly_sums(scenarios):
+    for params in scenarios[:5]:
+        _, summary = compare(params.mortgage_params, summary_only=True, backend=BACKEND_FIXED)
+        _, full = compare(params.mortgage_params, backend=BACKEND_FIXED)
+        assert summary._replace(monthly_comparison=[]) == full._replace(monthly_comparison=[])
+
+
+def test_tiers_are_part_of_the_cache_key():
+    one = dataclasses.replace(BASE, rate_tiers=(RateTier(5, Decimal('0.025')),))
+    two = dataclasses.replace(BASE, rate_tiers=(RateTier(3, Decimal('0.025')), RateTier(2, Decimal('0.05'))))
+    assert cache.mortgage_params_key(one) != cache.mortgage_params_key(two)
+    assert cache.mortgage_params_key(one) != cache.mortgage_params_key(BASE)
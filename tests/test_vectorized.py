@@ -0,0 +1,47 @@
+from calculations.comparison import ENGINE_NUMPY, MortgageComparison
+from calculations.vectorized import VECTORIZED_ABSOLUTE_TOLERANCE, VECTORIZED_RELATIVE_TOLERANCE
+
+MONEY_FIELDS = ('total_mortgage_cost', 'total_rent_cost', 'total_investment_growth', 'net_benefit_buying',
+                'max_payment_difference', 'payment_difference_fixed', 'payment_difference_variable',
+                'total_interest_paid', 'total_principal_paid')
+YEAR_FIELDS = ('average_mortgage_payment', 'average_rent', 'yearly_investment_growth',
+               'total_principal_paid', 'total_interest_paid')
+
+
+def assert_close(actual, expected, loan_amount):
+    tolerance = max(VECTORIZED_ABSOLUTE_TOLERANCE,
+                    VECTORIZED_RELATIVE_TOLERANCE * max(abs(float(expected)), float(loan_amount)))
+    assert abs(float(actual) - float(expected)) <= tolerance, (actual, expected)
+
+
+def test_numpy_engine_agrees_with_decimal(scenarios):
+    for params in scenarios:
+        loan = params.mortgage_payments.loan_amount
+        exact = MortgageComparison.month_by_month_comparison(params)
+        vectorized = MortgageComparison.month_by_month_comparison(params, engine=ENGINE_NUMPY)
+        for field in MONEY_FIELDS:
+            assert_close(getattr(vectorized, field), getattr(exact, field), loan)
+        assert vectorized.is_buying_cheaper == exact.is_buying_cheaper
+        assert len(vectorized.yearly_summary) == len(exact.yearly_summary)
+        for vectorized_year, exact_year in zip(vectorized.yearly_summary, exact.yearly_summary):
+            for field in YEAR_FIELDS:
+                assert_close(getattr(vectorized_year, field), getattr(exact_year, field), loan)
+
+
+def test_numpy_schedule_agrees_month_by_month(scenarios):
+    for params in scenarios[:5]:
+        loan = params.mortgage_payments.loan_amount
+        exact = MortgageComparison.month_by_month_comparison(params).monthly_comparison
+        vectorized = MortgageComparison.month_by_month_comparison(params, engine=ENGINE_NUMPY).monthly_comparison
+        assert len(vectorized) == len(exact)
+        for vectorized_month, exact_month in zip(vectorized, exact):
+            assert vectorized_month.month == exact_month.month
+            for field in ('monthly_mortgage_payment', 'principal_for_the_month', 'interest_for_the_month',
+                          'cumulative_investment'):
+                assert_close(getattr(vectorized_month, field), getattr(exact_month, field), loan)
+
+
+def test_numpy_summary_only_has_no_schedule(scenarios):
+    result = MortgageComparison.month_by_month_comparison(scenarios[0], engine=ENGINE_NUMPY, summary_only=True)
+    assert len(result.monthly_comparison) == 0
+    assert result.yearly_summary